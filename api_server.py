@@ -0,0 +1,334 @@
+import argparse
+import json
+import math
+import os
+import threading
+import traceback
+from collections import OrderedDict
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from arrow_store import ArrowStore
+from catalogue import folder_signature
+from dataset import ChecklistDataset, Partition, normalize_checklist, read_teams_clean
+from dataset_store import dataset_id
+from exports import comparison, ranking, team_cost
+from players import PlayerSearch
+from scoring import load_rules
+
+# Read-only JSON API over the checklists of one folder, for the bots that need
+# the same rankings as the app:
+#   python api_server.py --folder checklists_clean --port 8502
+#   GET /status
+#   GET /rankings?kind=player|team[&category=...][&limit=50]
+#   GET /player?name=...
+#   GET /compare?players=Name 1,Name 2
+#   GET /cost?default=25[&cost=Team Name:30 ...]
+# Every endpoint accepts product=... (repeatable) to restrict the checklists.
+# The folder is loaded once (Arrow copies when the cleaner published them) and
+# reloaded only when its workbooks or scoring_rules.json change. Responses are
+# cached by (dataset version, endpoint, query); concurrent misses on the same
+# key are computed once, so a burst of identical requests during a break scans
+# the data once, while different queries compute in parallel.
+
+DEFAULT_PORT = 8502
+MAX_CACHED = 512
+DEFAULT_LIMIT = 50
+
+
+class ApiError(Exception):
+    def __init__(self, status, message, **extra):
+        super().__init__(message)
+        self.status = status
+        self.payload = {"error": message, **extra}
+
+
+def json_value(value):
+    # numpy scalars from groupby results
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def records(frame):
+    return frame.astype(object).where(frame.notna(), None).to_dict("records")
+
+
+def parse_list(values):
+    # "a,b" and repeated parameters both accepted
+    return [item.strip() for value in values for item in value.split(",") if item.strip()]
+
+
+class QueryEngine:
+    def __init__(self, folder):
+        self.folder = folder
+        self.store = ArrowStore(folder)
+        self.dataset = None
+        self.version = None
+        self.search = None
+        self.computed = 0
+        self._signature = None
+        self._partitions = {}  # source key -> Partition, reused across reloads
+        self._cache = OrderedDict()
+        self._pending = {}  # cache key -> Future of the request computing it
+        self._load_lock = threading.Lock()
+        self._cache_lock = threading.Lock()
+
+    # --- data ---
+
+    def current(self):
+        # (dataset, version), reloaded when a workbook or the rules changed
+        model = load_rules().active
+        signature = (folder_signature(self.folder), model.version)
+        with self._load_lock:
+            if signature != self._signature:
+                self._reload(signature, model)
+            return self.dataset, self.version
+
+    def _reload(self, signature, model):
+        dataset = ChecklistDataset()
+        partitions = {}
+        for filename, mtime, _ in signature[0]:
+            if filename.startswith("~$"):
+                continue
+            path = os.path.join(self.folder, filename)
+            key = f"{path}@{mtime}"
+            partition = self._partitions.get(key)
+            if partition is None or partition.model_version != model.version:
+                partition = self._load_partition(key, filename, path, model)
+            if partition is not None:
+                partitions[key] = partition
+                dataset.add(partition)
+        self._partitions = partitions
+        self.dataset = dataset
+        self.version = dataset_id(list(partitions) + [model.version])
+        df_p = dataset.frames()[1]
+        self.search = PlayerSearch(df_p['Player'].unique()) if df_p is not None else None
+        self._signature = signature
+
+    def _load_partition(self, key, filename, path, model):
+        stored = self.store.read(path)
+        if stored is not None:
+            df, notes = stored
+        else:
+            try:
+                df = read_teams_clean(path)
+            except ValueError:
+                return None
+            df, notes = normalize_checklist(df, filename)
+        if df is None:
+            return None
+        return Partition(key, filename, df, notes, model=model)
+
+    def frames(self, dataset, products):
+        df, df_p, df_t = dataset.frames()
+        if df is None:
+            raise ApiError(503, "Aucune checklist chargée.")
+        if products is None:
+            return df, df_p, df_t
+        return dataset.memo('api_frames', products, lambda: tuple(f[f['Product'].isin(products)] for f in (df, df_p, df_t)))
+
+    # --- queries ---
+
+    def query(self, endpoint, params):
+        # JSON bytes of the response; errors raise ApiError
+        handler = ENDPOINTS.get(endpoint)
+        if handler is None:
+            raise ApiError(404, f"Route inconnue : {endpoint}")
+        try:
+            dataset, version = self.current()
+        except (OSError, ValueError) as e:
+            raise ApiError(500, f"Règles de score illisibles : {e}")
+        cache_key = (version, endpoint, tuple(sorted((k, tuple(v)) for k, v in params.items())))
+        with self._cache_lock:
+            body = self._cache.get(cache_key)
+            if body is not None:
+                self._cache.move_to_end(cache_key)
+                return body
+            # The first miss computes, the others on the same key wait for it
+            pending = self._pending.get(cache_key)
+            owner = pending is None
+            if owner:
+                pending = self._pending[cache_key] = Future()
+        if not owner:
+            return pending.result()
+        try:
+            products = frozenset(params["product"]) if params.get("product") else None
+            payload = handler(self, dataset, products, params)
+            body = json.dumps({"version": version, **payload}, ensure_ascii=False, default=json_value).encode("utf-8")
+        except Exception as e:
+            with self._cache_lock:
+                del self._pending[cache_key]
+            pending.set_exception(e)
+            raise
+        with self._cache_lock:
+            self.computed += 1
+            self._cache[cache_key] = body
+            while len(self._cache) > MAX_CACHED:
+                self._cache.popitem(last=False)
+            del self._pending[cache_key]
+        pending.set_result(body)
+        return body
+
+    def status(self, dataset, products, params):
+        df, _, _ = self.frames(dataset, products)
+        return {
+            "files": sorted(p.filename for p in dataset.partitions.values()),
+            "products": sorted(df['Product'].unique().tolist()),
+            "rows": len(df),
+            "categories": load_rules().active.categories,
+        }
+
+    def rankings(self, dataset, products, params):
+        kind = params.get("kind", ["player"])[0].lower()
+        if kind not in ("player", "team"):
+            raise ApiError(400, "kind doit valoir player ou team.")
+        column = kind.capitalize()
+        _, df_p, df_t = self.frames(dataset, products)
+        frame = df_p if kind == "player" else df_t
+        categories = load_rules().active.categories
+        category = params.get("category", [None])[0]
+        if category is not None:
+            # "Logoman" or "🔥 Logoman"
+            matches = [c for c in categories if c == category or c.split(" ", 1)[-1].lower() == category.lower()]
+            if not matches:
+                raise ApiError(400, f"Catégorie inconnue : {category}", categories=categories)
+            category = matches[0]
+            frame = frame[frame['Category'] == category]
+        table = dataset.memo(('api_ranking', kind, category), products, lambda: ranking(frame, column, categories))
+        if category is not None:
+            table = table.sort_values([category, 'Score'], ascending=False)
+        return {"kind": kind, "category": category, "rows": len(table), "ranking": records(table.head(self.limit(params)))}
+
+    def player(self, dataset, products, params):
+        name = params.get("name", [""])[0]
+        _, df_p, _ = self.frames(dataset, products)
+        match = self.resolve_one(name)
+        rows = df_p[df_p['Player'] == match]
+        if rows.empty:
+            raise ApiError(404, f"Aucune carte pour {match} dans ces produits.")
+        categories = load_rules().active.categories
+        counts = rows.groupby('Category')['Hits'].sum()
+        files = rows.groupby('File', observed=True)[['Hits', 'Score']].sum().round({'Score': 2})
+        cards = rows[['Box Type', 'Numbering', 'Category', 'Score', 'Team', 'File']].sort_values('Score', ascending=False)
+        return {
+            "query": name,
+            "player": match,
+            "hits": int(rows['Hits'].sum()),
+            "score": round(float(rows['Score'].sum()), 2),
+            "categories": {c: int(counts.get(c, 0)) for c in categories},
+            "teams": sorted(rows['Team'].unique().tolist()),
+            "files": records(files.sort_values('Hits', ascending=False).reset_index()),
+            "cards": records(cards.head(self.limit(params)).round({'Score': 2})),
+        }
+
+    def compare(self, dataset, products, params):
+        _, df_p, _ = self.frames(dataset, products)
+        resolved = self.search.resolve(parse_list(params.get("players", [])))
+        players = list(dict.fromkeys(e["match"] for e in resolved if e["match"] is not None))
+        table = comparison(df_p, players, load_rules().active.categories)
+        total = {column: int(table[column].sum()) for column in table.columns if column not in ("Joueur", "Score")}
+        total["Score"] = round(float(table["Score"].sum()), 2)
+        return {
+            "resolved": resolved,
+            "comparison": records(table.sort_values("Score", ascending=False)),
+            "total": total,
+        }
+
+    def cost(self, dataset, products, params):
+        try:
+            default_cost = float(params.get("default", [25])[0])
+            cost_map = {}
+            for value in params.get("cost", []):
+                team, _, amount = value.rpartition(":")
+                cost_map[team.strip()] = float(amount)
+        except ValueError:
+            raise ApiError(400, "Coûts invalides : default=25 et cost=Équipe:30 attendus.")
+        if not all(math.isfinite(c) for c in [default_cost, *cost_map.values()]):
+            raise ApiError(400, "Coûts invalides : nombres finis attendus.")
+        df, _, _ = self.frames(dataset, products)
+        table = team_cost(df, cost_map, default_cost).round({'Score': 2, 'Value/€': 3})
+        return {"default": default_cost, "teams": records(table.head(self.limit(params)))}
+
+    # --- helpers ---
+
+    def limit(self, params):
+        try:
+            return max(1, int(params.get("limit", [DEFAULT_LIMIT])[0]))
+        except ValueError:
+            raise ApiError(400, "limit doit être un entier.")
+
+    def resolve_one(self, name):
+        if not name.strip():
+            raise ApiError(400, "Paramètre name manquant.")
+        entry = self.search.resolve([name])[0]
+        if entry["match"] is None:
+            raise ApiError(404, f"Joueur introuvable : {name}", suggestions=[n for n, _ in entry["suggestions"]])
+        return entry["match"]
+
+
+ENDPOINTS = {
+    "/status": QueryEngine.status,
+    "/rankings": QueryEngine.rankings,
+    "/player": QueryEngine.player,
+    "/compare": QueryEngine.compare,
+    "/cost": QueryEngine.cost,
+}
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    engine = None  # set by make_server
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        try:
+            body = self.engine.query(url.path.rstrip("/") or "/status", parse_qs(url.query))
+            status = 200
+        except ApiError as e:
+            body = json.dumps(e.payload, ensure_ascii=False).encode("utf-8")
+            status = e.status
+        except Exception as e:
+            # Any other failure still answers JSON, and the server keeps running
+            traceback.print_exc()
+            body = json.dumps({"error": f"Erreur interne : {type(e).__name__}"}, ensure_ascii=False).encode("utf-8")
+            status = 500
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Quiet by default; the bots poll often
+        pass
+
+
+def make_server(folder, host="127.0.0.1", port=DEFAULT_PORT):
+    handler = type("BoundApiHandler", (ApiHandler,), {"engine": QueryEngine(folder)})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API JSON des classements checklists")
+    parser.add_argument("--folder", default="checklists_clean")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    server = make_server(args.folder, args.host, args.port)
+    # Loaded before the first request
+    server.RequestHandlerClass.engine.current()
+    print(f"API sur http://{args.host}:{server.server_address[1]} ({args.folder})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
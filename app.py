@@ -2,19 +2,29 @@ import streamlit as st
 import pandas as pd
 import os
 import glob
+import hashlib
 import plotly.express as px
 import re
-
-def extract_year(filename):
-    match = re.search(r"(\d{4}-\d{2})", filename)
-    return match.group(1) if match else "Inconnue"
-
-def extract_product(filename):
-    name = os.path.splitext(filename)[0]
-    name = re.sub(r"\d{4}-\d{2}", "", name)
-    name = re.sub(r"checklist", "", name, flags=re.IGNORECASE)
-    name = re.sub(r"\s+", " ", name)
-    return name.strip(" -_")
+import time
+from functools import partial
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from arrow_store import ArrowStore
+from background_loader import POLL_SECONDS, LoadJob
+from card_families import card_families
+from catalogue import folder_signature, update_index
+from charts import cached_figure, figure_image, payload_size
+from dataset import ChecklistDataset, Partition, extract_year, normalize_checklist, read_teams_clean
+from dataset_store import DatasetStore, dataset_id
+from exports import FORMATS, available_formats, comparison, export_bytes, export_key, ranking_tables, team_cost
+from instrumentation import Instrumentation, cache_stats, configure_logging, record_cache_call, record_cache_miss
+from live_board import KINDS, LiveState, TopK
+from players import PlayerSearch
+from scoring import evaluate_models, load_rules
+from serial_index import SerialIndex
+from tables import paginated_table
+from team_summary import TeamSummaries
+from trends import update_trends
 
 # API Key Config (Removed as requested)
 # OPENAI_API_KEY = st.secrets["OPENAI_API_KEY"]
@@ -52,8 +62,37 @@ st.markdown("""
 
 # --- Sidebar: Configuration ---
 st.sidebar.header("📁 Configuration")
+@st.cache_resource(show_spinner=False)
+def get_dataset_store():
+    # One store per server process: partitions and datasets are shared
+    # read-only by every session instead of being copied into each one.
+    return DatasetStore()
+
+dataset_store = get_dataset_store()
+
 if st.sidebar.button("🔄 Recharger (cache)"):
     st.cache_data.clear()
+    dataset_store.clear()
+# Scoring model from scoring_rules.json, recompiled only when the file changes
+try:
+    scoring_rules = load_rules()
+except (OSError, ValueError) as e:
+    st.error(f"Règles de score illisibles : {e}")
+    st.stop()
+model_names = list(scoring_rules.models)
+scoring_model = scoring_rules.models[st.sidebar.selectbox(
+    "🧮 Modèle de score", model_names,
+    index=model_names.index(scoring_rules.active.name),
+    format_func=lambda name: scoring_rules.models[name].label,
+    key="scoring_model",
+)]
+show_perf_panel = st.sidebar.checkbox("🐞 Panneau debug (perf)", key="perf_debug")
+show_families = st.sidebar.toggle("🧬 Regrouper les parallèles", key="card_families", help="Tableaux de cartes par famille (joueur, équipe, set de base, produit) au lieu d'une ligne par parallèle.")
+static_charts = st.sidebar.toggle("📱 Graphiques statiques (mobile)", key="static_charts", help="Images compressées au lieu de graphiques interactifs (nécessite kaleido).")
+
+# Timing spans / memory snapshots for this rerun (JSON lines if NBA_BREAK_PERF_LOG is set)
+configure_logging()
+perf = Instrumentation(track_memory=show_perf_panel)
 
 # Setup default data folder for mobile ease-of-use
 base_dir = os.getcwd()
@@ -67,6 +106,80 @@ if "folder_path" not in st.session_state:
 
 folder_path = st.session_state.folder_path
 
+@st.cache_resource(show_spinner=False)
+def get_arrow_store(folder):
+    # Shared per folder; a manifest swapped by the cleaner is picked up on the next read
+    return ArrowStore(folder)
+
+@st.cache_data(show_spinner=False)
+def load_catalogue(folder, signature):
+    # signature (names, mtimes, sizes) invalidates the cache when files change
+    record_cache_miss("load_catalogue")
+    return update_index(folder)
+
+@st.cache_data(show_spinner=False)
+def load_trends(folder, signature, model_version, _model):
+    # Yearly aggregates of every workbook in the folder, persisted next to the
+    # index, scored with the model picked in the sidebar (hashed by version)
+    record_cache_miss("load_trends")
+    return update_trends(folder, _model)
+
+@st.cache_resource(show_spinner=False)
+def get_live_state(folder):
+    # Sold spots of the running break, one shared state per folder
+    return LiveState(folder)
+
+def sell_picked(live_state, kind):
+    pick = st.session_state.get(f"live_pick_{kind}")
+    if pick:
+        live_state.mark_sold(kind, pick)
+        st.session_state[f"live_pick_{kind}"] = ""
+
+@st.fragment(run_every="2s")
+def live_board(boards, live_state, top_n):
+    # Reruns on its own (and on its buttons) without touching the rest of the
+    # page; the 2s refresh picks up spots sold from other sessions. Buttons
+    # act through callbacks, so the rerun they trigger already shows the change.
+    labels = {'Player': ("Joueurs", "👤"), 'Team': ("Équipes", "🛡️")}
+    columns = st.columns(2)
+    for kind, col in zip(KINDS, columns):
+        label, icon = labels[kind]
+        sold = live_state.sold_names(kind)
+        with col:
+            st.markdown(f"#### Top {top_n} {label} disponibles")
+            for rank, (name, score) in enumerate(boards[kind].top(top_n, sold), 1):
+                c_name, c_score, c_sold = st.columns([5, 2, 2])
+                c_name.markdown(f"**{rank}. {name}**")
+                c_score.markdown(f"{score:.1f}")
+                c_sold.button("Vendu", key=f"live_sold_{kind}_{name}", on_click=live_state.mark_sold, args=(kind, name))
+            st.selectbox(
+                f"{icon} Marquer vendu :", [""] + sorted(n for n in boards[kind].scores if n not in sold),
+                key=f"live_pick_{kind}",
+            )
+            st.button("✔️ Vendu", key=f"live_pick_sold_{kind}", on_click=sell_picked, args=(live_state, kind))
+
+    history = live_state.history()
+    st.markdown("---")
+    st.markdown(f"#### Spots vendus ({len(history)})")
+    for sold_at, kind, name in history[:20]:
+        c_name, c_undo = st.columns([6, 2])
+        c_name.markdown(f"{labels[kind][1]} {name} · {sold_at[11:]}")
+        c_undo.button("↩️ Annuler", key=f"live_undo_{kind}_{name}", on_click=live_state.restore, args=(kind, name))
+    if history:
+        st.button("🧹 Nouveau break (tout remettre en vente)", key="live_reset", on_click=live_state.reset)
+
+def describe_catalogue_entry(entry):
+    if not entry:
+        return "Non indexé"
+    if entry.get("error"):
+        return f"⚠️ {entry['error']}"
+    cats = entry["categories"]
+    return (
+        f"{entry['product']} • {entry['rows']} cartes • "
+        f"🔥 {cats.get('🔥 Logoman', 0)} • ✨ {cats.get('✨ Case Hit', 0)} • "
+        f"💎 {cats.get('💎 Auto/Mem', 0)} • {entry['players']} joueurs"
+    )
+
 # 1. Scan for files first
 if os.path.isdir(folder_path):
     found_files = glob.glob(os.path.join(folder_path, "*.xlsx"))
@@ -77,6 +190,7 @@ st.sidebar.markdown("### 🖥️ Dossier Local")
 if not found_files:
     st.sidebar.info("Aucun fichier local trouvé.")
     selected_file_paths = []
+    catalogue = {}
 else:
     # 2. Let user select files
     st.sidebar.caption(f"{len(found_files)} fichiers locaux.")
@@ -112,11 +226,14 @@ else:
     st.sidebar.markdown("---")
     st.sidebar.markdown("**Fichiers locaux :**")
     
-    # Group by Year
+    # Group by Year (metadata comes from the catalogue index, no workbook is opened here)
+    with perf.span("catalogue"):
+        record_cache_call("load_catalogue")
+        catalogue = load_catalogue(folder_path, folder_signature(folder_path))
     files_by_year = {}
     for f_path in found_files:
         f_name = os.path.basename(f_path)
-        y = extract_year(f_name)
+        y = catalogue.get(f_name, {}).get("year") or extract_year(f_name)
         if y not in files_by_year:
             files_by_year[y] = []
         files_by_year[y].append(f_path)
@@ -126,7 +243,8 @@ else:
     
     for year in sorted_years:
         year_files = files_by_year[year]
-        with st.sidebar.expander(f"{year} ({len(year_files)})", expanded=False):
+        year_rows = sum(catalogue.get(os.path.basename(f), {}).get("rows", 0) for f in year_files)
+        with st.sidebar.expander(f"{year} ({len(year_files)} • {year_rows} cartes)", expanded=False):
             for f_path in year_files:
                 f_name = os.path.basename(f_path)
                 # Initialize state if not present
@@ -136,6 +254,7 @@ else:
                 
                 # Checkbox controlling state
                 is_checked = st.checkbox(f_name, key=chk_key)
+                st.caption(describe_catalogue_entry(catalogue.get(f_name)))
                 
                 if is_checked:
                     selected_file_paths.append(f_path)
@@ -163,167 +282,169 @@ if st.sidebar.button("🚀 Lancer l'analyse", type="primary"):
 
 # --- Main Logic ---
 
+def build_partition(key, filename, source, perf, model, store=None):
+    with perf.span("read", file=filename) as fields:
+        # Normalised Arrow copy published by the cleaner (memory-mapped), else the workbook
+        stored = store.read(source) if store is not None and isinstance(source, str) else None
+        fields["arrow"] = stored is not None
+        if stored is None:
+            df = read_teams_clean(source)
+    if stored is not None:
+        df, notes = stored
+    else:
+        with perf.span("normalise", file=filename):
+            df, notes = normalize_checklist(df, filename)
+    if df is None:
+        return None, notes
+    return Partition(key, filename, df, notes, perf=perf, model=model), notes
+
+def source_key(file_obj):
+    if isinstance(file_obj, str):
+        return f"{file_obj}@{os.path.getmtime(file_obj)}"
+    # Partitions are shared across sessions: two uploads with the same name and
+    # size must not collide, so uploads are keyed by their content
+    return f"upload:{file_obj.name}:{hashlib.sha1(file_obj.getvalue()).hexdigest()}"
+
+def session_id():
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else "local"
+
+def load_partition_task(key, filename, source, model=None, store=None):
+    # Runs on a loader thread: no Streamlit calls in here
+    partition, notes = build_partition(key, filename, source, Instrumentation(), model, store)
+    if partition is not None:
+        dataset_store.put_partition(partition)
+    return partition, notes
+
+def apply_load_result(dataset, key, filename, future):
+    try:
+        partition, notes = future.result()
+        if partition is None:
+            dataset.failures[key] = (filename, "; ".join(notes), False)
+        else:
+            dataset.add(partition)
+    except ValueError:
+        dataset.failures[key] = (filename, "onglet 'Teams_clean' introuvable. Merci d'utiliser un fichier nettoye.", True)
+    except Exception as e:
+        dataset.failures[key] = (filename, str(e), False)
+
 def load_data(file_list):
+    # Datasets live in the shared store, keyed by the selected file keys; the
+    # session only remembers the id. A new selection is derived from the
+    # session's previous dataset (or built from cached partitions) so only the
+    # partitions of newly selected files are loaded. Those are read by a
+    # background LoadJob; each rerun shows the partitions that arrived so far.
     if not file_list:
         return None, "Aucun fichier sélectionné.", []
 
-    @st.cache_data
-    def read_teams_clean(path, mtime):
-        return pd.read_excel(path, sheet_name="Teams_clean", engine="openpyxl")
-
-    team_names = {
-        "atlanta hawks", "atlanta",
-        "boston celtics", "boston",
-        "brooklyn nets", "brooklyn",
-        "charlotte hornets", "charlotte",
-        "chicago bulls", "chicago",
-        "cleveland cavaliers", "cleveland",
-        "dallas mavericks", "dallas",
-        "denver nuggets", "denver",
-        "detroit pistons", "detroit",
-        "golden state warriors", "golden state",
-        "houston rockets", "houston",
-        "indiana pacers", "indiana",
-        "los angeles clippers", "la clippers", "clippers",
-        "los angeles lakers", "la lakers", "lakers",
-        "memphis grizzlies", "memphis",
-        "miami heat", "miami",
-        "milwaukee bucks", "milwaukee",
-        "minnesota timberwolves", "minnesota",
-        "new orleans pelicans", "new orleans",
-        "new york knicks", "new york",
-        "oklahoma city thunder", "oklahoma city",
-        "orlando magic", "orlando",
-        "philadelphia 76ers", "philadelphia",
-        "phoenix suns", "phoenix",
-        "portland trail blazers", "portland",
-        "sacramento kings", "sacramento",
-        "san antonio spurs", "san antonio",
-        "toronto raptors", "toronto",
-        "utah jazz", "utah",
-        "washington wizards", "washington",
-    }
-    box_keywords = [
-        "base", "set", "auto", "autograph", "signature", "patch", "relic",
-        "mem", "jersey", "logoman", "rookie", "insert", "variation", "parallel"
-    ]
-
-    combined_data = []
-    files_processed = 0
     error_files = []
-    
-    progress_bar = st.progress(0)
-    status_text = st.empty()
-
-    for i, file_obj in enumerate(file_list):
+    sources = {}
+    for file_obj in file_list:
         # Handle difference between Local Path (str) and UploadedFile (object)
-        if isinstance(file_obj, str):
-            filename = os.path.basename(file_obj)
-            source = file_obj # Path
-        else:
-            filename = file_obj.name
-            source = file_obj # File Object
-            
+        filename = os.path.basename(file_obj) if isinstance(file_obj, str) else file_obj.name
         if filename.startswith("~$"):
             error_files.append((filename, "Fichier temporaire Excel ignoré."))
             continue
+        sources[source_key(file_obj)] = (filename, file_obj)
+
+    sid = session_id()
+    # Same files scored with another model form another dataset
+    ds_id = dataset_id(list(sources) + [scoring_model.version])
+    previous_id = st.session_state.get("dataset_id")
+    base = dataset_store.get(previous_id) if previous_id else None
+
+    job = st.session_state.get("load_job")
+    dataset = dataset_store.get(ds_id, sid)
+    if job is not None and (job.target_id != ds_id or dataset is not None):
+        # Selection changed (or another session finished it): stop the old load
+        # and start from whatever it had already collected.
+        job.cancel()
+        del st.session_state["load_job"]
+        base = job.dataset
+        job = None
+
+    if dataset is None and job is None:
+        # Never mutate a dataset other sessions may be reading
+        dataset = base.copy() if base is not None else ChecklistDataset()
+        missing = {}
+        for key in dataset.sync(list(sources)):
+            # key embeds the file mtime (or upload size), so edited workbooks are re-read
+            record_cache_call("load_partition")
+            partition = dataset_store.partition(key)
+            if partition is None:
+                record_cache_miss("load_partition")
+                missing[key] = sources[key]
+            else:
+                dataset.add(partition)
+        # Partitions scored with another model only get their Score recomputed
+        with perf.span("rescore"):
+            for partition in dataset.rescore(scoring_model):
+                dataset_store.put_partition(partition)
+        if missing:
+            job = LoadJob(ds_id, dataset, missing, partial(load_partition_task, model=scoring_model, store=get_arrow_store(folder_path)))
+            st.session_state.load_job = job
+        else:
+            dataset_store.put(ds_id, dataset, sid)
+
+    if job is not None:
+        dataset = job.dataset
+        with perf.span("collect"):
+            for key, filename, future in job.collect():
+                apply_load_result(dataset, key, filename, future)
+        if job.done():
+            del st.session_state["load_job"]
+            dataset_store.put(ds_id, dataset, sid)
+            job = None
+
+    if job is None:
+        if previous_id and previous_id != ds_id:
+            dataset_store.release(previous_id, sid)
+        st.session_state.dataset_id = ds_id
+
+    for filename, message, is_warning in dataset.failures.values():
+        if is_warning:
+            st.warning(f"{filename}: {message}")
+        else:
+            error_files.append((filename, message))
+    for partition in dataset.partitions.values():
+        error_files.extend((partition.filename, note) for note in partition.notes)
 
-        status_text.text(f"Lecture de : {filename}")
-        try:
-            # Extract Year from filename (e.g. "2023-24")
-            year_match = re.search(r"(\d{4}-\d{2})", filename)
-            box_year = year_match.group(1) if year_match else "Inconnue"
-            
-            try:
-                if isinstance(source, str):
-                    df = read_teams_clean(source, os.path.getmtime(source))
-                else:
-                    df = pd.read_excel(source, sheet_name="Teams_clean", engine="openpyxl")
-                # Normalize column names to avoid missing-key errors from stray whitespace/casing.
-                df.columns = [str(c).strip() for c in df.columns]
-                lower_map = {c.lower(): c for c in df.columns}
-                if "box type" in lower_map:
-                    df = df.rename(columns={lower_map["box type"]: "Box Type"})
-                elif "card type" in lower_map:
-                    df = df.rename(columns={lower_map["card type"]: "Box Type"})
-                elif "boxtype" in lower_map:
-                    df = df.rename(columns={lower_map["boxtype"]: "Box Type"})
-
-                if "player" in lower_map and "Player" not in df.columns:
-                    df = df.rename(columns={lower_map["player"]: "Player"})
-                if "team" in lower_map and "Team" not in df.columns:
-                    df = df.rename(columns={lower_map["team"]: "Team"})
-
-                missing_cols = [c for c in ["Player", "Team"] if c not in df.columns]
-                if missing_cols:
-                    error_files.append((filename, f"Colonnes manquantes: {', '.join(missing_cols)}. Colonnes trouvées: {list(df.columns)}"))
-                    continue
-                if "Box Type" not in df.columns:
-                    df["Box Type"] = ""
-                    error_files.append((filename, "Colonne 'Box Type' absente: ajoutée vide pour éviter l'erreur."))
-            except ValueError:
-                st.warning(f"{filename}: onglet 'Teams_clean' introuvable. Merci d'utiliser un fichier nettoye.")
-                continue
-            
-            # Clean data
-            df = df.dropna(subset=['Player', 'Team'])
-            
-            # Remove trailing commas from names (common in new checklists)
-            df['Player'] = (
-                df['Player']
-                .astype(str)
-                .str.replace(r',$', '', regex=True)
-                .str.strip()
-            )
-            df['Team'] = df['Team'].astype(str).str.strip()
-            df['Team'] = df['Team'].apply(lambda t: t.title())
-
-            
-            # Add metadata
-            df['Hits'] = 1
-            df['File'] = filename # Track source file
-            df['Year'] = box_year
-            df['Product'] = extract_product(filename)
-            if 'Numbering' not in df.columns:
-                df['Numbering'] = ""
-            if 'Box Type' not in df.columns:
-                df['Box Type'] = ""
-
-            # Fix older formats where "Box Type" ended up in Numbering
-            box_empty = df['Box Type'].astype(str).str.strip().eq("") | df['Box Type'].isna()
-            numbering_str = df['Numbering'].astype(str).str.strip()
-            non_numeric = ~numbering_str.str.fullmatch(r"\d+(\.\d+)?")
-            if box_empty.mean() > 0.8 and non_numeric.mean() > 0.5:
-                df.loc[box_empty, 'Box Type'] = df.loc[box_empty, 'Numbering']
-                df.loc[non_numeric, 'Numbering'] = ""
-            
-            combined_data.append(df)
-            files_processed += 1
-            
-        except Exception as e:
-            error_files.append((filename, str(e)))
-        
-        progress_bar.progress((i + 1) / len(file_list))
-
-    status_text.empty()
-    progress_bar.empty()
-    
-    if not combined_data:
+    if not len(dataset):
+        if job is not None:
+            return None, "Chargement en cours…", error_files
         return None, "Aucun onglet 'Teams_clean' trouvé ou données valides extraites.", error_files
-        
-    df = pd.concat(combined_data, ignore_index=True)
-    msg = f"{files_processed} fichiers traités • {len(df)} lignes"
-    return df, msg, error_files
+
+    df, _, _ = dataset.frames()
+    msg = f"{len(dataset)} fichiers traités • {len(df)} lignes"
+    return dataset, msg, error_files
 
 # --- Display ---
 
 if 'scan_triggered' in st.session_state and st.session_state['scan_triggered']:
     # Use selected files from session state
     target_files = st.session_state.get('selected_files', [])
-    df, msg, error_files = load_data(target_files)
-    
-    if df is not None:
-        st.success(msg)
+    with perf.span("load_data"):
+        dataset, msg, error_files = load_data(target_files)
+
+    load_job = st.session_state.get("load_job")
+    if load_job is not None:
+        # Views below render with the partitions loaded so far
+        job_cols = st.columns([4, 1])
+        job_cols[0].progress(
+            load_job.completed / load_job.total,
+            text=f"Chargement en arrière-plan : {load_job.completed}/{load_job.total} fichier(s)",
+        )
+        if job_cols[1].button("⏹️ Annuler", key="cancel_load"):
+            load_job.cancel()
+            del st.session_state["load_job"]
+            st.session_state['scan_triggered'] = False
+            st.rerun()
+
+    if dataset is not None:
+        if load_job is None:
+            st.success(msg)
+        else:
+            st.info(f"Résultats partiels • {msg}")
         st.sidebar.markdown("---")
         st.sidebar.caption(f"{msg}")
         if error_files:
@@ -333,18 +454,12 @@ if 'scan_triggered' in st.session_state and st.session_state['scan_triggered']:
                 for name, err in error_files:
                     st.write(f"- {name}: {err}")
         
-        # --- Pre-processing for Multi-Values ---
-        # Split and explode Players (separator '/')
-        df_p = df.copy()
-        df_p['Player'] = df_p['Player'].astype(str).str.split('/')
-        df_p = df_p.explode('Player')
-        df_p['Player'] = df_p['Player'].str.strip()
-        
-        # Split and explode Teams (separator '/')
-        df_t = df.copy()
-        df_t['Team'] = df_t['Team'].astype(str).str.split('/')
-        df_t = df_t.explode('Team')
-        df_t['Team'] = df_t['Team'].str.strip()
+        # Scored rows plus the '/'-exploded Player and Team views, shared by all views
+        with perf.span("concat"):
+            df, df_p, df_t = dataset.frames()
+        perf.snapshot("df", df)
+        perf.snapshot("df_p", df_p)
+        perf.snapshot("df_t", df_t)
         
         # --- Navigation State Management ---
         if 'active_view' not in st.session_state:
@@ -358,16 +473,48 @@ if 'scan_triggered' in st.session_state and st.session_state['scan_triggered']:
                 st.session_state['pending_view'] = view_name
                 st.rerun()
 
-        def get_selected_row(event_obj):
-            if event_obj is None:
-                return None
-            selection = getattr(event_obj, "selection", None)
-            if selection is None:
-                return None
-            rows = getattr(selection, "rows", None)
-            if not rows:
-                return None
-            return rows[0]
+        def plotly_chart(builder, data, **kwargs):
+            # Figures are cached by data slice; optionally shipped as static images
+            with perf.span("plotly", chart=kwargs.get('title', '')) as span_fields:
+                key, fig = cached_figure(builder, data, **kwargs)
+                if static_charts:
+                    image = figure_image(key, fig)
+                    if image is not None:
+                        span_fields["bytes"] = len(image)
+                        st.image(image, use_container_width=True)
+                        return
+                if show_perf_panel:
+                    span_fields["bytes"] = payload_size(fig)
+                st.plotly_chart(fig, use_container_width=True)
+
+        def card_table(rows, columns, family_columns, key, sort_columns, search_column, families=None, memo_key=None):
+            # Raw card rows, or their card families when the sidebar toggle is on.
+            # families: already grouped (a partition's); memo_key: what selected
+            # rows, so their families are grouped once per dataset state.
+            if show_families:
+                if families is None:
+                    build = lambda: card_families(rows, scoring_model.categories)
+                    families = dataset.memo(('card_families', key) + memo_key, product_filter, build) if memo_key is not None else build()
+                st.caption(f"{len(families)} famille(s) de cartes pour {len(rows)} ligne(s).")
+                paginated_table(
+                    families[family_columns], key=f"{key}_families", default_sort='Parallèles',
+                    sort_columns=family_columns, search_column=search_column, selectable=False,
+                )
+            else:
+                paginated_table(rows[columns], key=key, sort_columns=sort_columns, search_column=search_column, selectable=False)
+
+        def join_unique(values):
+            return ', '.join(sorted(set(str(v) for v in values)))
+
+        def case_hit_details(hits_df, column):
+            def enrich(page_df):
+                rows = hits_df[hits_df[column].isin(page_df[column])]
+                details = rows.groupby(column).agg(**{
+                    'Variantes': ('Box Type', join_unique),
+                    'Box / Checklist': ('File', join_unique),
+                })
+                return page_df.join(details, on=column)
+            return enrich
 
         # Navigation Bar
         if 'pending_view' in st.session_state:
@@ -380,6 +527,8 @@ if 'scan_triggered' in st.session_state and st.session_state['scan_triggered']:
             "💎 Autos & Patchs",
             "🔥 Logoman",
             "✨ Case Hits",
+            "💠 Raretés",
+            "📈 Tendances",
             "👥 Multi-Joueurs",
             "⚖️ Comparateur Joueurs",
             "🧠 Value Picks",
@@ -400,820 +549,801 @@ if 'scan_triggered' in st.session_state and st.session_state['scan_triggered']:
         
         # --- ROI & Hype Logic ---
         
-        # 1. Hype Data (Hardcoded as requested)
-        HYPE_DATA = {
-            "Tier S": ["Victor Wembanyama", "LeBron James", "Stephen Curry", "Luka Doncic", "Anthony Edwards", "Giannis Antetokounmpo", "Nikola Jokic", "Jayson Tatum", "Ja Morant", "LaMelo Ball"],
-            "Tier A": ["Trae Young", "Zion Williamson", "Kevin Durant", "Joel Embiid", "Shai Gilgeous-Alexander", "Tyrese Haliburton", "Paolo Banchero", "Chet Holmgren", "Scoot Henderson", "Brandon Miller", "Damian Lillard", "Devin Booker"],
-            "Tier B": ["Cade Cunningham", "Jalen Green", "Scottie Barnes", "Evan Mobley", "Josh Giddey", "Franz Wagner", "Amen Thompson", "Ausar Thompson", "Keyonte George", "Bilal Coulibaly", "Donovan Mitchell", "Kyrie Irving"]
-        }
-
-        TOP_ROOKIES_BY_YEAR = {
-            2015: ["Karl-Anthony Towns", "D'Angelo Russell", "Kristaps Porzingis", "Devin Booker", "Myles Turner", "Terry Rozier"],
-            2016: ["Ben Simmons", "Brandon Ingram", "Jaylen Brown", "Buddy Hield", "Jamal Murray", "Pascal Siakam"],
-            2017: ["Jayson Tatum", "Lonzo Ball", "Donovan Mitchell", "De'Aaron Fox", "Bam Adebayo", "Lauri Markkanen"],
-            2018: ["Luka Doncic", "Trae Young", "Deandre Ayton", "Jaren Jackson Jr.", "Shai Gilgeous-Alexander", "Michael Porter Jr."],
-            2019: ["Zion Williamson", "Ja Morant", "RJ Barrett", "Darius Garland", "Tyler Herro", "De'Andre Hunter"],
-            2020: ["Anthony Edwards", "LaMelo Ball", "Tyrese Haliburton", "James Wiseman", "Isaac Okoro", "Patrick Williams"],
-            2021: ["Cade Cunningham", "Evan Mobley", "Scottie Barnes", "Jalen Green", "Jalen Suggs", "Franz Wagner"],
-            2022: ["Paolo Banchero", "Chet Holmgren", "Jabari Smith Jr.", "Keegan Murray", "Jaden Ivey", "Bennedict Mathurin"],
-            2023: ["Victor Wembanyama", "Scoot Henderson", "Brandon Miller", "Amen Thompson", "Ausar Thompson", "Bilal Coulibaly"],
-            2024: ["Zaccharie Risacher", "Alex Sarr", "Reed Sheppard", "Stephon Castle", "Jared McCain", "Matas Buzelis"],
-        }
-        
-        # Invert for easier lookup
-        PLAYER_HYPE_MAP = {}
-        for player in HYPE_DATA["Tier S"]: PLAYER_HYPE_MAP[player] = 10.0
-        for player in HYPE_DATA["Tier A"]: PLAYER_HYPE_MAP[player] = 5.0
-        for player in HYPE_DATA["Tier B"]: PLAYER_HYPE_MAP[player] = 2.0
-        
-        def get_hype_multiplier(player_name):
-            return PLAYER_HYPE_MAP.get(player_name, 1.0) # Default Tier C = 1.0
-
-        # 2. Scoring Helper
-        def calculate_score(row):
-            # Weights: Logoman=1000, Case Hit=500, Auto/Mem=20, Base=1
-            score = 0
-            if "🔥 Logoman" == row['Category']:
-                score = 1000
-            elif "✨ Case Hit" == row['Category']:
-                score = 500
-            elif "💎 Auto/Mem" == row['Category']:
-                score = 20
-            else:
-                score = 1
-            return score
-
-        def rarity_multiplier(numbering):
-            try:
-                num = int(float(numbering))
-            except (ValueError, TypeError):
-                return 1.0
-            if num <= 0:
-                return 1.0
-            mult = 1.0 + (100.0 / num)
-            return min(mult, 10.0)
-
-        def parse_numbering(value):
-            try:
-                return int(float(value))
-            except (ValueError, TypeError):
-                return None
-
-        # ... (Existing categorize_card helper is above) ...
-        def categorize_card(box_type):
-            box_type_str = str(box_type).lower()
-            
-            # 1. Logoman (Top Priority)
-            if "logoman" in box_type_str:
-                return "🔥 Logoman"
-            
-            # 2. Case Hits (New Priority)
-            case_hits_keywords = [
-                'downtown', 'micro', 'micro mosaic',
-                'stained glass', 'strined glass', 'color blast', 'kaboom',
-                'manga', 'sublime', 'night moves',
-                'profile', 'micro-etch', 'photon', 'vortex',
-                'genesis', 'glass mosaic', 'color wheel',
-                'fanatical inserts', 'ultra violet', '451', 'radiating rookies',
-                'advisory', 'paradox', "let's go!", 'glass canvas',
-                'patented', 'finals', 'rock stars'
-            ] # Expanded common case hits + typos
-            if any(k in box_type_str for k in case_hits_keywords):
-                return "✨ Case Hit"
-
-            # 3. Auto/Mem
-            elif any(k in box_type_str for k in ['auto', 'signature', 'patch', 'relic', 'mem', 'jersey']):
-                return "💎 Auto/Mem"
-            else:
-                return "📄 Base/Autre"
+        # Hype tiers and top rookies come from scoring_rules.json
+        TOP_ROOKIES_BY_YEAR = scoring_rules.top_rookies_by_year
 
         # --- Filters ---
         all_products = sorted(df['Product'].dropna().unique().tolist())
         selected_products = st.multiselect("Filtrer par produit :", all_products, default=all_products)
-        if selected_products:
-            df = df[df['Product'].isin(selected_products)]
-            df_p = df_p[df_p['Product'].isin(selected_products)]
-            df_t = df_t[df_t['Product'].isin(selected_products)]
-
-        # --- Scoring prep ---
-        df['Category'] = df['Box Type'].apply(categorize_card)
-        df['Rarity Mult'] = df['Numbering'].apply(rarity_multiplier)
-        df['Score'] = df.apply(calculate_score, axis=1) * df['Rarity Mult']
-
-        # Rebuild exploded frames after scoring/filtering
-        df_p = df.copy()
-        df_p['Player'] = df_p['Player'].astype(str).str.split('/')
-        df_p = df_p.explode('Player')
-        df_p['Player'] = df_p['Player'].str.strip()
-
-        df_t = df.copy()
-        df_t['Team'] = df_t['Team'].astype(str).str.split('/')
-        df_t = df_t.explode('Team')
-        df_t['Team'] = df_t['Team'].str.strip()
-
-        if selection == "🌍 Vue Globale":
-            # --- Aggregation Global ---
-            
-            # Group by Player using Exploded DF
-            player_stats = df_p.groupby('Player').agg({
-                'Hits': 'sum'
-            }).reset_index()
-            
-            # Group by Team using Exploded DF
-            team_stats = df_t.groupby('Team').agg({
-                'Hits': 'sum'
-            }).reset_index()
+        # Category/Score are precomputed per partition; only the product filter applies here
+        product_filter = None
+        if selected_products and len(selected_products) < len(all_products):
+            product_filter = set(selected_products)
+            with perf.span("filter"):
+                df = df[df['Product'].isin(product_filter)]
+                df_p = df_p[df_p['Product'].isin(product_filter)]
+                df_t = df_t[df_t['Product'].isin(product_filter)]
+
+        # --- Bulk export (built only when the download button is clicked) ---
+        if load_job is None:
+            st.sidebar.markdown("### 📦 Export pré-break")
+            export_formats = available_formats()
+            export_fmt = st.sidebar.radio(
+                "Format", export_formats, format_func=lambda f: FORMATS[f][0],
+                horizontal=True, key="export_format",
+            )
+            cost_table = st.session_state.get("cost_by_team")
+            export_cost_map = dict(zip(cost_table["Team"], cost_table["Cost per spot"])) if cost_table is not None else None
+            export_default_cost = st.session_state.get("default_cost", 25.0)
+            export_id = export_key(
+                st.session_state.get("dataset_id"), product_filter,
+                {"costs": export_cost_map, "default_cost": export_default_cost}, export_fmt,
+            )
+            # Everything is bound now: the callable runs on another thread after this rerun
+            build_export_tables = partial(
+                ranking_tables, df, df_p, df_t, scoring_model.categories, scoring_rules.hype_multipliers,
+                cost_map=export_cost_map, default_cost=export_default_cost,
+            )
+            st.sidebar.download_button(
+                "⬇️ Télécharger les classements",
+                data=partial(export_bytes, export_id, export_fmt, build_export_tables),
+                file_name=f"pre_break_{export_id[:8]}.{'zip' if export_fmt == 'parquet' else 'xlsx'}",
+                mime=FORMATS[export_fmt][1],
+                on_click="ignore",
+                key="export_download",
+            )
+
+        with perf.span("view", view=selection.strip()):
+            if selection == "🌍 Vue Globale":
+                # --- Aggregation Global ---
             
-            # --- Global Search ---
-            all_players_global = sorted(player_stats['Player'].unique().tolist())
-            search_player = st.selectbox("🔍 Recherche Rapide Joueur (Tous les joueurs) :", [""] + all_players_global, key="global_search")
+                # Player/Team totals maintained incrementally by the dataset
+                player_stats = dataset.totals('Player', product_filter)[['Player', 'Hits']]
+                team_stats = dataset.totals('Team', product_filter)[['Team', 'Hits']]
             
-            if search_player:
-                st.session_state['target_player'] = search_player
-                go_to_view("🔍 Analyse Joueur")
-
-            # --- Top 15 Logic ---
-            col1, col2 = st.columns(2)
+                # --- Global Search ---
+                all_players_global = sorted(player_stats['Player'].unique().tolist())
+                search_player = st.selectbox("🔍 Recherche Rapide Joueur (Tous les joueurs) :", [""] + all_players_global, key="global_search")
             
-            with col1:
-                st.subheader("🏆 Classement Joueurs (Global)")
-                st.markdown("*(Cliquez sur une ligne pour voir le détail)*")
-                
-                # Full sorted list for Table
-                sorted_players = player_stats.sort_values(by='Hits', ascending=False)
-                show_all_players = st.checkbox("Afficher tout", value=False, key="global_players_show_all")
-                display_players = sorted_players if show_all_players else sorted_players.head(50)
-                
-                # Dataframe with selection
-                event_p = st.dataframe(
-                    display_players, 
-                    use_container_width=True, 
-                    selection_mode="single-row",
-                    on_select="rerun",
-                    key="global_players_table"
-                )
-                
-                # Handle Selection
-                row_idx = get_selected_row(event_p)
-                if row_idx is not None:
-                    selected_player_name = sorted_players.iloc[row_idx]['Player']
-                    st.session_state['target_player'] = selected_player_name
+                if search_player:
+                    st.session_state['target_player'] = search_player
                     go_to_view("🔍 Analyse Joueur")
 
-                # Top 15 for Chart
-                fig_p = px.bar(sorted_players.head(15), x='Player', y='Hits', title="Top 15 Joueurs", color='Hits')
-                st.plotly_chart(fig_p, use_container_width=True)
-
-            with col2:
-                st.subheader("🛡️ Classement Équipes (Global)")
-                st.markdown("*(Cliquez sur une ligne pour voir le détail)*")
-                
-                # Full sorted list for Table
-                sorted_teams = team_stats.sort_values(by='Hits', ascending=False)
-                show_all_teams = st.checkbox("Afficher tout", value=False, key="global_teams_show_all")
-                display_teams = sorted_teams if show_all_teams else sorted_teams.head(50)
+                # --- Top 15 Logic ---
+                col1, col2 = st.columns(2)
+            
+                with col1:
+                    st.subheader("🏆 Classement Joueurs (Global)")
+                    st.markdown("*(Cliquez sur une ligne pour voir le détail)*")
                 
-                # Dataframe with selection
-                event_t = st.dataframe(
-                    display_teams, 
-                    use_container_width=True, 
-                    selection_mode="single-row",
-                    on_select="rerun",
-                    key="global_teams_table"
-                )
-
-                # Handle Selection
-                row_idx = get_selected_row(event_t)
-                if row_idx is not None:
-                    selected_team_name = sorted_teams.iloc[row_idx]['Team']
-                    st.session_state['target_team'] = selected_team_name
-                    go_to_view("🛡️ Analyse Équipe")
+                    # Full sorted list for Table (paginated server-side)
+                    sorted_players = player_stats.sort_values(by='Hits', ascending=False)
+                    selected_row = paginated_table(sorted_players, key="global_players_table", default_sort='Hits', search_column='Player')
+                    if selected_row is not None:
+                        st.session_state['target_player'] = selected_row['Player']
+                        go_to_view("🔍 Analyse Joueur")
+
+                    # Top 15 for Chart
+                    plotly_chart(px.bar, sorted_players.head(15), x='Player', y='Hits', title="Top 15 Joueurs", color='Hits')
+
+                with col2:
+                    st.subheader("🛡️ Classement Équipes (Global)")
+                    st.markdown("*(Cliquez sur une ligne pour voir le détail)*")
                 
-                # Top 15 for Chart
-                fig_t = px.bar(sorted_teams.head(15), x='Team', y='Hits', title="Top 15 Équipes", color='Hits')
-                st.plotly_chart(fig_t, use_container_width=True)
-
-        elif selection == "💎 Autos & Patchs":
-            st.subheader("Analyse Autographes & Memorabilia")
-            st.info("Filtre sur les mots clés : Auto, Signature, Patch, Relic, Mem, Jersey")
+                    # Full sorted list for Table (paginated server-side)
+                    sorted_teams = team_stats.sort_values(by='Hits', ascending=False)
+                    selected_row = paginated_table(sorted_teams, key="global_teams_table", default_sort='Hits', search_column='Team')
+                    if selected_row is not None:
+                        st.session_state['target_team'] = selected_row['Team']
+                        go_to_view("🛡️ Analyse Équipe")
+
+                    # Top 15 for Chart
+                    plotly_chart(px.bar, sorted_teams.head(15), x='Team', y='Hits', title="Top 15 Équipes", color='Hits')
+
+            elif selection == "💎 Autos & Patchs":
+                st.subheader("Analyse Autographes & Memorabilia")
+                st.info("Filtre sur les mots clés : Auto, Signature, Patch, Relic, Mem, Jersey")
             
-            # Keywords for filtering
-            keywords = ['auto', 'signature', 'patch', 'relic', 'mem', 'jersey']
-            pattern = '|'.join(keywords)
+                # Keywords for filtering
+                pattern = '|'.join(scoring_model.keywords("💎 Auto/Mem"))
             
-            # Filter Dataframes
-            # We filter the exploded dataframes
-            df_p_filtered = df_p[df_p['Box Type'].astype(str).str.contains(pattern, case=False, na=False)]
-            df_t_filtered = df_t[df_t['Box Type'].astype(str).str.contains(pattern, case=False, na=False)]
+                # Filter Dataframes
+                # We filter the exploded dataframes
+                df_p_filtered = dataset.memo('auto_rows_p', product_filter, lambda: df_p[df_p['Box Type'].astype(str).str.contains(pattern, case=False, na=False)])
+                df_t_filtered = dataset.memo('auto_rows_t', product_filter, lambda: df_t[df_t['Box Type'].astype(str).str.contains(pattern, case=False, na=False)])
             
-            # Group by Player
-            player_stats_f = df_p_filtered.groupby('Player').agg({'Hits': 'sum'}).reset_index()
-            # Group by Team
-            team_stats_f = df_t_filtered.groupby('Team').agg({'Hits': 'sum'}).reset_index()
+                # Group by Player / Team (cached per dataset state and product filter)
+                player_stats_f = dataset.memo('auto_players', product_filter, lambda: df_p_filtered.groupby('Player').agg({'Hits': 'sum'}).reset_index())
+                team_stats_f = dataset.memo('auto_teams', product_filter, lambda: df_t_filtered.groupby('Team').agg({'Hits': 'sum'}).reset_index())
             
-            col_f1, col_f2 = st.columns(2)
+                col_f1, col_f2 = st.columns(2)
             
-            with col_f1:
-                st.subheader("✒️ Classement Joueurs (Autos/Mem)")
-                st.markdown("*(Cliquez pour le détail)*")
-                sorted_players_f = player_stats_f.sort_values(by='Hits', ascending=False)
+                with col_f1:
+                    st.subheader("✒️ Classement Joueurs (Autos/Mem)")
+                    st.markdown("*(Cliquez pour le détail)*")
+                    sorted_players_f = player_stats_f.sort_values(by='Hits', ascending=False)
                 
-                event_pf = st.dataframe(
-                    sorted_players_f,
-                    use_container_width=True,
-                    selection_mode="single-row",
-                    on_select="rerun",
-                    key="auto_players_table"
-                )
-                
-                row_idx = get_selected_row(event_pf)
-                if row_idx is not None:
-                    selected_player_name = sorted_players_f.iloc[row_idx]['Player']
-                    st.session_state['target_player'] = selected_player_name
-                    go_to_view("🔍 Analyse Joueur")
+                    selected_row = paginated_table(sorted_players_f, key="auto_players_table", default_sort='Hits', search_column='Player')
+                    if selected_row is not None:
+                        selected_player_name = selected_row['Player']
+                        st.session_state['target_player'] = selected_player_name
+                        go_to_view("🔍 Analyse Joueur")
                     
-                fig_pf = px.bar(sorted_players_f.head(15), x='Player', y='Hits', color='Hits')
-                st.plotly_chart(fig_pf, use_container_width=True)
+                    plotly_chart(px.bar, sorted_players_f.head(15), x='Player', y='Hits', color='Hits')
                 
-            with col_f2:
-                st.subheader("🛡️ Classement Équipes (Autos/Mem)")
-                st.markdown("*(Cliquez pour le détail)*")
-                sorted_teams_f = team_stats_f.sort_values(by='Hits', ascending=False)
+                with col_f2:
+                    st.subheader("🛡️ Classement Équipes (Autos/Mem)")
+                    st.markdown("*(Cliquez pour le détail)*")
+                    sorted_teams_f = team_stats_f.sort_values(by='Hits', ascending=False)
                 
-                event_tf = st.dataframe(
-                    sorted_teams_f,
-                    use_container_width=True,
-                    selection_mode="single-row",
-                    on_select="rerun",
-                    key="auto_teams_table"
-                )
-                
-                row_idx = get_selected_row(event_tf)
-                if row_idx is not None:
-                    selected_team_name = sorted_teams_f.iloc[row_idx]['Team']
-                    st.session_state['target_team'] = selected_team_name
-                    go_to_view("🛡️ Analyse Équipe")
+                    selected_row = paginated_table(sorted_teams_f, key="auto_teams_table", default_sort='Hits', search_column='Team')
+                    if selected_row is not None:
+                        selected_team_name = selected_row['Team']
+                        st.session_state['target_team'] = selected_team_name
+                        go_to_view("🛡️ Analyse Équipe")
                     
-                fig_tf = px.bar(sorted_teams_f.head(15), x='Team', y='Hits', color='Hits')
-                st.plotly_chart(fig_tf, use_container_width=True)
+                    plotly_chart(px.bar, sorted_teams_f.head(15), x='Team', y='Hits', color='Hits')
 
-        elif selection == "🔥 Logoman":
-            st.subheader("🔥 Analyse Logoman")
-            st.info("Filtre sur le mot clé : Logoman")
+            elif selection == "🔥 Logoman":
+                st.subheader("🔥 Analyse Logoman")
+                st.info("Filtre sur le mot clé : Logoman")
             
-            # Filter Dataframes
-            df_p_logoman = df_p[df_p['Box Type'].astype(str).str.contains("logoman", case=False, na=False)]
-            df_t_logoman = df_t[df_t['Box Type'].astype(str).str.contains("logoman", case=False, na=False)]
+                # Filter Dataframes
+                df_p_logoman = dataset.memo('logoman_rows_p', product_filter, lambda: df_p[df_p['Box Type'].astype(str).str.contains("logoman", case=False, na=False)])
+                df_t_logoman = dataset.memo('logoman_rows_t', product_filter, lambda: df_t[df_t['Box Type'].astype(str).str.contains("logoman", case=False, na=False)])
             
-            # Group by Player
-            player_stats_l = df_p_logoman.groupby('Player').agg({'Hits': 'sum'}).reset_index()
-            # Group by Team
-            team_stats_l = df_t_logoman.groupby('Team').agg({'Hits': 'sum'}).reset_index()
+                # Group by Player / Team (cached per dataset state and product filter)
+                player_stats_l = dataset.memo('logoman_players', product_filter, lambda: df_p_logoman.groupby('Player').agg({'Hits': 'sum'}).reset_index())
+                team_stats_l = dataset.memo('logoman_teams', product_filter, lambda: df_t_logoman.groupby('Team').agg({'Hits': 'sum'}).reset_index())
             
-            col_l1, col_l2 = st.columns(2)
+                col_l1, col_l2 = st.columns(2)
             
-            with col_l1:
-                st.subheader("🔥 Classement Joueurs (Logoman)")
-                st.markdown("*(Cliquez pour le détail)*")
-                sorted_players_l = player_stats_l.sort_values(by='Hits', ascending=False)
-                
-                event_pl = st.dataframe(
-                    sorted_players_l,
-                    use_container_width=True,
-                    selection_mode="single-row",
-                    on_select="rerun",
-                    key="logoman_players_table"
-                )
+                with col_l1:
+                    st.subheader("🔥 Classement Joueurs (Logoman)")
+                    st.markdown("*(Cliquez pour le détail)*")
+                    sorted_players_l = player_stats_l.sort_values(by='Hits', ascending=False)
                 
-                row_idx = get_selected_row(event_pl)
-                if row_idx is not None:
-                    selected_player_name = sorted_players_l.iloc[row_idx]['Player']
-                    st.session_state['target_player'] = selected_player_name
-                    go_to_view("🔍 Analyse Joueur")
+                    selected_row = paginated_table(sorted_players_l, key="logoman_players_table", default_sort='Hits', search_column='Player')
+                    if selected_row is not None:
+                        selected_player_name = selected_row['Player']
+                        st.session_state['target_player'] = selected_player_name
+                        go_to_view("🔍 Analyse Joueur")
                     
-                fig_pl = px.bar(sorted_players_l.head(15), x='Player', y='Hits', color='Hits')
-                st.plotly_chart(fig_pl, use_container_width=True)
+                    plotly_chart(px.bar, sorted_players_l.head(15), x='Player', y='Hits', color='Hits')
                 
-            with col_l2:
-                st.subheader("🔥 Classement Équipes (Logoman)")
-                st.markdown("*(Cliquez pour le détail)*")
-                sorted_teams_l = team_stats_l.sort_values(by='Hits', ascending=False)
-                
-                event_tl = st.dataframe(
-                    sorted_teams_l,
-                    use_container_width=True,
-                    selection_mode="single-row",
-                    on_select="rerun",
-                    key="logoman_teams_table"
-                )
+                with col_l2:
+                    st.subheader("🔥 Classement Équipes (Logoman)")
+                    st.markdown("*(Cliquez pour le détail)*")
+                    sorted_teams_l = team_stats_l.sort_values(by='Hits', ascending=False)
                 
-                row_idx = get_selected_row(event_tl)
-                if row_idx is not None:
-                    selected_team_name = sorted_teams_l.iloc[row_idx]['Team']
-                    st.session_state['target_team'] = selected_team_name
-                    go_to_view("🛡️ Analyse Équipe")
+                    selected_row = paginated_table(sorted_teams_l, key="logoman_teams_table", default_sort='Hits', search_column='Team')
+                    if selected_row is not None:
+                        selected_team_name = selected_row['Team']
+                        st.session_state['target_team'] = selected_team_name
+                        go_to_view("🛡️ Analyse Équipe")
                     
-                fig_tl = px.bar(sorted_teams_l.head(15), x='Team', y='Hits', color='Hits')
-                st.plotly_chart(fig_tl, use_container_width=True)
+                    plotly_chart(px.bar, sorted_teams_l.head(15), x='Team', y='Hits', color='Hits')
 
-        elif selection == "✨ Case Hits":
-            st.subheader("✨ Analyse Case Hits (Downtown, Kaboom, Color Blast, Manga...)")
-            # Keywords display
-            st.info("Filtre sur : DOWNTOWN, KABOOM, COLOR BLAST, MANGA, SUBLIME, GENESIS, VORTEX...")
-            
-            # Filter Dataframes by category (relies on categorization done previously/on-the-fly? No, we filter by box_type string to be safe or re-use helper)
-            # To be consistent with other blocks, let's filter by string content, BUT leveraging the categorize_card function logic is better.
-            # However, other blocks do str.contains. Let's stick to the pattern used in categorize_card
+            elif selection == "✨ Case Hits":
+                st.subheader("✨ Analyse Case Hits (Downtown, Kaboom, Color Blast, Manga...)")
+                # Keywords display
+                st.info("Filtre sur : DOWNTOWN, KABOOM, COLOR BLAST, MANGA, SUBLIME, GENESIS, VORTEX...")
             
-            case_hits_keywords = [
-                'downtown', 'micro', 'micro mosaic',
-                'stained glass', 'strined glass', 'color blast', 'kaboom',
-                'manga', 'sublime', 'night moves',
-                'profile', 'micro-etch', 'photon', 'vortex',
-                'genesis', 'glass mosaic', 'color wheel',
-                'fanatical inserts', 'ultra violet', '451', 'radiating rookies',
-                'advisory', 'paradox', "let's go!", 'glass canvas',
-                'patented', 'finals', 'rock stars'
-            ]
-            pattern = '|'.join(case_hits_keywords)
+                # Filter Dataframes by category (relies on categorization done previously/on-the-fly? No, we filter by box_type string to be safe or re-use helper)
+                # To be consistent with other blocks, let's filter by string content, BUT leveraging the ScoringModel.categorize logic is better.
+                # However, other blocks do str.contains. Let's stick to the keywords used by ScoringModel.categorize
             
-            df_p_ch = df_p[df_p['Box Type'].astype(str).str.contains(pattern, case=False, na=False)]
-            df_t_ch = df_t[df_t['Box Type'].astype(str).str.contains(pattern, case=False, na=False)]
+                pattern = '|'.join(scoring_model.keywords("✨ Case Hit"))
             
-            # Group by Player with details
-            player_stats_ch = df_p_ch.groupby('Player').agg({
-                'Hits': 'sum',
-                'Box Type': lambda x: ', '.join(sorted(list(set(str(v) for v in x)))),
-                'File': lambda x: ', '.join(sorted(list(set(str(v) for v in x))))
-            }).reset_index()
-            player_stats_ch.rename(columns={'Box Type': 'Variantes', 'File': 'Box / Checklist'}, inplace=True)
+                df_p_ch = dataset.memo('case_hits_rows_p', product_filter, lambda: df_p[df_p['Box Type'].astype(str).str.contains(pattern, case=False, na=False)])
+                df_t_ch = dataset.memo('case_hits_rows_t', product_filter, lambda: df_t[df_t['Box Type'].astype(str).str.contains(pattern, case=False, na=False)])
             
-            # Group by Team with details
-            team_stats_ch = df_t_ch.groupby('Team').agg({
-                'Hits': 'sum',
-                'Box Type': lambda x: ', '.join(sorted(list(set(str(v) for v in x)))),
-                'File': lambda x: ', '.join(sorted(list(set(str(v) for v in x))))
-            }).reset_index()
-            team_stats_ch.rename(columns={'Box Type': 'Variantes', 'File': 'Box / Checklist'}, inplace=True)
+                # Hits only; the joined 'Variantes' / 'Box / Checklist' strings are
+                # computed for the visible page rows (see case_hit_details)
+                player_stats_ch = dataset.memo('case_hits_players', product_filter, lambda: df_p_ch.groupby('Player').agg({'Hits': 'sum'}).reset_index())
+                team_stats_ch = dataset.memo('case_hits_teams', product_filter, lambda: df_t_ch.groupby('Team').agg({'Hits': 'sum'}).reset_index())
             
-            col_ch1, col_ch2 = st.columns(2)
+                col_ch1, col_ch2 = st.columns(2)
             
-            with col_ch1:
-                st.subheader("✨ Classement Joueurs (Case Hits)")
-                st.markdown("*(Cliquez pour le détail)*")
-                sorted_players_ch = player_stats_ch.sort_values(by='Hits', ascending=False)
-                
-                event_pch = st.dataframe(
-                    sorted_players_ch,
-                    use_container_width=True,
-                    selection_mode="single-row",
-                    on_select="rerun",
-                    key="ch_players_table"
-                )
+                with col_ch1:
+                    st.subheader("✨ Classement Joueurs (Case Hits)")
+                    st.markdown("*(Cliquez pour le détail)*")
+                    sorted_players_ch = player_stats_ch.sort_values(by='Hits', ascending=False)
                 
-                row_idx = get_selected_row(event_pch)
-                if row_idx is not None:
-                    selected_player_name = sorted_players_ch.iloc[row_idx]['Player']
-                    st.session_state['target_player'] = selected_player_name
-                    go_to_view("🔍 Analyse Joueur")
+                    selected_row = paginated_table(sorted_players_ch, key="ch_players_table", default_sort='Hits', search_column='Player', enrich=case_hit_details(df_p_ch, 'Player'))
+                    if selected_row is not None:
+                        selected_player_name = selected_row['Player']
+                        st.session_state['target_player'] = selected_player_name
+                        go_to_view("🔍 Analyse Joueur")
                     
-                if not sorted_players_ch.empty:
-                    fig_pch = px.bar(sorted_players_ch.head(15), x='Player', y='Hits', color='Hits', title="Top Players - Case Hits")
-                    st.plotly_chart(fig_pch, use_container_width=True)
-                else:
-                    st.info("Aucun Case Hit trouvé pour les joueurs.")
-                
-            with col_ch2:
-                st.subheader("✨ Classement Équipes (Case Hits)")
-                st.markdown("*(Cliquez pour le détail)*")
-                sorted_teams_ch = team_stats_ch.sort_values(by='Hits', ascending=False)
+                    if not sorted_players_ch.empty:
+                        plotly_chart(px.bar, sorted_players_ch.head(15), x='Player', y='Hits', color='Hits', title="Top Players - Case Hits")
+                    else:
+                        st.info("Aucun Case Hit trouvé pour les joueurs.")
                 
-                event_tch = st.dataframe(
-                    sorted_teams_ch,
-                    use_container_width=True,
-                    selection_mode="single-row",
-                    on_select="rerun",
-                    key="ch_teams_table"
-                )
+                with col_ch2:
+                    st.subheader("✨ Classement Équipes (Case Hits)")
+                    st.markdown("*(Cliquez pour le détail)*")
+                    sorted_teams_ch = team_stats_ch.sort_values(by='Hits', ascending=False)
                 
-                row_idx = get_selected_row(event_tch)
-                if row_idx is not None:
-                    selected_team_name = sorted_teams_ch.iloc[row_idx]['Team']
-                    st.session_state['target_team'] = selected_team_name
-                    go_to_view("🛡️ Analyse Équipe")
+                    selected_row = paginated_table(sorted_teams_ch, key="ch_teams_table", default_sort='Hits', search_column='Team', enrich=case_hit_details(df_t_ch, 'Team'))
+                    if selected_row is not None:
+                        selected_team_name = selected_row['Team']
+                        st.session_state['target_team'] = selected_team_name
+                        go_to_view("🛡️ Analyse Équipe")
                     
-                if not sorted_teams_ch.empty:
-                    fig_tch = px.bar(sorted_teams_ch.head(15), x='Team', y='Hits', color='Hits', title="Top Teams - Case Hits")
-                    st.plotly_chart(fig_tch, use_container_width=True)
+                    if not sorted_teams_ch.empty:
+                        plotly_chart(px.bar, sorted_teams_ch.head(15), x='Team', y='Hits', color='Hits', title="Top Teams - Case Hits")
+                    else:
+                        st.info("Aucun Case Hit trouvé pour les équipes.")
+
+            elif selection == "💠 Raretés":
+                st.subheader("💠 Cartes les plus rares du catalogue")
+
+                serial_index = dataset.memo('serial_index', product_filter, lambda: SerialIndex(df))
+                col_r1, col_r2, col_r3, col_r4 = st.columns(4)
+                col_r1.metric("1/1", serial_index.count(max_serial=1, min_serial=1))
+                col_r2.metric("≤ /5", serial_index.count(max_serial=5, min_serial=1))
+                col_r3.metric("≤ /10", serial_index.count(max_serial=10, min_serial=1))
+                col_r4.metric("≤ /25", serial_index.count(max_serial=25, min_serial=1))
+
+                max_rare = st.select_slider("Numérotées jusqu'à /", options=[1, 5, 10, 25, 50, 99], value=10, key="rare_max_serial")
+                rare_df = df.iloc[serial_index.numbered(max_rare)]
+
+                # Players are counted on the exploded view so dual cards count for each name
+                player_index = dataset.memo('serial_index_players_all', product_filter, lambda: SerialIndex(df_p))
+                rare_players = df_p.iloc[player_index.numbered(max_rare)].groupby('Player', as_index=False)['Hits'].sum()
+
+                col_r5, col_r6 = st.columns([2, 1])
+                with col_r5:
+                    st.subheader(f"Cartes numérotées ≤ /{max_rare}")
+                    paginated_table(
+                        rare_df[['Player', 'Team', 'Box Type', 'Serial', 'Category', 'File']],
+                        key="rare_cards_table", default_sort='Serial', sort_columns=['Serial', 'Player', 'Team', 'File'],
+                        search_column='Player', selectable=False, ascending=True,
+                    )
+                with col_r6:
+                    st.subheader("🏆 Joueurs")
+                    selected_row = paginated_table(
+                        rare_players.sort_values('Hits', ascending=False), key="rare_players_table",
+                        default_sort='Hits', search_column='Player', page_size=25,
+                    )
+                    if selected_row is not None:
+                        st.session_state['target_player'] = selected_row['Player']
+                        go_to_view("🔍 Analyse Joueur")
+
+                histogram = serial_index.histogram()
+                if not histogram.empty:
+                    serial_dist = histogram[histogram.index <= 99].reset_index()
+                    serial_dist['Serial'] = '/' + serial_dist['Serial'].astype(str)
+                    plotly_chart(px.bar, serial_dist, x='Serial', y='Cartes', title="Répartition des numérotations (≤ /99)")
+
+            elif selection == "📈 Tendances":
+                st.subheader("📈 Tendances par saison")
+                st.caption("Agrégats annuels de tout le dossier local (pas seulement les fichiers sélectionnés), calculés une fois par fichier.")
+
+                record_cache_call("load_trends")
+                with st.spinner("Agrégation des saisons..."):
+                    trends = load_trends(folder_path, folder_signature(folder_path), scoring_model.version, scoring_model)
+                seasons = trends.years()
+                if len(seasons) < 2:
+                    st.info("Il faut au moins deux saisons dans le dossier local pour calculer des tendances.")
                 else:
-                    st.info("Aucun Case Hit trouvé pour les équipes.")
-
-        elif selection == "👥 Multi-Joueurs":
-            st.subheader("👥 Analyse Multi-Joueurs / Dual / Triple")
-            st.info("Liste des cartes comportant plusieurs joueurs (séparés par un '/')")
-            
-            # Filter original df for '/'
-            multi_player_df = df[df['Player'].astype(str).str.contains('/', na=False)]
+                    st.caption(f"Saisons : {', '.join(seasons)}")
+                    tab_rising, tab_share, tab_player = st.tabs(["🚀 Joueurs en hausse", "🛡️ Part des équipes", "🔍 Historique joueur"])
+
+                    with tab_rising:
+                        col_tr1, col_tr2 = st.columns(2)
+                        trend_category = col_tr1.selectbox("Catégorie", ["💎 Auto/Mem", "✨ Case Hit", "🔥 Logoman", "📄 Base/Autre"], key="trend_category")
+                        if len(seasons) > 2:
+                            trend_window = col_tr2.slider("Saisons prises en compte", 2, len(seasons), min(3, len(seasons)), key="trend_window")
+                        else:
+                            # A slider needs min < max
+                            trend_window = 2
+                            col_tr2.caption("Saisons prises en compte : 2")
+                        rising = trends.rising('Player', trend_category, product_filter, window=trend_window)
+                        st.markdown("*Pente = gain de part (points de %) par saison sur la fenêtre choisie.*")
+                        selected_row = paginated_table(rising, key="trend_rising_table", default_sort='Pente (pts/saison)', search_column='Player', hide_index=True)
+                        if selected_row is not None:
+                            st.session_state['target_player'] = selected_row['Player']
+                            go_to_view("🔍 Analyse Joueur")
+                        if not rising.empty:
+                            top_names = rising['Player'].head(10).tolist()
+                            pivot = trends.by_year('Player', product_filter, trend_category, dated=True)
+                            lines = pivot.loc[top_names].iloc[:, -trend_window:].rename_axis(columns='Year').stack().rename('Hits').reset_index()
+                            plotly_chart(px.line, lines, x='Year', y='Hits', color='Player', markers=True, title=f"{trend_category} par saison (top 10 en hausse)")
+
+                    with tab_share:
+                        share_category = st.selectbox("Catégorie", ["✨ Case Hit", "🔥 Logoman", "💎 Auto/Mem"], key="trend_share_category")
+                        share = trends.share_by_season('Team', share_category, product_filter)
+                        if share.empty:
+                            st.info("Aucune carte de cette catégorie.")
+                        else:
+                            top_teams = share.groupby('Team')['Hits'].sum().nlargest(10).index
+                            share_top = share[share['Team'].isin(top_teams)].sort_values('Year')
+                            plotly_chart(px.bar, share_top, x='Year', y='Part (%)', color='Team', title=f"Part des {share_category} par saison (top 10 équipes)")
+                            share_table = share.pivot_table(index='Team', columns='Year', values='Part (%)', fill_value=0)
+                            st.dataframe(share_table.loc[share_table.sum(axis=1).sort_values(ascending=False).index], use_container_width=True)
+
+                    with tab_player:
+                        trend_players = trends.tables['Player'].groupby('Player')['Hits'].sum().sort_values(ascending=False).index.tolist()
+                        default_trend = trend_players.index(st.session_state['target_player']) if st.session_state.get('target_player') in trend_players else 0
+                        trend_player = st.selectbox("Joueur", trend_players, index=default_trend, key="trend_player")
+                        history = trends.series('Player', trend_player, product_filter)
+                        if history.empty:
+                            st.info("Aucune carte pour ce joueur avec ces produits.")
+                        else:
+                            plotly_chart(px.bar, history, x='Year', y='Hits', color='Category', title=f"Cartes par saison : {trend_player}")
+
+            elif selection == "👥 Multi-Joueurs":
+                st.subheader("👥 Analyse Multi-Joueurs / Dual / Triple")
+                st.info("Liste des cartes comportant plusieurs joueurs (séparés par un '/')")
             
-            # Extract unique players involved in these cards for the filter
-            unique_multi_players = sorted(list(set([p.strip() for sublist in multi_player_df['Player'].str.split('/') for p in sublist])))
+                # Pair/combination tables are built per partition at load time
+                co_occurrence = dataset.co_occurrence(product_filter)
+
+                # Filter original df for '/'
+                multi_player_df = df[df['Player'].astype(str).str.contains('/', na=False)]
             
-            # Filter Box
-            selected_multi_player = st.selectbox("Filtrer par joueur inclus :", ["Tous"] + unique_multi_players)
+                # Filter Box
+                selected_multi_player = st.selectbox("Filtrer par joueur inclus :", ["Tous"] + co_occurrence.players())
             
-            if selected_multi_player != "Tous":
-                 # Filter rows where the selected player is present in the split list
-                 multi_player_df = multi_player_df[multi_player_df['Player'].apply(lambda x: selected_multi_player in [p.strip() for p in x.split('/')])]
+                if selected_multi_player != "Tous":
+                     # df_p is indexed by the df row each player came from
+                     player_rows = df_p.index[df_p['Player'] == selected_multi_player]
+                     multi_player_df = multi_player_df[multi_player_df.index.isin(player_rows)]
 
-            st.markdown(f"**Nombre de cartes :** {len(multi_player_df)}")
+                st.markdown(f"**Nombre de cartes :** {len(multi_player_df)}")
             
-            col_m1, col_m2 = st.columns([2, 1])
+                col_m1, col_m2 = st.columns([2, 1])
             
-            with col_m1:
-                st.dataframe(multi_player_df, use_container_width=True)
+                with col_m1:
+                    st.dataframe(multi_player_df, use_container_width=True)
                 
-            with col_m2:
-                st.markdown("#### Stats Rapides")
-                # Count pairs/groups
-                top_combinations = multi_player_df['Player'].value_counts().reset_index()
-                top_combinations.columns = ['Combinaison', 'Hits']
-                st.dataframe(top_combinations, use_container_width=True)
+                with col_m2:
+                    st.markdown("#### Stats Rapides")
+                    filter_player = None if selected_multi_player == "Tous" else selected_multi_player
+                    if filter_player:
+                        st.markdown(f"**Partenaires de {filter_player}**")
+                        st.dataframe(co_occurrence.partners(filter_player), use_container_width=True, hide_index=True)
+                    # Combinations counted regardless of name order on the card
+                    tab_dual, tab_triple, tab_all = st.tabs(["Duos", "Trios", "Toutes"])
+                    with tab_dual:
+                        st.dataframe(co_occurrence.top_combinations(2, filter_player), use_container_width=True, hide_index=True)
+                    with tab_triple:
+                        st.dataframe(co_occurrence.top_combinations(3, filter_player), use_container_width=True, hide_index=True)
+                    with tab_all:
+                        st.dataframe(co_occurrence.top_combinations(None, filter_player), use_container_width=True, hide_index=True)
+
+                    st.download_button(
+                        "Exporter le graphe (JSON)",
+                        data=co_occurrence.graph_json().encode("utf-8"),
+                        file_name="multi_joueurs_graph.json",
+                        mime="application/json",
+                    )
+                    st.download_button(
+                        "Exporter les paires (CSV)",
+                        data=co_occurrence.pairs.to_csv(index=False).encode("utf-8"),
+                        file_name="multi_joueurs_paires.csv",
+                        mime="text/csv",
+                    )
                 
-        elif selection == "⚖️ Comparateur Joueurs":
-            st.subheader("⚖️ Comparateur de Joueurs")
-            st.info("Sélectionnez plusieurs joueurs pour comparer leurs stats.")
+            elif selection == "⚖️ Comparateur Joueurs":
+                st.subheader("⚖️ Comparateur de Joueurs")
+                st.info("Sélectionnez plusieurs joueurs pour comparer leurs stats.")
             
-            # Get list of players
-            all_players_comp = sorted(df_p['Player'].unique().tolist())
-
-            def parse_player_list(raw_text):
-                if not raw_text:
-                    return []
-                parts = re.split(r"[,\n;]+", raw_text)
-                return [p.strip() for p in parts if p.strip()]
-
-            if "compare_list_active" not in st.session_state:
-                st.session_state.compare_list_active = False
-            if "compare_list_players" not in st.session_state:
-                st.session_state.compare_list_players = []
-
-            st.markdown("##### Comparer une liste")
-            raw_list = st.text_area(
-                "Colle ta liste (1 par ligne ou séparé par virgule)",
-                key="compare_list_text"
-            )
-            col_cmp1, col_cmp2 = st.columns([1, 1])
-            with col_cmp1:
-                if st.button("Comparer la liste", key="compare_list_btn"):
-                    parsed = parse_player_list(raw_list)
-                    st.session_state.compare_list_players = parsed
-                    st.session_state.compare_list_active = True
-            with col_cmp2:
-                if st.button("Revenir à la sélection", key="compare_list_reset"):
+                # Get list of players
+                all_players_comp = sorted(df_p['Player'].unique().tolist())
+
+                def parse_player_list(raw_text):
+                    if not raw_text:
+                        return []
+                    parts = re.split(r"[,\n;]+", raw_text)
+                    return [p.strip() for p in parts if p.strip()]
+
+                if "compare_list_active" not in st.session_state:
                     st.session_state.compare_list_active = False
+                if "compare_list_resolved" not in st.session_state:
+                    st.session_state.compare_list_resolved = []
 
-            if st.session_state.compare_list_active:
-                selected_players_comp = st.session_state.compare_list_players
-                st.caption(f"{len(selected_players_comp)} joueur(s) collé(s).")
-            else:
-                selected_players_comp = st.multiselect("Choix des joueurs :", all_players_comp)
+                st.markdown("##### Comparer une liste")
+                raw_list = st.text_area(
+                    "Colle ta liste (1 par ligne ou séparé par virgule)",
+                    key="compare_list_text"
+                )
+                col_cmp1, col_cmp2 = st.columns([1, 1])
+                with col_cmp1:
+                    if st.button("Comparer la liste", key="compare_list_btn"):
+                        # Typos / missing accents resolved against a trigram index of all players
+                        player_search = dataset.memo('player_search', product_filter, lambda: PlayerSearch(all_players_comp))
+                        st.session_state.compare_list_resolved = player_search.resolve(parse_player_list(raw_list))
+                        st.session_state.compare_list_active = True
+                with col_cmp2:
+                    if st.button("Revenir à la sélection", key="compare_list_reset"):
+                        st.session_state.compare_list_active = False
+
+                missing = []
+                if st.session_state.compare_list_active:
+                    resolved = st.session_state.compare_list_resolved
+                    selected_players_comp = []
+                    corrected = []
+                    for i, entry in enumerate(resolved):
+                        if entry["match"] is not None:
+                            selected_players_comp.append(entry["match"])
+                            if entry["match"] != entry["query"] and entry["score"] < 1:
+                                corrected.append(f"{entry['query']} → {entry['match']}")
+                        elif entry["suggestions"]:
+                            options = [""] + [name for name, _ in entry["suggestions"]]
+                            scores = dict(entry["suggestions"])
+                            choice = st.selectbox(
+                                f"❓ « {entry['query']} » : vouliez-vous dire…", options,
+                                format_func=lambda name, scores=scores: name and f"{name} ({scores[name]:.0%})",
+                                key=f"compare_suggest_{i}_{entry['query']}",
+                            )
+                            if choice:
+                                selected_players_comp.append(choice)
+                        else:
+                            missing.append(entry["query"])
+                    # Two pasted spellings of the same player count once
+                    selected_players_comp = list(dict.fromkeys(selected_players_comp))
+                    st.caption(f"{len(resolved)} joueur(s) collé(s), {len(selected_players_comp)} retenu(s).")
+                    if corrected:
+                        st.caption("Corrigé(s) automatiquement : " + ", ".join(corrected))
+                else:
+                    selected_players_comp = st.multiselect("Choix des joueurs :", all_players_comp)
 
-            if selected_players_comp:
-                comparison_data = []
-                
-                for p in selected_players_comp:
-                    # Filter data
-                    p_data = df_p[df_p['Player'] == p].copy()
-                    p_data['Category'] = p_data['Box Type'].apply(categorize_card)
-                    p_data['Rarity Mult'] = p_data['Numbering'].apply(rarity_multiplier)
-                    
-                    total = p_data['Hits'].sum()
-                    cat_counts = p_data['Category'].value_counts()
-                    logo = cat_counts.get("🔥 Logoman", 0)
-                    case_hit = cat_counts.get("✨ Case Hit", 0)
-                    auto = cat_counts.get("💎 Auto/Mem", 0)
-                    base = cat_counts.get("📄 Base/Autre", 0)
-                    score = (p_data.apply(calculate_score, axis=1) * p_data['Rarity Mult']).sum()
-                    
-                    comparison_data.append({
-                        "Joueur": p,
-                        "Total Cartes": total,
-                        "Score": round(score, 2),
-                        "🔥 Logoman": logo,
-                        "✨ Case Hit": case_hit,
-                        "💎 Auto/Mem": auto,
-                        "📄 Base/Autre": base
-                    })
-                
-                comp_df = pd.DataFrame(comparison_data)
-                
-                # Sorting option? Default by Score
-                st.dataframe(comp_df.sort_values(by="Score", ascending=False), use_container_width=True)
-                
-                total_row = {
-                    "Joueur": "TOTAL",
-                    "Total Cartes": comp_df["Total Cartes"].sum(),
-                    "Score": round(comp_df["Score"].sum(), 2),
-                    "🔥 Logoman": comp_df["🔥 Logoman"].sum(),
-                    "✨ Case Hit": comp_df["✨ Case Hit"].sum(),
-                    "💎 Auto/Mem": comp_df["💎 Auto/Mem"].sum(),
-                    "📄 Base/Autre": comp_df["📄 Base/Autre"].sum(),
-                }
-                st.markdown("##### Total global")
-                st.dataframe(pd.DataFrame([total_row]), use_container_width=True)
-                col_tot1, col_tot2, col_tot3, col_tot4, col_tot5, col_tot6 = st.columns(6)
-                col_tot1.metric("Total Cartes", total_row["Total Cartes"])
-                col_tot2.metric("Score", total_row["Score"])
-                col_tot3.metric("🔥 Logoman", total_row["🔥 Logoman"])
-                col_tot4.metric("✨ Case Hit", total_row["✨ Case Hit"])
-                col_tot5.metric("💎 Auto/Mem", total_row["💎 Auto/Mem"])
-                col_tot6.metric("📄 Base/Autre", total_row["📄 Base/Autre"])
-
-                missing = [p for p in selected_players_comp if p not in all_players_comp]
                 if missing:
                     st.warning(f"Introuvable(s) dans les données: {', '.join(missing)}")
 
-                # Chart
-                fig_comp = px.bar(comp_df, x="Joueur", y=["🔥 Logoman", "✨ Case Hit", "💎 Auto/Mem", "📄 Base/Autre"], title="Comparaison Visuelle", barmode='stack')
-                st.plotly_chart(fig_comp, use_container_width=True)
-
-
-        elif selection == "🧠 Value Picks":
-            st.subheader("🧠 Value Picks")
-            st.info(
-                "La note combine le type de carte (Logoman > Case Hit > Auto/Mem > Base) "
-                "et la rareté (numérotation faible = bonus). "
-                "Le Value Index = Score / Hype (moins hype = meilleur value)."
-            )
-
-            player_scores = df.groupby("Player").agg({
-                "Hits": "sum",
-                "Score": "sum",
-            }).reset_index()
-            player_scores["Hype"] = player_scores["Player"].apply(get_hype_multiplier)
-            player_scores["Value Index"] = player_scores["Score"] / player_scores["Hype"].replace(0, 1)
+                if selected_players_comp:
+                    comp_df = comparison(df_p, selected_players_comp, ["🔥 Logoman", "✨ Case Hit", "💎 Auto/Mem", "📄 Base/Autre"])
+                
+                    # Sorting option? Default by Score
+                    st.dataframe(comp_df.sort_values(by="Score", ascending=False), use_container_width=True)
+                
+                    total_row = {
+                        "Joueur": "TOTAL",
+                        "Total Cartes": comp_df["Total Cartes"].sum(),
+                        "Score": round(comp_df["Score"].sum(), 2),
+                        "🔥 Logoman": comp_df["🔥 Logoman"].sum(),
+                        "✨ Case Hit": comp_df["✨ Case Hit"].sum(),
+                        "💎 Auto/Mem": comp_df["💎 Auto/Mem"].sum(),
+                        "📄 Base/Autre": comp_df["📄 Base/Autre"].sum(),
+                    }
+                    st.markdown("##### Total global")
+                    st.dataframe(pd.DataFrame([total_row]), use_container_width=True)
+                    col_tot1, col_tot2, col_tot3, col_tot4, col_tot5, col_tot6 = st.columns(6)
+                    col_tot1.metric("Total Cartes", total_row["Total Cartes"])
+                    col_tot2.metric("Score", total_row["Score"])
+                    col_tot3.metric("🔥 Logoman", total_row["🔥 Logoman"])
+                    col_tot4.metric("✨ Case Hit", total_row["✨ Case Hit"])
+                    col_tot5.metric("💎 Auto/Mem", total_row["💎 Auto/Mem"])
+                    col_tot6.metric("📄 Base/Autre", total_row["📄 Base/Autre"])
+
+                    # Chart
+                    plotly_chart(px.bar, comp_df, x="Joueur", y=["🔥 Logoman", "✨ Case Hit", "💎 Auto/Mem", "📄 Base/Autre"], title="Comparaison Visuelle", barmode='stack')
+
+
+            elif selection == "🧠 Value Picks":
+                st.subheader("🧠 Value Picks")
+                st.info(
+                    "La note combine le type de carte (Logoman > Case Hit > Auto/Mem > Base) "
+                    "et la rareté (numérotation faible = bonus). "
+                    "Le Value Index = Score / Hype (moins hype = meilleur value)."
+                )
 
-            player_scores = player_scores.sort_values(by="Value Index", ascending=False)
-            st.dataframe(player_scores.head(50), use_container_width=True)
+                player_scores = df.groupby("Player").agg({
+                    "Hits": "sum",
+                    "Score": "sum",
+                }).reset_index()
+                player_scores["Hype"] = scoring_rules.hype_multipliers(player_scores["Player"])
+                player_scores["Value Index"] = player_scores["Score"] / player_scores["Hype"].replace(0, 1)
+
+                player_scores = player_scores.sort_values(by="Value Index", ascending=False)
+                st.dataframe(player_scores.head(50), use_container_width=True)
+
+                with st.expander("🧮 Comparer les modèles de score"):
+                    st.caption(f"Modèle actif : {scoring_model.label} (version {scoring_model.version}). Les modèles sont définis dans scoring_rules.json.")
+                    compared = st.multiselect(
+                        "Modèles", model_names, default=model_names,
+                        format_func=lambda name: scoring_rules.models[name].label, key="compare_models",
+                    )
+                    if compared:
+                        models = [scoring_rules.models[name] for name in compared]
+                        # All models scored in one pass over the exploded rows
+                        model_scores = dataset.memo(
+                            ('model_scores',) + tuple(m.version for m in models), product_filter,
+                            lambda: evaluate_models(df_p, models, scoring_model).groupby(df_p['Player']).sum(),
+                        )
+                        ranks = model_scores.rank(ascending=False, method='min').astype(int).add_prefix("Rang ")
+                        side_by_side = model_scores.round(1).join(ranks)
+                        side_by_side = side_by_side.sort_values(f"Rang {models[0].label}")
+                        st.dataframe(side_by_side.head(50), use_container_width=True)
+
+                top20 = player_scores.head(20)
+                csv_data = top20.to_csv(index=False).encode("utf-8")
+                st.download_button("Exporter Top 20 (CSV)", data=csv_data, file_name="top20_value_picks.csv", mime="text/csv")
+
+            elif selection == "💸 Cost par Pick":
+                st.subheader("💸 Cost par Pick")
+                st.info(
+                    "Renseigne le coût par équipe pour obtenir le meilleur rapport qualité/prix."
+                )
 
-            top20 = player_scores.head(20)
-            csv_data = top20.to_csv(index=False).encode("utf-8")
-            st.download_button("Exporter Top 20 (CSV)", data=csv_data, file_name="top20_value_picks.csv", mime="text/csv")
+                default_cost = st.number_input("Coût par spot (par équipe)", min_value=0.0, value=25.0, step=0.5, key="default_cost")
 
-        elif selection == "💸 Cost par Pick":
-            st.subheader("💸 Cost par Pick")
-            st.info(
-                "Renseigne le coût par équipe pour obtenir le meilleur rapport qualité/prix."
-            )
+                teams = sorted(df['Team'].dropna().unique().tolist())
+                if "cost_by_team" not in st.session_state:
+                    st.session_state.cost_by_team = pd.DataFrame({
+                        "Team": teams,
+                        "Cost per spot": [default_cost] * len(teams),
+                    })
+                else:
+                    for t in teams:
+                        if t not in st.session_state.cost_by_team["Team"].tolist():
+                            st.session_state.cost_by_team = pd.concat(
+                                [
+                                    st.session_state.cost_by_team,
+                                    pd.DataFrame({"Team": [t], "Cost per spot": [default_cost]}),
+                                ],
+                                ignore_index=True,
+                            )
+
+                cost_df = st.data_editor(
+                    st.session_state.cost_by_team,
+                    use_container_width=True,
+                    hide_index=True,
+                    num_rows="fixed",
+                )
+                st.session_state.cost_by_team = cost_df
+
+                cost_map = dict(zip(
+                    st.session_state.cost_by_team["Team"],
+                    st.session_state.cost_by_team["Cost per spot"],
+                ))
+
+                team_cost_df = team_cost(df, cost_map, default_cost)
+                st.subheader("🛡️ Équipes (meilleur value)")
+                st.dataframe(team_cost_df.head(50), use_container_width=True)
+
+            elif selection == "🧨 Rookies":
+                st.subheader("🧨 Rookies en vue")
+                st.info("Saison rookie = première saison avec une carte 'RC' / 'Rookie'. Draft : listes top rookies (scoring_rules.json), sinon déduite de la saison rookie.")
+
+                # Per-player season rows are computed at load time; this is a concat + lookup
+                rookie_index = dataset.rookie_index(TOP_ROOKIES_BY_YEAR, product_filter)
+                rookie_seasons = rookie_index.seasons_list()
+                if not rookie_seasons:
+                    st.info("Aucun rookie détecté sur ce filtre.")
+                else:
+                    rookie_season = st.selectbox(
+                        "Saison rookie", ["Toutes"] + rookie_seasons[::-1], key="rookie_season",
+                    )
+                    rookies = rookie_index.ranking(None if rookie_season == "Toutes" else rookie_season)
+                    rookies = rookies.assign(**{
+                        'Top 6': rookies['Top 6'].map(lambda rank: f"⭐ #{rank}" if pd.notna(rank) else ""),
+                        'RC Score': rookies['RC Score'].round(1),
+                        'Score': rookies['Score'].round(1),
+                    })[['Player', 'Saison rookie', 'Draft', 'Top 6', 'RC Hits', 'RC Score', 'Hits', 'Score']]
+                    st.markdown("#### Classement des rookies (score des cartes RC)")
+                    selected_row = paginated_table(rookies, key="rookies_table", default_sort='RC Score', search_column='Player', hide_index=True)
+                    if selected_row is not None:
+                        st.session_state['target_player'] = selected_row['Player']
+                        go_to_view("🔍 Analyse Joueur")
+
+                st.markdown("#### Top rookies hype par draft : présence dans les produits sélectionnés")
+                picks = rookie_index.top_picks_presence()
+                picks['Présent'] = picks['Présent'].map({True: "✅", False: "—"})
+                st.dataframe(
+                    picks[['Draft', 'Top', 'Player', 'Présent', 'RC Hits', 'RC Score', 'Hits']],
+                    use_container_width=True, hide_index=True,
+                )
 
-            default_cost = st.number_input("Coût par spot (par équipe)", min_value=0.0, value=25.0, step=0.5)
+            elif selection == "⚡ Live Mode":
+                st.subheader("⚡ Live Mode (Pick rapide)")
+                st.info("Top picks instantanés basés sur le score. Les spots vendus sont partagés entre toutes les sessions.")
 
-            teams = sorted(df['Team'].dropna().unique().tolist())
-            if "cost_by_team" not in st.session_state:
-                st.session_state.cost_by_team = pd.DataFrame({
-                    "Team": teams,
-                    "Cost per spot": [default_cost] * len(teams),
-                })
-            else:
-                for t in teams:
-                    if t not in st.session_state.cost_by_team["Team"].tolist():
-                        st.session_state.cost_by_team = pd.concat(
-                            [
-                                st.session_state.cost_by_team,
-                                pd.DataFrame({"Team": [t], "Cost per spot": [default_cost]}),
-                            ],
-                            ignore_index=True,
-                        )
+                top_n = st.slider("Nombre de picks affichés", 3, 20, 5, key="live_top_n")
+                # Heaps built once per dataset and product filter; selling a spot never rebuilds them
+                boards = {
+                    kind: dataset.memo(f'live_{kind}', product_filter, lambda kind=kind: TopK.from_rows(df, kind))
+                    for kind in KINDS
+                }
+                live_board(boards, get_live_state(folder_path), top_n)
 
-            cost_df = st.data_editor(
-                st.session_state.cost_by_team,
-                use_container_width=True,
-                hide_index=True,
-                num_rows="fixed",
-            )
-            st.session_state.cost_by_team = cost_df
-
-            cost_map = dict(zip(
-                st.session_state.cost_by_team["Team"],
-                st.session_state.cost_by_team["Cost per spot"],
-            ))
-
-            df_cost = df.copy()
-            df_cost["Cost"] = df_cost["Team"].map(cost_map).fillna(default_cost)
-            df_cost["Value per Cost"] = df_cost["Score"] / df_cost["Cost"].replace(0, 1)
-
-            team_cost = df_cost.groupby("Team").agg({
-                "Hits": "sum",
-                "Score": "sum",
-                "Cost": "sum",
-            }).reset_index()
-            team_cost["Value/€"] = team_cost["Score"] / team_cost["Cost"].replace(0, 1)
-            team_cost = team_cost.sort_values(by="Value/€", ascending=False)
-            st.subheader("🛡️ Équipes (meilleur value)")
-            st.dataframe(team_cost.head(50), use_container_width=True)
-
-        elif selection == "🧨 Rookies":
-            st.subheader("🧨 Rookies en vue")
-            st.info("Détection via 'RC' ou 'Rookie' dans le type de carte.")
-
-            st.markdown("#### Top rookies hype par annee (draft)")
-            rookie_rows = [
-                {"Annee": year, "Top 6": ", ".join(names)}
-                for year, names in sorted(TOP_ROOKIES_BY_YEAR.items())
-            ]
-            st.dataframe(pd.DataFrame(rookie_rows), use_container_width=True)
-
-            df_rookie = df[df['Box Type'].astype(str).str.contains(r"\brc\b|rookie", case=False, na=False)]
-            if df_rookie.empty:
-                st.info("Aucun rookie détecté sur ce filtre.")
-            else:
-                rookies = df_rookie.groupby("Player").agg({
-                    "Hits": "sum",
-                    "Score": "sum",
-                }).reset_index()
-                rookies = rookies.sort_values(by="Score", ascending=False)
-                st.dataframe(rookies.head(50), use_container_width=True)
-
-        elif selection == "⚡ Live Mode":
-            st.subheader("⚡ Live Mode (Pick rapide)")
-            st.info("Top picks instantanés basés sur le score.")
-
-            player_scores = df.groupby("Player").agg({"Score": "sum"}).reset_index()
-            team_scores = df.groupby("Team").agg({"Score": "sum"}).reset_index()
-            top_players = player_scores.sort_values(by="Score", ascending=False).head(5)
-            top_teams = team_scores.sort_values(by="Score", ascending=False).head(5)
-
-            col_lp, col_lt = st.columns(2)
-            with col_lp:
-                st.markdown("#### Top 5 Joueurs")
-                for _, row in top_players.iterrows():
-                    st.metric(row["Player"], f"{row['Score']:.1f}")
-            with col_lt:
-                st.markdown("#### Top 5 Équipes")
-                for _, row in top_teams.iterrows():
-                    st.metric(row["Team"], f"{row['Score']:.1f}")
-
-        elif selection == " Par Fichier":
-            st.subheader("Analyse par Fichier")
+            elif selection == " Par Fichier":
+                st.subheader("Analyse par Fichier")
             
-            all_files = sorted(df['File'].unique().tolist())
-            selected_file = st.selectbox("Choisir une checklist :", all_files)
+                all_files = sorted(df['File'].unique().tolist())
+                selected_file = st.selectbox("Choisir une checklist :", all_files)
             
-            if selected_file:
-                file_df = df[df['File'] == selected_file].copy()
-                file_df['Category'] = file_df['Box Type'].apply(categorize_card)
+                if selected_file:
+                    file_df = df[df['File'] == selected_file]
                 
-                total_hits = file_df['Hits'].sum()
-                cat_counts = file_df['Category'].value_counts()
+                    # Counted on the loaded rows, so they follow the sidebar's scoring model
+                    # like the tables below (the catalogue index uses the default one)
+                    total_hits = file_df['Hits'].sum()
+                    cat_counts = file_df['Category'].value_counts()
                 
-                col_fa1, col_fa2, col_fa3, col_fa4, col_fa5 = st.columns(5)
-                col_fa1.metric("Total Cartes", total_hits)
-                col_fa2.metric("🔥 Logoman", cat_counts.get("🔥 Logoman", 0))
-                col_fa3.metric("✨ Case Hit", cat_counts.get("✨ Case Hit", 0))
-                col_fa4.metric("💎 Auto/Mem", cat_counts.get("💎 Auto/Mem", 0))
-                col_fa5.metric("📄 Base/Autre", cat_counts.get("📄 Base/Autre", 0))
+                    col_fa1, col_fa2, col_fa3, col_fa4, col_fa5 = st.columns(5)
+                    col_fa1.metric("Total Cartes", total_hits)
+                    col_fa2.metric("🔥 Logoman", cat_counts.get("🔥 Logoman", 0))
+                    col_fa3.metric("✨ Case Hit", cat_counts.get("✨ Case Hit", 0))
+                    col_fa4.metric("💎 Auto/Mem", cat_counts.get("💎 Auto/Mem", 0))
+                    col_fa5.metric("📄 Base/Autre", cat_counts.get("📄 Base/Autre", 0))
+                    # Families are grouped per partition at load time
+                    all_families = dataset.families(product_filter)
+                    if all_families is not None:
+                        st.caption(f"🧬 {int((all_families['File'] == selected_file).sum())} famille(s) de cartes une fois les parallèles regroupés.")
                 
-                st.markdown("---")
+                    st.markdown("---")
                 
-                col_fa6, col_fa7 = st.columns(2)
-                with col_fa6:
-                    player_stats_file = file_df.groupby('Player').agg({'Hits': 'sum'}).reset_index()
-                    player_stats_file = player_stats_file.sort_values(by='Hits', ascending=False)
-                    st.subheader("🏆 Joueurs (Fichier)")
-                    st.dataframe(player_stats_file, use_container_width=True)
+                    col_fa6, col_fa7 = st.columns(2)
+                    with col_fa6:
+                        player_stats_file = file_df.groupby('Player').agg({'Hits': 'sum'}).reset_index()
+                        player_stats_file = player_stats_file.sort_values(by='Hits', ascending=False)
+                        st.subheader("🏆 Joueurs (Fichier)")
+                        st.dataframe(player_stats_file, use_container_width=True)
                 
-                with col_fa7:
-                    team_stats_file = file_df.groupby('Team').agg({'Hits': 'sum'}).reset_index()
-                    team_stats_file = team_stats_file.sort_values(by='Hits', ascending=False)
-                    st.subheader("🛡️ Équipes (Fichier)")
-                    st.dataframe(team_stats_file, use_container_width=True)
+                    with col_fa7:
+                        team_stats_file = file_df.groupby('Team').agg({'Hits': 'sum'}).reset_index()
+                        team_stats_file = team_stats_file.sort_values(by='Hits', ascending=False)
+                        st.subheader("🛡️ Équipes (Fichier)")
+                        st.dataframe(team_stats_file, use_container_width=True)
                 
-                st.markdown("---")
-                st.subheader("Détail des cartes")
-                max_serial = st.number_input("Filtre numérotation (<= /xx)", min_value=0, value=0, step=1, key="file_serial")
-                display_file_df = file_df.copy()
-                if max_serial > 0:
-                    display_file_df = display_file_df[
-                        display_file_df['Numbering'].apply(parse_numbering).fillna(0) <= max_serial
-                    ]
-                st.dataframe(display_file_df[['Player', 'Team', 'Box Type', 'Numbering', 'Category', 'Hits']], use_container_width=True)
-
-        elif selection == "🔍 Analyse Joueur":
-            st.subheader("Analyse détaillée par Joueur")
+                    st.markdown("---")
+                    st.subheader("Détail des cartes")
+                    max_serial = st.number_input("Filtre numérotation (<= /xx)", min_value=0, value=0, step=1, key="file_serial")
+                    display_file_df = file_df
+                    if max_serial > 0:
+                        file_index = dataset.memo('serial_index_files', product_filter, lambda: SerialIndex(df, 'File'))
+                        display_file_df = df.iloc[file_index.positions(selected_file, max_serial)]
+                    file_families = None
+                    if max_serial == 0 and all_families is not None:
+                        file_families = all_families[all_families['File'] == selected_file]
+                    card_table(
+                        display_file_df, ['Player', 'Team', 'Box Type', 'Numbering', 'Category', 'Hits'],
+                        ['Player', 'Team', 'Base Set', 'Category', 'Parallèles', 'Hits', 'Min Serial'],
+                        key="file_cards_table", sort_columns=['Player', 'Team', 'Box Type', 'Category'],
+                        search_column='Player', families=file_families, memo_key=(selected_file, max_serial),
+                    )
+
+            elif selection == "🔍 Analyse Joueur":
+                st.subheader("Analyse détaillée par Joueur")
             
-            # Get list of players from Exploded DF
-            all_players = df_p['Player'].value_counts().index.tolist()
+                # Get list of players from Exploded DF
+                all_players = df_p['Player'].value_counts().index.tolist()
             
-            # Check for pre-selected player from navigation
-            default_index = 0
-            if 'target_player' in st.session_state and st.session_state['target_player'] in all_players:
-                default_index = all_players.index(st.session_state['target_player'])
+                # Check for pre-selected player from navigation
+                default_index = 0
+                if 'target_player' in st.session_state and st.session_state['target_player'] in all_players:
+                    default_index = all_players.index(st.session_state['target_player'])
             
-            selected_player = st.selectbox("Rechercher un joueur :", all_players, index=default_index, key="player_selector")
+                selected_player = st.selectbox("Rechercher un joueur :", all_players, index=default_index, key="player_selector")
             
-            if selected_player:
-                # Filter data for this player
-                player_data = df_p[df_p['Player'] == selected_player]
-                
-                # --- Categorization Logic (Using Helper) ---
-                player_data['Category'] = player_data['Box Type'].apply(categorize_card)
+                if selected_player:
+                    # Filter data for this player
+                    player_data = df_p[df_p['Player'] == selected_player]
                 
-                # Metrics
-                total_hits = player_data['Hits'].sum()
+                    # Metrics
+                    total_hits = player_data['Hits'].sum()
                 
-                # Breakdown counts
-                cat_counts = player_data['Category'].value_counts()
-                count_logoman = cat_counts.get("🔥 Logoman", 0)
-                count_casehit = cat_counts.get("✨ Case Hit", 0)
-                count_auto = cat_counts.get("💎 Auto/Mem", 0)
-                count_base = cat_counts.get("📄 Base/Autre", 0)
-
-                col1, col2, col3, col4, col5 = st.columns(5)
-                col1.metric("Total Cartes", total_hits)
-                col2.metric("🔥 Logoman", count_logoman)
-                col3.metric("✨ Case Hit", count_casehit)
-                col4.metric("💎 Auto/Mem", count_auto)
-                col5.metric("📄 Base/Autre", count_base)
+                    # Breakdown counts
+                    cat_counts = player_data['Category'].value_counts()
+                    count_logoman = cat_counts.get("🔥 Logoman", 0)
+                    count_casehit = cat_counts.get("✨ Case Hit", 0)
+                    count_auto = cat_counts.get("💎 Auto/Mem", 0)
+                    count_base = cat_counts.get("📄 Base/Autre", 0)
+
+                    col1, col2, col3, col4, col5 = st.columns(5)
+                    col1.metric("Total Cartes", total_hits)
+                    col2.metric("🔥 Logoman", count_logoman)
+                    col3.metric("✨ Case Hit", count_casehit)
+                    col4.metric("💎 Auto/Mem", count_auto)
+                    col5.metric("📄 Base/Autre", count_base)
                 
-                st.markdown("---")
+                    st.markdown("---")
                 
-                # --- Charts & Filter ---
-                col_c1, col_c2 = st.columns(2)
+                    # --- Charts & Filter ---
+                    col_c1, col_c2 = st.columns(2)
                 
-                with col_c1:
-                    st.subheader("Répartition par Type")
-                    fig_cat = px.pie(player_data, names='Category', values='Hits', title=f"Types de cartes : {selected_player}", hole=0.3)
-                    st.plotly_chart(fig_cat, use_container_width=True)
+                    with col_c1:
+                        st.subheader("Répartition par Type")
+                        # Pre-aggregated: one slice per category instead of one value per card
+                        cat_dist = player_data.groupby('Category', as_index=False)['Hits'].sum()
+                        plotly_chart(px.pie, cat_dist, names='Category', values='Hits', title=f"Types de cartes : {selected_player}", hole=0.3)
                     
-                with col_c2:
-                    st.subheader("Répartition par Fichier")
-                    # Group by File
-                    file_dist = player_data.groupby('File').agg({'Hits': 'sum'}).reset_index()
-                    fig_dist = px.pie(file_dist, names='File', values='Hits', title=f"Répartition par Checklist : {selected_player}")
-                    st.plotly_chart(fig_dist, use_container_width=True)
+                    with col_c2:
+                        st.subheader("Répartition par Fichier")
+                        # Group by File
+                        file_dist = player_data.groupby('File', observed=True).agg({'Hits': 'sum'}).reset_index()
+                        plotly_chart(px.pie, file_dist, names='File', values='Hits', title=f"Répartition par Checklist : {selected_player}")
                 
-                st.markdown("---")
-                st.subheader("Détail des cartes")
+                    st.markdown("---")
+                    st.subheader("Détail des cartes")
                 
-                # Filter by Category for the table
-                filter_cat = st.radio("Filtrer le tableau par type :", ["Tous", "🔥 Logoman", "✨ Case Hit", "💎 Auto/Mem", "📄 Base/Autre"], horizontal=True)
-                max_serial_p = st.number_input("Filtre numérotation (<= /xx)", min_value=0, value=0, step=1, key="player_serial")
+                    # Filter by Category for the table
+                    filter_cat = st.radio("Filtrer le tableau par type :", ["Tous", "🔥 Logoman", "✨ Case Hit", "💎 Auto/Mem", "📄 Base/Autre"], horizontal=True)
+                    max_serial_p = st.number_input("Filtre numérotation (<= /xx)", min_value=0, value=0, step=1, key="player_serial")
                 
-                if filter_cat != "Tous":
-                    display_df = player_data[player_data['Category'] == filter_cat]
-                else:
-                    display_df = player_data
-                if max_serial_p > 0:
-                    display_df = display_df[
-                        display_df['Numbering'].apply(parse_numbering).fillna(0) <= max_serial_p
-                    ]
-
-                st.dataframe(display_df[['Category', 'Box Type', 'Numbering', 'Team', 'Hits', 'File']], use_container_width=True)
-
-        elif selection == "🛡️ Analyse Équipe":
-             st.subheader("Analyse détaillée par Équipe")
+                    if filter_cat != "Tous":
+                        display_df = player_data[player_data['Category'] == filter_cat]
+                    else:
+                        display_df = player_data
+                    if max_serial_p > 0:
+                        player_index = dataset.memo('serial_index_players', product_filter, lambda: SerialIndex(df_p, 'Player'))
+                        display_df = df_p.iloc[player_index.positions(selected_player, max_serial_p)]
+                        if filter_cat != "Tous":
+                            display_df = display_df[display_df['Category'] == filter_cat]
+
+                    card_table(
+                        display_df, ['Category', 'Box Type', 'Numbering', 'Team', 'Hits', 'File'],
+                        ['Category', 'Base Set', 'Parallèles', 'Min Serial', 'Team', 'Hits', 'File'],
+                        key="player_cards_table", sort_columns=['Category', 'Box Type', 'Team', 'File'],
+                        search_column='Base Set' if show_families else 'Box Type',
+                        memo_key=(selected_player, filter_cat, max_serial_p),
+                    )
+
+            elif selection == "🛡️ Analyse Équipe":
+                 st.subheader("Analyse détaillée par Équipe")
             
-             # Get list of teams from Exploded DF
-             all_teams = df_t['Team'].value_counts().index.tolist()
+                 # Per-team summaries computed once per dataset and product filter
+                 team_summaries = dataset.memo('team_summaries', product_filter, lambda: TeamSummaries(df_t, scoring_model.categories))
+                 all_teams = team_summaries.teams
              
-             # Check for pre-selected team from navigation
-             default_index_t = 0
-             if 'target_team' in st.session_state and st.session_state['target_team'] in all_teams:
-                 default_index_t = all_teams.index(st.session_state['target_team'])
+                 # Check for pre-selected team from navigation
+                 default_index_t = 0
+                 if 'target_team' in st.session_state and st.session_state['target_team'] in all_teams:
+                     default_index_t = all_teams.index(st.session_state['target_team'])
 
-             selected_team = st.selectbox("Rechercher une équipe :", all_teams, index=default_index_t, key="team_selector")
+                 selected_team = st.selectbox("Rechercher une équipe :", all_teams, index=default_index_t, key="team_selector")
              
-             if selected_team:
-                 team_df_sub = df_t[df_t['Team'] == selected_team]
-                 total_hits_t = len(team_df_sub)
+                 if selected_team:
+                     summary = team_summaries.get(selected_team)
+                     cat_counts_t = summary['categories']
                  
-                 st.markdown(f"### {selected_team}")
-                 st.markdown(f"**Total Cartes :** {total_hits_t}")
+                     st.markdown(f"### {selected_team}")
+                     col_tm1, col_tm2, col_tm3, col_tm4, col_tm5, col_tm6 = st.columns(6)
+                     col_tm1.metric("Total Cartes", summary['hits'])
+                     col_tm2.metric("Score", f"{summary['score']:.1f}")
+                     col_tm3.metric("🔥 Logoman", cat_counts_t.get("🔥 Logoman", 0))
+                     col_tm4.metric("✨ Case Hit", cat_counts_t.get("✨ Case Hit", 0))
+                     col_tm5.metric("💎 Auto/Mem", cat_counts_t.get("💎 Auto/Mem", 0))
+                     col_tm6.metric("📄 Base/Autre", cat_counts_t.get("📄 Base/Autre", 0))
                  
-                 # File Distribution
-                 file_counts_t = team_df_sub['File'].value_counts().reset_index()
-                 file_counts_t.columns = ['File', 'Count']
+                     st.markdown("---")
                  
-                 col_t1, col_t2 = st.columns([1, 1])
+                     col_t1, col_t2 = st.columns([1, 1])
                  
-                 with col_t1:
-                      st.markdown("#### Répartition par Fichier")
-                      fig_pie_file_t = px.pie(file_counts_t, values='Count', names='File', title=f"Répartition par Fichier")
-                      st.plotly_chart(fig_pie_file_t, use_container_width=True)
+                     with col_t1:
+                          st.markdown("#### Répartition par Fichier")
+                          plotly_chart(px.pie, summary['files'], values='Count', names='File', title=f"Répartition par Fichier")
  
-                 with col_t2:
+                     with col_t2:
+                         st.markdown("#### Top Joueurs (score)")
+                         st.dataframe(summary['players'], use_container_width=True, hide_index=True)
+
+                     if len(summary['serials']):
+                         st.markdown("#### Numérotations")
+                         serial_hist_t = summary['serials'].reset_index()
+                         serial_hist_t['Serial'] = "/" + serial_hist_t['Serial'].astype(str)
+                         plotly_chart(px.bar, serial_hist_t, x='Serial', y='Cartes', title=f"Cartes numérotées : {selected_team}")
+
+                     st.markdown("---")
                      st.markdown("#### Détail des cartes")
                      max_serial_t = st.number_input("Filtre numérotation (<= /xx)", min_value=0, value=0, step=1, key="team_serial")
-                     display_team_df = team_df_sub.copy()
+                     display_team_df = df_t.iloc[summary['positions']]
                      if max_serial_t > 0:
-                         display_team_df = display_team_df[
-                             display_team_df['Numbering'].apply(parse_numbering).fillna(0) <= max_serial_t
-                         ]
-                     st.dataframe(display_team_df[['Player', 'Box Type', 'Numbering', 'Hits', 'File']], use_container_width=True)
-
-
+                         team_index = dataset.memo('serial_index_teams', product_filter, lambda: SerialIndex(df_t, 'Team'))
+                         display_team_df = df_t.iloc[team_index.positions(selected_team, max_serial_t)]
+                     card_table(
+                         display_team_df, ['Player', 'Box Type', 'Numbering', 'Category', 'Hits', 'File'],
+                         ['Player', 'Base Set', 'Category', 'Parallèles', 'Min Serial', 'Hits', 'File'],
+                         key="team_cards_table", sort_columns=['Player', 'Box Type', 'Category', 'File'],
+                         search_column='Player', memo_key=(selected_team, max_serial_t),
+                     )
             
-    else:
+    elif load_job is None:
         st.error(msg)
         if error_files:
             with st.expander(f"{len(error_files)} fichier(s) ignoré(s)"):
@@ -1231,3 +1361,36 @@ else:
     3.  Vous pouvez déposer des fichiers via l'upload cloud ou les mettre dans le dossier local.
     4.  Cliquez sur **Lancer l'analyse** pour voir les stats.
     """)
+
+# --- Debug panel ---
+perf.flush_cache_stats()
+if show_perf_panel:
+    with st.sidebar.expander("🐞 Perf (ce rerun)", expanded=True):
+        st.caption(f"Run {perf.run_id} • {perf.total_ms('load_data') + perf.total_ms('concat') + perf.total_ms('view')} ms (chargement + vue)")
+        if perf.spans:
+            spans_df = pd.DataFrame(perf.spans)
+            st.dataframe(
+                spans_df.groupby('name').agg(ms=('ms', 'sum'), appels=('ms', 'size')).sort_values('ms', ascending=False),
+                use_container_width=True,
+            )
+            if 'bytes' in spans_df.columns:
+                charts_df = spans_df.loc[spans_df['name'] == 'plotly', ['chart', 'ms', 'bytes']]
+                st.caption(f"Graphiques : {charts_df['bytes'].sum() / 1024:.1f} Ko envoyés")
+                st.dataframe(charts_df, use_container_width=True, hide_index=True)
+        if perf.memory:
+            mem_df = pd.DataFrame(perf.memory)
+            mem_df['MB'] = (mem_df['bytes'] / 1e6).round(2)
+            st.dataframe(mem_df[['name', 'rows', 'MB']], use_container_width=True, hide_index=True)
+        stats = cache_stats()
+        if stats:
+            st.dataframe(pd.DataFrame(stats).T, use_container_width=True)
+        store = dataset_store.stats()
+        st.caption(
+            f"Store partagé : {store['datasets']} dataset(s), {store['partitions']} partition(s), "
+            f"{store['bytes'] / 1e6:.1f} / {store['budget_bytes'] / 1e6:.0f} MB, {store['evictions']} éviction(s)"
+        )
+
+# Poll the background loader: rerun until every partition has been collected
+if st.session_state.get("load_job") is not None:
+    time.sleep(POLL_SECONDS)
+    st.rerun()
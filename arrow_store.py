@@ -0,0 +1,198 @@
+import glob
+import importlib.util
+import json
+import os
+import re
+import sys
+import threading
+
+from dataset import extract_product, extract_year, normalize_checklist, read_teams_clean
+
+# Arrow IPC copy of the cleaned checklists, published by the cleaner next to
+# its xlsx output and read by the app instead of parsing the workbook:
+#   checklists_clean/arrow/<year>/<product>/<file>.<generation>.arrow
+#   checklists_clean/arrow/manifest.json
+# Data files are written once under a new name and the manifest is swapped
+# with os.replace, so a reader sees either the old or the new set of files,
+# never a half-written one; the app notices a new manifest on its next stat.
+# Files hold the frame as normalize_checklist returns it and are read through a
+# memory map with to_pandas(split_blocks=True): the string and numeric columns
+# stay views of the mapped file, so every app process on the host shares those
+# pages through the page cache instead of decoding and normalising a private
+# copy. Only the categorical codes of the per-file constants and the columns a
+# Partition derives per scoring model are private to a process.
+# pyarrow is optional; without it nothing is published and the app reads xlsx.
+# The cleaner is the only writer (one batch job at a time).
+
+ARROW_DIRNAME = "arrow"
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_VERSION = 2
+
+
+def available():
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def file_signature(path):
+    stat = os.stat(path)
+    return stat.st_mtime, stat.st_size
+
+
+def partition_dir(filename):
+    # "<year>/<product>", product made safe for a directory name
+    product = re.sub(r"[^\w.-]+", "-", extract_product(filename)).strip("-") or "produit"
+    return os.path.join(extract_year(filename), product)
+
+
+class ArrowStore:
+    def __init__(self, folder):
+        self.folder = folder
+        self.root = os.path.join(folder, ARROW_DIRNAME)
+        self.manifest_path = os.path.join(self.root, MANIFEST_FILENAME)
+        self.generation = 0
+        self.entries = {}  # xlsx filename -> manifest entry
+        self._manifest_stat = None
+        self._lock = threading.Lock()
+
+    # --- reading (app) ---
+
+    def refresh(self):
+        # Re-reads the manifest only when it was swapped since the last call
+        try:
+            stat = os.stat(self.manifest_path)
+        except OSError:
+            with self._lock:
+                self.generation, self.entries, self._manifest_stat = 0, {}, None
+            return
+        signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        with self._lock:
+            if signature == self._manifest_stat:
+                return
+            manifest = self._load_manifest()
+            self.generation = manifest["generation"]
+            self.entries = manifest["files"]
+            self._manifest_stat = signature
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, encoding="utf-8") as fh:
+                manifest = json.load(fh)
+        except (OSError, ValueError):
+            manifest = {}
+        if manifest.get("version") != MANIFEST_VERSION:
+            return {"generation": 0, "files": {}}
+        return manifest
+
+    def entry(self, source_path):
+        # Manifest entry of an xlsx file, None if not published or edited since
+        self.refresh()
+        entry = self.entries.get(os.path.basename(source_path))
+        if entry is None:
+            return None
+        try:
+            mtime, size = file_signature(source_path)
+        except OSError:
+            return None
+        if entry["mtime"] != mtime or entry["size"] != size:
+            return None
+        return entry
+
+    def read(self, source_path):
+        # (df, notes) as normalize_checklist(read_teams_clean(source_path), ...)
+        # returns them, or None to fall back to the workbook. The mapping stays
+        # alive as long as the frame's columns reference it.
+        entry = self.entry(source_path)
+        if entry is None or not available():
+            return None
+        import pyarrow as pa
+        try:
+            with pa.memory_map(os.path.join(self.root, entry["path"]), "r") as source:
+                df = pa.ipc.open_file(source).read_all().to_pandas(split_blocks=True)
+        except (OSError, pa.ArrowInvalid):
+            return None
+        return df, list(entry.get("notes", []))
+
+    # --- writing (cleaner) ---
+
+    def publish(self, filename, frame, source_path):
+        # Writes frame (the Teams_clean sheet of source_path, as the app reads
+        # it) once normalised, and swaps the manifest. Returns False when
+        # pyarrow is missing, the sheet is unusable or a column can't be typed
+        # (mixed cells): the app keeps reading the xlsx.
+        if not available():
+            return False
+        import pyarrow as pa
+        df, notes = normalize_checklist(frame, filename)
+        if df is None:
+            return False
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            return False
+
+        with self._lock:
+            manifest = self._load_manifest()
+            previous = manifest["files"]
+            generation = manifest["generation"] + 1
+            stem = os.path.splitext(filename)[0]
+            rel_path = os.path.join(partition_dir(filename), f"{stem}.{generation}.arrow")
+            path = os.path.join(self.root, rel_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = path + ".tmp"
+            with pa.OSFile(tmp_path, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp_path, path)
+
+            mtime, size = file_signature(source_path)
+            files = dict(previous)
+            files[filename] = {
+                "path": rel_path,
+                "year": extract_year(filename),
+                "product": extract_product(filename),
+                "rows": table.num_rows,
+                "notes": notes,
+                "mtime": mtime,
+                "size": size,
+            }
+            tmp_manifest = self.manifest_path + ".tmp"
+            with open(tmp_manifest, "w", encoding="utf-8") as fh:
+                json.dump({"version": MANIFEST_VERSION, "generation": generation, "files": files}, fh, ensure_ascii=False, indent=1)
+            os.replace(tmp_manifest, self.manifest_path)
+            self._remove_unreferenced(previous, files)
+        return True
+
+    def publish_workbook(self, path):
+        # Backfill for an already cleaned workbook
+        try:
+            frame = read_teams_clean(path)
+        except ValueError:
+            return False
+        return self.publish(os.path.basename(path), frame, path)
+
+    def _remove_unreferenced(self, previous, current):
+        # Files of the previous manifest are kept: a reader may have loaded it
+        # just before the swap and not opened its files yet.
+        kept = {e["path"] for e in previous.values()} | {e["path"] for e in current.values()}
+        for path in glob.glob(os.path.join(self.root, "*", "*", "*.arrow")):
+            if os.path.relpath(path, self.root) not in kept:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+def main():
+    # python arrow_store.py checklists_clean : publishes every cleaned workbook
+    folder = sys.argv[1] if len(sys.argv) > 1 else "checklists_clean"
+    if not available():
+        print("pyarrow n'est pas installé.")
+        return
+    store = ArrowStore(folder)
+    paths = sorted(p for p in glob.glob(os.path.join(folder, "*.xlsx")) if not os.path.basename(p).startswith("~$"))
+    published = sum(store.publish_workbook(p) for p in paths)
+    print(f"Fichiers publiés: {published}/{len(paths)} -> {store.root}")
+
+
+if __name__ == "__main__":
+    main()
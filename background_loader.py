@@ -0,0 +1,58 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Checklist files are read on a process-wide thread pool so the Streamlit
+# script never blocks on openpyxl. A LoadJob is the handle a session keeps in
+# st.session_state: each rerun collects the partitions that finished since the
+# previous one, and a job is cancelled when the user changes the selection.
+
+MAX_WORKERS = min(4, os.cpu_count() or 1)
+# Delay between the reruns that poll a running job
+POLL_SECONDS = 0.4
+
+_lock = threading.Lock()
+_executor = None
+
+
+def executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="checklist-loader")
+        return _executor
+
+
+class LoadJob:
+    def __init__(self, target_id, dataset, tasks, load):
+        # tasks: {key: (filename, source)}; load(key, filename, source) runs in
+        # a worker thread and returns (partition | None, notes).
+        self.target_id = target_id
+        self.dataset = dataset
+        self.total = len(tasks)
+        self.cancelled = False
+        pool = executor()
+        self._futures = {
+            pool.submit(load, key, filename, source): (key, filename)
+            for key, (filename, source) in tasks.items()
+        }
+
+    @property
+    def completed(self):
+        return self.total - len(self._futures)
+
+    def done(self):
+        return not self._futures
+
+    def collect(self):
+        # (key, filename, future) for every task finished since the last call
+        finished = [f for f in self._futures if f.done()]
+        return [(*self._futures.pop(f), f) for f in finished]
+
+    def cancel(self):
+        # Queued files are dropped; a file already being read finishes in the
+        # background and is simply not collected.
+        for future in self._futures:
+            future.cancel()
+        self._futures.clear()
+        self.cancelled = True
@@ -0,0 +1,212 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+from datetime import datetime
+
+import pandas as pd
+
+from arrow_store import ArrowStore, available as arrow_available
+from clean_checklists import extract_numbering, infer_columns, is_header_row, process_file
+from dataset import ChecklistDataset, Partition, normalize_checklist, read_teams_clean
+from instrumentation import Instrumentation
+from layouts import LayoutCache
+from synthetic_checklists import generate_catalogue
+from xlsx_reader import list_sheets, read_sheet
+
+# Headless timing of the cleaner and of the app's load/score/aggregate stages
+# on synthetic checklists. Each run is appended to a JSON file so versions can
+# be compared:
+#   python benchmark.py --products 5 --rows 100000
+# --checklists also compares the two xlsx readers on the largest real files:
+#   python benchmark.py --checklists checklists_clean
+
+
+def git_revision():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def bench_cleaner(perf, raw_paths, clean_dir):
+    clean_paths = []
+    for path in raw_paths:
+        filename = os.path.basename(path)
+        df_raw = pd.read_excel(path, sheet_name="Teams", header=None, engine="openpyxl")
+        df_raw = df_raw.dropna(axis=1, how="all")
+        if is_header_row(df_raw.iloc[0].tolist()):
+            df_raw = df_raw.iloc[1:].reset_index(drop=True)
+        with perf.span("clean.infer_columns", file=filename):
+            infer_columns(df_raw)
+        rows = df_raw.values.tolist()
+        with perf.span("clean.extract_numbering", file=filename):
+            for row in rows:
+                extract_numbering(row)
+
+        dst_path = os.path.join(clean_dir, filename)
+        shutil.copy2(path, dst_path)
+        with perf.span("clean.process_file", file=filename):
+            process_file(path, dst_path)
+        clean_paths.append(dst_path)
+
+    # Same files again through a layout cache: the first pass learns each
+    # layout, the second reuses it and skips inference.
+    layouts = LayoutCache()
+    for path, dst_path in zip(raw_paths, clean_paths):
+        filename = os.path.basename(path)
+        for stage in ("clean.layout_learn", "clean.layout_cached"):
+            shutil.copy2(path, dst_path)
+            with perf.span(stage, file=filename):
+                process_file(path, dst_path, layouts)
+    return clean_paths
+
+
+def bench_app(perf, clean_paths):
+    dataset = ChecklistDataset()
+    for path in clean_paths:
+        filename = os.path.basename(path)
+        with perf.span("app.read", file=filename):
+            df = read_teams_clean(path)
+        with perf.span("app.normalise", file=filename):
+            df, _ = normalize_checklist(df, filename)
+        with perf.span("app.partition", file=filename):
+            partition = Partition(path, filename, df)
+        with perf.span("app.dataset_add", file=filename):
+            dataset.add(partition)
+
+    with perf.span("app.concat"):
+        df, df_p, df_t = dataset.frames()
+
+    with perf.span("app.aggregate"):
+        dataset.totals('Player')
+        dataset.totals('Team')
+        df_p.groupby(['Player', 'Category'])['Hits'].sum()
+        df.groupby('Player')[['Hits', 'Score']].sum()
+        df_t.groupby(['Team', 'File'], observed=True)['Hits'].sum()
+
+    if len(clean_paths) > 1:
+        # Toggling one checklist off and on again in the loaded selection
+        last = clean_paths[-1]
+        partition = dataset.partitions[last]
+        with perf.span("app.toggle_file"):
+            dataset.remove(last)
+            dataset.add(partition)
+            dataset.frames()
+    return len(df)
+
+
+def bench_readers(perf, paths, prefix, store=None):
+    # pandas/openpyxl vs the streaming reader on the same Teams_clean sheets,
+    # and the memory-mapped Arrow copy (already normalised) when a store is given
+    for path in paths:
+        filename = os.path.basename(path)
+        with perf.span(f"{prefix}.openpyxl", file=filename):
+            pd.read_excel(path, sheet_name="Teams_clean", engine="openpyxl")
+        with perf.span(f"{prefix}.xlsx_reader", file=filename):
+            read_sheet(path, "Teams_clean")
+        if store is not None and store.publish_workbook(path):
+            with perf.span(f"{prefix}.arrow", file=filename):
+                store.read(path)
+
+
+def largest_checklists(folder, count):
+    paths = [os.path.join(folder, f) for f in os.listdir(folder) if f.endswith(".xlsx") and not f.startswith("~$")]
+    # Files not cleaned yet have no Teams_clean sheet to compare
+    paths = [p for p in paths if "Teams_clean" in list_sheets(p)]
+    return sorted(paths, key=os.path.getsize, reverse=True)[:count]
+
+
+def summarise(perf):
+    stages = {}
+    for span in perf.spans:
+        stage = stages.setdefault(span["name"], {"seconds": 0.0, "calls": 0})
+        stage["seconds"] += span["ms"] / 1000
+        stage["calls"] += 1
+    for stage in stages.values():
+        stage["seconds"] = round(stage["seconds"], 4)
+    return stages
+
+
+def load_results(path):
+    try:
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {"runs": []}
+
+
+def previous_run(results, params):
+    for run in reversed(results["runs"]):
+        if run["params"] == params:
+            return run
+    return None
+
+
+def print_report(run, baseline):
+    print(f"{'stage':<28}{'seconds':>10}{'calls':>7}{'vs prev':>10}")
+    for name, stage in sorted(run["stages"].items()):
+        delta = ""
+        if baseline and name in baseline["stages"] and baseline["stages"][name]["seconds"]:
+            ratio = stage["seconds"] / baseline["stages"][name]["seconds"]
+            delta = f"x{ratio:.2f}"
+        print(f"{name:<28}{stage['seconds']:>10.3f}{stage['calls']:>7}{delta:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du pipeline checklists sur données synthétiques")
+    parser.add_argument("--products", type=int, default=3)
+    parser.add_argument("--rows", type=int, default=5000, help="lignes par produit")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--workdir", default=None, help="garde les fichiers générés dans ce dossier")
+    parser.add_argument("--checklists", default=None, help="dossier de checklists nettoyées pour comparer les lecteurs xlsx")
+    parser.add_argument("--largest", type=int, default=5, help="nombre de fichiers de --checklists comparés")
+    args = parser.parse_args()
+
+    params = {"products": args.products, "rows": args.rows, "seed": args.seed}
+    workdir = args.workdir or tempfile.mkdtemp(prefix="nba_break_bench_")
+    raw_dir = os.path.join(workdir, "raw")
+    clean_dir = os.path.join(workdir, "clean")
+    os.makedirs(clean_dir, exist_ok=True)
+
+    perf = Instrumentation()
+    try:
+        with perf.span("generate"):
+            raw_paths = generate_catalogue(raw_dir, args.products, args.rows, args.seed)
+        clean_paths = bench_cleaner(perf, raw_paths, clean_dir)
+        total_rows = bench_app(perf, clean_paths)
+        bench_readers(perf, clean_paths, "read.synthetic", ArrowStore(clean_dir) if arrow_available() else None)
+        if args.checklists:
+            bench_readers(perf, largest_checklists(args.checklists, args.largest), "read.checklists")
+    finally:
+        if args.workdir is None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    run = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "params": params,
+        "rows_loaded": total_rows,
+        "stages": summarise(perf),
+    }
+    results = load_results(args.output)
+    print_report(run, previous_run(results, params))
+    results["runs"].append(run)
+    with open(args.output, "w", encoding="utf-8") as fh:
+        json.dump(results, fh, indent=1)
+    print(f"Résultats ajoutés à {args.output}")
+
+
+if __name__ == "__main__":
+    main()
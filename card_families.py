@@ -0,0 +1,112 @@
+import re
+
+import pandas as pd
+
+# Card families: the same card listed once per parallel ("Prizm Silver",
+# "Prizm Gold /10", "... International") collapses to one family keyed by
+# (player, team, base set, product, file): families never span two checklists,
+# even two seasons of one product. The base set is the Box Type without its
+# checklist prefix and its trailing parallel tokens.
+
+# Trailing tokens that only name a parallel of a set
+PARALLEL_COLOURS = [
+    "Gold", "Silver", "Bronze", "Platinum", "Red", "Blue", "Green", "Orange", "Purple", "Pink",
+    "Black and White", "Black", "White", "Teal", "Aqua", "Yellow", "Ruby", "Emerald", "Sapphire", "Jade", "Ice",
+]
+PARALLEL_FINISHES = [
+    "Holo", "Prizm", "Prizms", "Shimmer", "Wave", "Cracked Ice", "Mojo", "Scope", "Hyper", "Laser",
+    "Pulsar", "Disco", "Camo", "Tie-Dye", "Snakeskin", "Snake Skin", "Velocity", "Fast Break", "Choice", "Refractor",
+]
+PARALLEL_MARKERS = [
+    "International", "Jersey Number", "FOTL", "First Off The Line", "Super Prime", "Prime",
+    "Horizontal", "Vertical", "Variations", "Variation", "One of One", "1/1", r"/\s*\d+",
+]
+
+# Brand and product words between the year and the set name of inserts from
+# other products listed without " - " ("2023 Hoops Calligraphy Signatures")
+PRODUCT_WORDS = [
+    "Panini", "Playoff", "Donruss", "Topps", "Elite", "Contenders", "Optic", "NBA", "Hoops", "Origins",
+    "Revolution", "Prizm", "Basketball",
+]
+
+
+def build_prefix_rule():
+    # "Update - " / "Update: ", then "2023-24 Immaculate Collection Basketball - ",
+    # "2023-24 Panini Contenders " or "2023 Hoops " (a bare year alone is kept:
+    # "1986 Tribute Autographs")
+    products = r"(?:(?:%s)\s+)" % "|".join(re.escape(w) for w in PRODUCT_WORDS)
+    return re.compile(
+        r"^[\s\-–]*(?:update\s*[-–:]\s*)?"
+        r"(?:\d{4}(?:-\d{2})?\s+[^-]*?\bbasketball\s*[-–]\s*"
+        r"|\d{4}-\d{2}\s+%s*"
+        r"|\d{4}\s+%s+)?" % (products, products),
+        re.IGNORECASE,
+    )
+
+
+_SET_PREFIX = build_prefix_rule()
+
+
+def build_parallel_rule():
+    tokens = [re.escape(t) for t in PARALLEL_COLOURS + PARALLEL_FINISHES] + [
+        t if t.startswith("/") else re.escape(t) for t in PARALLEL_MARKERS
+    ]
+    # Longest first so "Super Prime" wins over "Prime"
+    tokens.sort(key=len, reverse=True)
+    return re.compile(r"(?:[\s\-–]+(?:%s))+\s*$" % "|".join(tokens), re.IGNORECASE)
+
+
+_PARALLEL_SUFFIX = build_parallel_rule()
+
+FAMILY_KEY = ['Player', 'Team', 'Base Set', 'Product', 'File']
+
+
+def base_set(box_type):
+    # "Rookie Roll Call Gold" -> "Rookie Roll Call", "Prizm Silver /99" -> "Prizm"
+    if box_type is None or (isinstance(box_type, float) and box_type != box_type):
+        return ""
+    name = _SET_PREFIX.sub("", str(box_type).strip()).strip()
+    stripped = _PARALLEL_SUFFIX.sub("", " " + name).strip(" -–")
+    if not stripped:
+        # Only parallel words ("Prizm Silver /99"): the first one names the set
+        first, _, rest = name.partition(" ")
+        stripped = first + _PARALLEL_SUFFIX.sub("", " " + rest).rstrip(" -–") if rest else first
+    return stripped
+
+
+def base_sets(box_types):
+    # Derived once per distinct Box Type
+    return box_types.map({value: base_set(value) for value in box_types.unique()})
+
+
+def family_keys(frame):
+    # One 64-bit hash per row of the family key columns, no pairwise comparison
+    return pd.util.hash_pandas_object(frame[FAMILY_KEY].astype(str), index=False)
+
+
+def card_families(frame, categories):
+    # frame: scored rows with a 'Base Set' column (Partition frame or an
+    # exploded player/team view). categories: best first, as ScoringModel.categories.
+    columns = FAMILY_KEY + ['Category', 'Parallèles', 'Hits', 'Min Serial', 'Score']
+    if frame.empty:
+        return pd.DataFrame(columns=columns)
+    rows = pd.DataFrame({
+        'Key': family_keys(frame).to_numpy(),
+        'Category': pd.Categorical(frame['Category'], categories=categories, ordered=True),
+        'Box Type': frame['Box Type'].astype(str).to_numpy(),
+        'Hits': frame['Hits'].to_numpy(),
+        'Serial': frame['Serial'].where(frame['Serial'] > 0).to_numpy(),
+        'Score': frame['Score'].to_numpy(),
+    })
+    families = rows.groupby('Key', sort=False).agg(**{
+        'Category': ('Category', 'min'),
+        'Parallèles': ('Box Type', 'nunique'),
+        'Hits': ('Hits', 'sum'),
+        'Min Serial': ('Serial', 'min'),
+        'Score': ('Score', 'sum'),
+    })
+    # Key columns taken from the first row of each family
+    first = frame[FAMILY_KEY].groupby(rows['Key'].to_numpy(), sort=False).first()
+    families = first.join(families)
+    families['Category'] = families['Category'].astype(object)
+    return families[columns].reset_index(drop=True)
@@ -0,0 +1,113 @@
+import glob
+import json
+import os
+from datetime import datetime
+
+from dataset import explode_column, extract_product, extract_year, normalize_checklist, read_teams_clean
+from scoring import CATEGORIES, default_model
+
+# Persistent per-workbook metadata kept next to the checklists, so the sidebar
+# can show years/products/hit mix without opening any workbook.
+INDEX_FILENAME = "catalogue_index.json"
+# Bump when the way entries are computed changes, to force a rebuild.
+INDEX_VERSION = 2
+
+
+def index_path(folder):
+    return os.path.join(folder, INDEX_FILENAME)
+
+
+def file_signature(path):
+    stat = os.stat(path)
+    return stat.st_mtime, stat.st_size
+
+
+def describe_workbook(path):
+    filename = os.path.basename(path)
+    mtime, size = file_signature(path)
+    entry = {
+        "mtime": mtime,
+        "size": size,
+        "year": extract_year(filename),
+        "product": extract_product(filename),
+        "cleaned_at": datetime.fromtimestamp(mtime).isoformat(timespec="seconds"),
+        "rows": 0,
+        "categories": {c: 0 for c in CATEGORIES},
+        "players": 0,
+        "teams": 0,
+        "error": None,
+    }
+    try:
+        df, notes = normalize_checklist(read_teams_clean(path), filename)
+    except ValueError:
+        entry["error"] = "Onglet 'Teams_clean' introuvable."
+        return entry
+    except Exception as e:
+        entry["error"] = str(e)
+        return entry
+    if df is None:
+        entry["error"] = "; ".join(notes)
+        return entry
+
+    # Each distinct Box Type categorised once, rules loaded once
+    counts = default_model().categorize(df['Box Type']).value_counts()
+    entry["rows"] = int(df['Hits'].sum())
+    entry["categories"] = {c: int(counts.get(c, 0)) for c in CATEGORIES}
+    entry["players"] = int(explode_column(df[['Player']], 'Player')['Player'].nunique())
+    entry["teams"] = int(explode_column(df[['Team']], 'Team')['Team'].nunique())
+    return entry
+
+
+def load_index(folder):
+    try:
+        with open(index_path(folder), encoding="utf-8") as fh:
+            index = json.load(fh)
+    except (OSError, ValueError):
+        return {}
+    # Category counts depend on the keyword lists of scoring_rules.json
+    if index.get("version") != INDEX_VERSION or index.get("categories") != default_model().category_version:
+        return {}
+    return index.get("files", {})
+
+
+def save_index(folder, entries):
+    path = index_path(folder)
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump({"version": INDEX_VERSION, "categories": default_model().category_version, "files": entries}, fh, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, path)
+    except OSError:
+        # Read-only folder: the index simply stays in memory for this run.
+        pass
+
+
+def update_index(folder):
+    # Only workbooks whose mtime/size changed since the last run are re-read.
+    entries = load_index(folder)
+    paths = sorted(glob.glob(os.path.join(folder, "*.xlsx")))
+    current = {}
+    changed = False
+    for path in paths:
+        filename = os.path.basename(path)
+        if filename.startswith("~$"):
+            continue
+        mtime, size = file_signature(path)
+        entry = entries.get(filename)
+        if entry is None or entry.get("mtime") != mtime or entry.get("size") != size:
+            entry = describe_workbook(path)
+            changed = True
+        current[filename] = entry
+
+    if changed or set(current) != set(entries):
+        save_index(folder, current)
+    return current
+
+
+def folder_signature(folder):
+    # Cheap key (stat only) used by the app to decide when to refresh the index.
+    signature = []
+    for path in sorted(glob.glob(os.path.join(folder, "*.xlsx"))):
+        mtime, size = file_signature(path)
+        signature.append((os.path.basename(path), mtime, size))
+    return tuple(signature)
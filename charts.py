@@ -0,0 +1,69 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+# Plotly figures cached by the data slice that produced them: reruns (and other
+# sessions) that ask for the same chart reuse the built figure instead of going
+# through plotly express again.
+
+MAX_FIGURES = 256
+
+_lock = threading.Lock()
+_figures = OrderedDict()
+_images = OrderedDict()
+
+
+def figure_key(builder, data, **kwargs):
+    digest = hashlib.sha1()
+    digest.update(getattr(builder, "__name__", str(builder)).encode())
+    digest.update(repr(list(data.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(data, index=False).values.tobytes())
+    digest.update(repr(sorted(kwargs.items())).encode())
+    return digest.hexdigest()
+
+
+def _remember(store, key, value):
+    with _lock:
+        store[key] = value
+        store.move_to_end(key)
+        while len(store) > MAX_FIGURES:
+            store.popitem(last=False)
+
+
+def _lookup(store, key):
+    with _lock:
+        value = store.get(key)
+        if value is not None:
+            store.move_to_end(key)
+        return value
+
+
+def cached_figure(builder, data, **kwargs):
+    # builder is a plotly express function (px.bar, px.pie, ...).
+    # Returns (key, fig); the key also identifies the figure's static image.
+    key = figure_key(builder, data, **kwargs)
+    fig = _lookup(_figures, key)
+    if fig is None:
+        fig = builder(data, **kwargs)
+        _remember(_figures, key, fig)
+    return key, fig
+
+
+def figure_image(key, fig, fmt="webp", width=900, height=500):
+    # Static rendering needs the optional kaleido package; None when unavailable.
+    image_key = f"{key}:{fmt}:{width}x{height}"
+    image = _lookup(_images, image_key)
+    if image is None:
+        try:
+            image = fig.to_image(format=fmt, width=width, height=height)
+        except (ImportError, ValueError, RuntimeError):
+            return None
+        _remember(_images, image_key, image)
+    return image
+
+
+def payload_size(fig):
+    # Size of the JSON spec Streamlit ships to the browser for this figure
+    return len(fig.to_json(validate=False))
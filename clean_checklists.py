@@ -5,71 +5,11 @@ import shutil
 import pandas as pd
 from openpyxl import load_workbook
 
+from arrow_store import ArrowStore
+from layouts import SAMPLE_ROWS, LayoutCache, build_layout, fingerprint, layout_fits, product_family
+from teams import TEAM_MAP, resolve_team, resolve_teams, team_lookup_key
+from xlsx_reader import read_sheet, rows_frame
 
-TEAM_MAP = {
-    "atlanta": "Atlanta Hawks",
-    "atlanta hawks": "Atlanta Hawks",
-    "boston": "Boston Celtics",
-    "boston celtics": "Boston Celtics",
-    "brooklyn": "Brooklyn Nets",
-    "brooklyn nets": "Brooklyn Nets",
-    "charlotte": "Charlotte Hornets",
-    "charlotte hornets": "Charlotte Hornets",
-    "chicago": "Chicago Bulls",
-    "chicago bulls": "Chicago Bulls",
-    "cleveland": "Cleveland Cavaliers",
-    "cleveland cavaliers": "Cleveland Cavaliers",
-    "dallas": "Dallas Mavericks",
-    "dallas mavericks": "Dallas Mavericks",
-    "denver": "Denver Nuggets",
-    "denver nuggets": "Denver Nuggets",
-    "detroit": "Detroit Pistons",
-    "detroit pistons": "Detroit Pistons",
-    "golden state": "Golden State Warriors",
-    "golden state warriors": "Golden State Warriors",
-    "houston": "Houston Rockets",
-    "houston rockets": "Houston Rockets",
-    "indiana": "Indiana Pacers",
-    "indiana pacers": "Indiana Pacers",
-    "la clippers": "Los Angeles Clippers",
-    "clippers": "Los Angeles Clippers",
-    "los angeles clippers": "Los Angeles Clippers",
-    "la lakers": "Los Angeles Lakers",
-    "lakers": "Los Angeles Lakers",
-    "los angeles lakers": "Los Angeles Lakers",
-    "memphis": "Memphis Grizzlies",
-    "memphis grizzlies": "Memphis Grizzlies",
-    "miami": "Miami Heat",
-    "miami heat": "Miami Heat",
-    "milwaukee": "Milwaukee Bucks",
-    "milwaukee bucks": "Milwaukee Bucks",
-    "minnesota": "Minnesota Timberwolves",
-    "minnesota timberwolves": "Minnesota Timberwolves",
-    "new orleans": "New Orleans Pelicans",
-    "new orleans pelicans": "New Orleans Pelicans",
-    "new york": "New York Knicks",
-    "new york knicks": "New York Knicks",
-    "oklahoma city": "Oklahoma City Thunder",
-    "oklahoma city thunder": "Oklahoma City Thunder",
-    "orlando": "Orlando Magic",
-    "orlando magic": "Orlando Magic",
-    "philadelphia": "Philadelphia 76ers",
-    "philadelphia 76ers": "Philadelphia 76ers",
-    "phoenix": "Phoenix Suns",
-    "phoenix suns": "Phoenix Suns",
-    "portland": "Portland Trail Blazers",
-    "portland trail blazers": "Portland Trail Blazers",
-    "sacramento": "Sacramento Kings",
-    "sacramento kings": "Sacramento Kings",
-    "san antonio": "San Antonio Spurs",
-    "san antonio spurs": "San Antonio Spurs",
-    "toronto": "Toronto Raptors",
-    "toronto raptors": "Toronto Raptors",
-    "utah": "Utah Jazz",
-    "utah jazz": "Utah Jazz",
-    "washington": "Washington Wizards",
-    "washington wizards": "Washington Wizards",
-}
 
 BOX_KEYWORDS = [
     "base", "set", "auto", "autograph", "signature", "patch", "relic",
@@ -82,8 +22,7 @@ def normalize(value):
 
 
 def normalize_team(value):
-    key = normalize(value)
-    return TEAM_MAP.get(key, str(value).strip())
+    return resolve_team(value)
 
 
 def is_header_row(row):
@@ -98,7 +37,7 @@ def infer_columns(df_raw):
         col_values = df_raw[col].dropna().tolist()
         if not col_values:
             continue
-        matches = sum(1 for v in col_values if normalize(v) in TEAM_MAP)
+        matches = sum(1 for v in col_values if team_lookup_key(v) in TEAM_MAP)
         ratio = matches / max(len(col_values), 1)
         if ratio > best_ratio:
             best_ratio = ratio
@@ -159,43 +98,72 @@ def extract_numbering(row):
     return ""
 
 
-def process_file(src_path, dst_path):
-    df_raw = pd.read_excel(src_path, sheet_name="Teams", header=None, engine="openpyxl")
+def process_file(src_path, dst_path, layouts=None, store=None):
+    # layouts: optional LayoutCache; a known layout for this product family
+    # skips column inference.
+    # store: optional ArrowStore the cleaned sheet is also published to.
+    df_raw = read_sheet(src_path, "Teams", header=None)
+    sample = df_raw.iloc[:SAMPLE_ROWS]
     df_raw = df_raw.dropna(axis=1, how="all")
 
     if df_raw.empty:
         return 0
 
-    if is_header_row(df_raw.iloc[0].tolist()):
+    has_header = is_header_row(df_raw.iloc[0].tolist())
+    if has_header:
         df_raw = df_raw.iloc[1:].reset_index(drop=True)
 
-    player_col, team_col, box_col = infer_columns(df_raw)
+    layout = None
+    if layouts is not None:
+        family = product_family(src_path)
+        fp = fingerprint(sample, has_header)
+        layout = layouts.lookup(family, fp)
+        if layout is not None and not layout_fits(layout, df_raw, has_header):
+            layout = None
+
+    if layout is not None:
+        player_col, team_col, box_col = layout["player_col"], layout["team_col"], layout["box_col"]
+    else:
+        player_col, team_col, box_col = infer_columns(df_raw)
+        if layouts is not None:
+            layouts.remember(family, fp, build_layout(player_col, team_col, box_col, has_header))
+
+    # Resolved once per distinct team value
+    teams = resolve_teams(df_raw[team_col])
+
+    # Plain tuples: iterrows builds a Series per row, slow on mixed dtypes
+    columns = list(df_raw.columns)
+    player_pos, team_pos, box_pos = columns.index(player_col), columns.index(team_col), columns.index(box_col)
 
     cleaned_rows = []
-    for _, row in df_raw.iterrows():
-        player = row.get(player_col)
-        team = row.get(team_col)
-        card_type = row.get(box_col)
+    for row, team_str in zip(df_raw.itertuples(index=False, name=None), teams.tolist()):
+        player = row[player_pos]
+        team = row[team_pos]
+        card_type = row[box_pos]
 
         if pd.isna(player) or pd.isna(team):
             continue
 
         player_str = str(player).strip().rstrip(",")
-        team_str = normalize_team(team)
         card_str = "" if pd.isna(card_type) else str(card_type).strip()
-        numbering = extract_numbering(row.tolist())
+        numbering = extract_numbering(list(row))
 
         cleaned_rows.append([player_str, team_str, card_str, numbering])
 
+    header = ["Player", "Team", "Card Type", "Numbering"]
     wb = load_workbook(dst_path)
     if "Teams_clean" in wb.sheetnames:
         del wb["Teams_clean"]
     ws = wb.create_sheet("Teams_clean")
-    ws.append(["Player", "Team", "Card Type", "Numbering"])
+    ws.append(header)
     for r in cleaned_rows:
         ws.append(r)
     wb.save(dst_path)
 
+    if store is not None:
+        # Typed as the app would read the sheet back, without re-reading it
+        store.publish(os.path.basename(dst_path), rows_frame([header] + cleaned_rows), dst_path)
+
     return len(cleaned_rows)
 
 
@@ -204,6 +172,9 @@ def main():
     dst_dir = "/Users/fyrex/antiGravityCode/checklists_clean"
 
     os.makedirs(dst_dir, exist_ok=True)
+    layouts = LayoutCache(dst_dir)
+    # Arrow copy for the app; publishing is a no-op without pyarrow
+    store = ArrowStore(dst_dir)
 
     files = [f for f in os.listdir(src_dir) if f.endswith(".xlsx")]
     total_rows = 0
@@ -212,11 +183,12 @@ def main():
         src_path = os.path.join(src_dir, fname)
         dst_path = os.path.join(dst_dir, fname)
         shutil.copy2(src_path, dst_path)
-        rows = process_file(src_path, dst_path)
+        rows = process_file(src_path, dst_path, layouts, store)
         total_rows += rows
         print(f"{fname}: {rows} lignes")
 
-    print(f"Fichiers traites: {len(files)}")
+    layouts.save()
+    print(f"Fichiers traites: {len(files)} (layouts en cache: {layouts.hits}, inférés: {layouts.misses})")
     print(f"Total lignes: {total_rows}")
 
 
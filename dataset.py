@@ -0,0 +1,368 @@
+import copy
+import os
+import re
+import threading
+from contextlib import nullcontext
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from card_families import base_sets, card_families
+from multi_players import CoOccurrence, build_combinations, build_pairs, merge_tables
+from rookies import RookieIndex, player_seasons
+from teams import resolve_teams
+from scoring import default_model, serial_numbers
+from xlsx_reader import read_sheet, sheet_header
+
+
+def extract_year(filename):
+    match = re.search(r"(\d{4}-\d{2})", filename)
+    return match.group(1) if match else "Inconnue"
+
+
+def extract_product(filename):
+    name = os.path.splitext(filename)[0]
+    name = re.sub(r"\d{4}-\d{2}", "", name)
+    name = re.sub(r"checklist", "", name, flags=re.IGNORECASE)
+    name = re.sub(r"\s+", " ", name)
+    return name.strip(" -_")
+
+
+# Teams_clean headers (lower case) that normalize_checklist reads
+USED_HEADERS = {"player", "team", "box type", "card type", "boxtype", "numbering"}
+# Per-file constants, stored as categoricals instead of repeated strings
+PARTITION_COLUMNS = ['File', 'Year', 'Product']
+
+
+def read_teams_clean(source):
+    # Streams only the Teams_clean sheet (see xlsx_reader) and, when the
+    # header has Player and Team, only the columns used downstream.
+    header = [str(name).strip().lower() for name in sheet_header(source, "Teams_clean")]
+    usecols = [i for i, name in enumerate(header) if name in USED_HEADERS]
+    if "player" not in header or "team" not in header:
+        # Read everything so the "Colonnes trouvées" note lists the real columns
+        usecols = None
+    return read_sheet(source, "Teams_clean", usecols=usecols)
+
+
+def constant_column(value, length):
+    # One category, int8 codes: 1 byte per row instead of a string reference
+    return pd.Categorical.from_codes(np.zeros(length, dtype=np.int8), [value])
+
+
+def concat_partitions(frames, **kwargs):
+    # Per-file constants keep their categorical dtype: concatenating categoricals
+    # with different categories would fall back to object strings.
+    columns = list(dict.fromkeys(c for f in frames for c in f.columns))
+    constant = [c for c in PARTITION_COLUMNS if all(c in f.columns for f in frames)]
+    others = [c for c in columns if c not in constant]
+    result = pd.concat([f[[c for c in others if c in f.columns]] for f in frames], **kwargs)
+    for column in constant:
+        result[column] = union_categoricals([f[column] for f in frames])
+    return result[columns]
+
+
+def normalize_checklist(df, filename):
+    # Returns (df, notes). df is None when the sheet can't be used; notes are
+    # the messages reported in the "fichier(s) ignoré(s)" list.
+    notes = []
+
+    # Normalize column names to avoid missing-key errors from stray whitespace/casing.
+    df.columns = [str(c).strip() for c in df.columns]
+    lower_map = {c.lower(): c for c in df.columns}
+    if "box type" in lower_map:
+        df = df.rename(columns={lower_map["box type"]: "Box Type"})
+    elif "card type" in lower_map:
+        df = df.rename(columns={lower_map["card type"]: "Box Type"})
+    elif "boxtype" in lower_map:
+        df = df.rename(columns={lower_map["boxtype"]: "Box Type"})
+
+    if "player" in lower_map and "Player" not in df.columns:
+        df = df.rename(columns={lower_map["player"]: "Player"})
+    if "team" in lower_map and "Team" not in df.columns:
+        df = df.rename(columns={lower_map["team"]: "Team"})
+
+    missing_cols = [c for c in ["Player", "Team"] if c not in df.columns]
+    if missing_cols:
+        notes.append(f"Colonnes manquantes: {', '.join(missing_cols)}. Colonnes trouvées: {list(df.columns)}")
+        return None, notes
+    if "Box Type" not in df.columns:
+        df["Box Type"] = ""
+        notes.append("Colonne 'Box Type' absente: ajoutée vide pour éviter l'erreur.")
+
+    # Clean data
+    df = df.dropna(subset=['Player', 'Team'])
+
+    # Remove trailing commas from names (common in new checklists)
+    df['Player'] = (
+        df['Player']
+        .astype(str)
+        .str.replace(r',$', '', regex=True)
+        .str.strip()
+    )
+    df['Team'] = resolve_teams(df['Team']).astype(str)
+
+    # Add metadata
+    df['Hits'] = 1
+    df['File'] = constant_column(filename, len(df))  # Track source file
+    df['Year'] = constant_column(extract_year(filename), len(df))
+    df['Product'] = constant_column(extract_product(filename), len(df))
+    if 'Numbering' not in df.columns:
+        df['Numbering'] = ""
+
+    # Fix older formats where "Box Type" ended up in Numbering
+    box_empty = df['Box Type'].astype(str).str.strip().eq("") | df['Box Type'].isna()
+    numbering_str = df['Numbering'].astype(str).str.strip()
+    non_numeric = ~numbering_str.str.fullmatch(r"\d+(\.\d+)?")
+    if box_empty.mean() > 0.8 and non_numeric.mean() > 0.5:
+        df.loc[box_empty, 'Box Type'] = df.loc[box_empty, 'Numbering']
+        df.loc[non_numeric, 'Numbering'] = ""
+
+    return df, notes
+
+
+def explode_column(df, column):
+    # Split multi-value cells (separator '/') into one row per value
+    exploded = df.copy()
+    exploded[column] = exploded[column].astype(str).str.split('/')
+    exploded = exploded.explode(column)
+    exploded[column] = exploded[column].str.strip()
+    return exploded
+
+
+TOTAL_COLUMNS = ['Hits', 'Score']
+
+
+class Partition:
+    # One loaded checklist: its scored rows, the '/'-exploded player and team
+    # views (indexed by local row number) and their group-by totals.
+    def __init__(self, key, filename, df, notes=None, perf=None, model=None):
+        span = perf.span if perf is not None else (lambda name, **fields: nullcontext())
+        model = model or default_model()
+        df = df.reset_index(drop=True)
+        with span("categorise", file=filename):
+            df['Serial'] = serial_numbers(df['Numbering'])
+            df['Category'] = model.categorize(df['Box Type'])
+            df['Rarity Mult'], df['Score'] = model.score(df['Category'], df['Serial'])
+        with span("families", file=filename):
+            df['Base Set'] = base_sets(df['Box Type'])
+            self.families = card_families(df, model.categories)
+        self.model_version = model.version
+        self.category_version = model.category_version
+        self.key = key
+        self.filename = filename
+        self.notes = notes or []
+        self.frame = df
+        with span("explode", file=filename):
+            self.players = explode_column(df, 'Player')
+            self.teams = explode_column(df, 'Team')
+        with span("groupby", file=filename):
+            self.player_totals = self.players.groupby('Player')[TOTAL_COLUMNS].sum()
+            self.team_totals = self.teams.groupby('Team')[TOTAL_COLUMNS].sum()
+        with span("co_occurrence", file=filename):
+            self.pairs = build_pairs(self.players)
+            self.combinations = build_combinations(self.players)
+        with span("rookies", file=filename):
+            self.seasons = player_seasons(self.players)
+
+    def rescored(self, model):
+        # Copy scored with another model: Score (and Category only if the
+        # keywords differ) is recomputed from the cached columns, nothing is re-read.
+        clone = copy.copy(self)
+        frame = self.frame.copy()
+        if model.category_version != self.category_version:
+            frame['Category'] = model.categorize(frame['Box Type'])
+        frame['Rarity Mult'], frame['Score'] = model.score(frame['Category'], frame['Serial'])
+        clone.frame = frame
+        # Exploded views are indexed by local row number, i.e. positions in frame
+        for name in ('players', 'teams'):
+            view = getattr(self, name).copy()
+            rows = view.index.to_numpy()
+            view['Category'] = frame['Category'].to_numpy()[rows]
+            view['Rarity Mult'] = frame['Rarity Mult'].to_numpy()[rows]
+            view['Score'] = frame['Score'].to_numpy()[rows]
+            setattr(clone, name, view)
+        clone.player_totals = clone.players.groupby('Player')[TOTAL_COLUMNS].sum()
+        clone.team_totals = clone.teams.groupby('Team')[TOTAL_COLUMNS].sum()
+        clone.seasons = player_seasons(clone.players)
+        clone.families = card_families(frame, model.categories)
+        clone.model_version = model.version
+        clone.category_version = model.category_version
+        return clone
+
+    @property
+    def product(self):
+        return self.frame['Product'].iat[0] if len(self.frame) else extract_product(self.filename)
+
+
+def apply_delta(totals, delta, sign):
+    if totals is None:
+        return delta.copy() if sign > 0 else None
+    merged = pd.concat([totals, delta * sign]).groupby(level=0).sum()
+    return merged[merged['Hits'] != 0]
+
+
+def sum_totals(tables):
+    if not tables:
+        return None
+    return pd.concat(tables).groupby(level=0).sum()
+
+
+class ChecklistDataset:
+    # Collection of per-file partitions. Totals are maintained by delta when a
+    # partition is added or removed; concatenated frames are rebuilt lazily.
+    def __init__(self):
+        self.partitions = {}
+        # key -> (filename, message, is_warning) for selected files that failed to load
+        self.failures = {}
+        self.player_totals = None
+        self.team_totals = None
+        self._frames = None
+        self._memo = {}
+        # Shared datasets are read by several sessions: lazy frames and memo
+        # entries are built once, frames under this lock (reentrant: builds
+        # nest), each memo entry under its own lock so distinct ones build
+        # in parallel
+        self._lock = threading.RLock()
+        self._memo_locks = {}
+
+    def copy(self):
+        # Shares the (immutable) partitions and totals; frames and memo are rebuilt
+        clone = ChecklistDataset()
+        clone.partitions = dict(self.partitions)
+        clone.failures = dict(self.failures)
+        clone.player_totals = self.player_totals
+        clone.team_totals = self.team_totals
+        return clone
+
+    def rescore(self, model):
+        # Swaps in copies of the partitions scored with another model (keeping
+        # their order) and returns them; totals are re-summed once.
+        rescored = []
+        for key, partition in self.partitions.items():
+            if partition.model_version != model.version:
+                rescored.append(partition.rescored(model))
+                self.partitions[key] = rescored[-1]
+        if rescored:
+            self.player_totals = sum_totals([p.player_totals for p in self.partitions.values()])
+            self.team_totals = sum_totals([p.team_totals for p in self.partitions.values()])
+            self._frames = None
+            self._memo = {}
+        return rescored
+
+    def __contains__(self, key):
+        return key in self.partitions
+
+    def __len__(self):
+        return len(self.partitions)
+
+    def keys(self):
+        return list(self.partitions)
+
+    def add(self, partition):
+        if partition.key in self.partitions:
+            self.remove(partition.key)
+        self.partitions[partition.key] = partition
+        self.player_totals = apply_delta(self.player_totals, partition.player_totals, 1)
+        self.team_totals = apply_delta(self.team_totals, partition.team_totals, 1)
+        self._frames = None
+        self._memo = {}
+
+    def remove(self, key):
+        partition = self.partitions.pop(key, None)
+        if partition is None:
+            return
+        if self.partitions:
+            self.player_totals = apply_delta(self.player_totals, partition.player_totals, -1)
+            self.team_totals = apply_delta(self.team_totals, partition.team_totals, -1)
+        else:
+            self.player_totals = None
+            self.team_totals = None
+        self._frames = None
+        self._memo = {}
+
+    def sync(self, keys):
+        # Drops partitions no longer wanted and returns the keys still to load.
+        wanted = set(keys)
+        for key in [k for k in self.partitions if k not in wanted]:
+            self.remove(key)
+        for key in [k for k in self.failures if k not in wanted]:
+            del self.failures[key]
+        return [k for k in keys if k not in self.partitions and k not in self.failures]
+
+    def frames(self):
+        # (df, df_p, df_t) with df_p/df_t indexed by the df row they came from.
+        with self._lock:
+            if self._frames is None:
+                self._frames = self._build_frames()
+            return self._frames if self._frames is not None else (None, None, None)
+
+    def _build_frames(self):
+        frames, players, teams = [], [], []
+        offset = 0
+        for partition in self.partitions.values():
+            frames.append(partition.frame)
+            players.append(partition.players.set_axis(partition.players.index + offset))
+            teams.append(partition.teams.set_axis(partition.teams.index + offset))
+            offset += len(partition.frame)
+        if not frames:
+            return None
+        return (
+            concat_partitions(frames, ignore_index=True),
+            concat_partitions(players),
+            concat_partitions(teams),
+        )
+
+    def totals(self, kind, products=None):
+        # Player/Team totals (Hits, Score), optionally restricted to some products.
+        if products is None:
+            totals = self.player_totals if kind == 'Player' else self.team_totals
+        else:
+            attr = 'player_totals' if kind == 'Player' else 'team_totals'
+            parts = [getattr(p, attr) for p in self.partitions.values() if p.product in products]
+            totals = pd.concat(parts).groupby(level=0).sum() if parts else None
+        if totals is None:
+            return pd.DataFrame(columns=[kind] + TOTAL_COLUMNS)
+        return totals.rename_axis(kind).reset_index()
+
+    def memo(self, name, products, build):
+        # Per-view aggregates computed once per dataset state and product filter
+        cache_key = (name, frozenset(products) if products is not None else None)
+        with self._lock:
+            if cache_key in self._memo:
+                return self._memo[cache_key]
+            key_lock = self._memo_locks.setdefault(cache_key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                if cache_key in self._memo:
+                    return self._memo[cache_key]
+            value = build()
+            with self._lock:
+                self._memo[cache_key] = value
+            return value
+
+    def families(self, products=None):
+        # Card families of every partition (one product and season each)
+        def build():
+            parts = [p.families for p in self.partitions.values() if products is None or p.product in products]
+            return pd.concat(parts, ignore_index=True) if parts else None
+        return self.memo('families', products, build)
+
+    def rookie_index(self, top_rookies_by_year, products=None):
+        # Concat of the per-partition season rows; top_rookies_by_year only
+        # changes with scoring_rules.json, whose edits also reset partitions.
+        def build():
+            parts = [p.seasons for p in self.partitions.values() if products is None or p.product in products]
+            return RookieIndex(pd.concat(parts, ignore_index=True), top_rookies_by_year)
+        return self.memo('rookie_index', products, build)
+
+    def co_occurrence(self, products=None):
+        # Summed from the per-partition pair/combination tables
+        def build():
+            parts = [p for p in self.partitions.values() if products is None or p.product in products]
+            return CoOccurrence(
+                merge_tables([p.pairs for p in parts], ['Player A', 'Player B']),
+                merge_tables([p.combinations for p in parts], ['Combinaison', 'Joueurs']),
+            )
+        return self.memo('co_occurrence', products, build)
@@ -0,0 +1,157 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from instrumentation import frame_memory
+
+# Process-wide store of loaded data, shared by every Streamlit session:
+# one Partition per checklist file and one ChecklistDataset per distinct file
+# selection. Sessions only keep the id of the dataset they use. Datasets are
+# reference counted per session and evicted least-recently-used first when the
+# memory budget is exceeded.
+
+MEMORY_BUDGET_ENV = "NBA_BREAK_MEMORY_BUDGET_MB"
+DEFAULT_BUDGET_MB = 1024
+# A session that hasn't touched its dataset for this long no longer pins it
+SESSION_TTL = 30 * 60
+
+
+def dataset_id(keys):
+    digest = hashlib.sha1("\n".join(sorted(keys)).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def partition_nbytes(partition):
+    return frame_memory(partition.frame) + frame_memory(partition.players) + frame_memory(partition.teams)
+
+
+def dataset_nbytes(dataset):
+    # Only the concatenated frames belong to the dataset itself; partitions are counted once
+    frames = dataset._frames
+    if frames is None:
+        return 0
+    return sum(frame_memory(f) for f in frames)
+
+
+class DatasetStore:
+    def __init__(self, budget_bytes=None):
+        if budget_bytes is None:
+            budget_bytes = int(os.environ.get(MEMORY_BUDGET_ENV, DEFAULT_BUDGET_MB)) * 1024 * 1024
+        self.budget_bytes = budget_bytes
+        self._lock = threading.RLock()
+        self._partitions = OrderedDict()  # key -> (partition, nbytes)
+        self._datasets = OrderedDict()  # id -> dataset
+        self._dataset_bytes = {}  # id -> nbytes of its frames, measured lazily
+        self._refs = {}  # id -> {session_id: last_seen}
+        self.evictions = 0
+
+    # --- partitions ---
+
+    def partition(self, key):
+        with self._lock:
+            entry = self._partitions.get(key)
+            if entry is None:
+                return None
+            self._partitions.move_to_end(key)
+            return entry[0]
+
+    def put_partition(self, partition):
+        nbytes = partition_nbytes(partition)
+        with self._lock:
+            self._partitions[partition.key] = (partition, nbytes)
+            self._partitions.move_to_end(partition.key)
+
+    # --- datasets ---
+
+    def get(self, ds_id, session_id=None):
+        with self._lock:
+            dataset = self._datasets.get(ds_id)
+            if dataset is not None:
+                self._datasets.move_to_end(ds_id)
+                if session_id is not None:
+                    self._refs.setdefault(ds_id, {})[session_id] = time.time()
+            return dataset
+
+    def put(self, ds_id, dataset, session_id=None):
+        # Frames are built before other sessions can see the dataset
+        dataset.frames()
+        with self._lock:
+            self._datasets[ds_id] = dataset
+            self._datasets.move_to_end(ds_id)
+            self._dataset_bytes.pop(ds_id, None)
+            if session_id is not None:
+                self._refs.setdefault(ds_id, {})[session_id] = time.time()
+        self.enforce_budget()
+
+    def release(self, ds_id, session_id):
+        with self._lock:
+            refs = self._refs.get(ds_id)
+            if refs is not None:
+                refs.pop(session_id, None)
+
+    def refcount(self, ds_id):
+        now = time.time()
+        with self._lock:
+            refs = self._refs.get(ds_id, {})
+            return sum(1 for seen in refs.values() if now - seen < SESSION_TTL)
+
+    def clear(self):
+        with self._lock:
+            self._partitions.clear()
+            self._datasets.clear()
+            self._dataset_bytes.clear()
+            self._refs.clear()
+
+    # --- memory governance ---
+
+    def memory_usage(self):
+        with self._lock:
+            for ds_id, dataset in self._datasets.items():
+                if not self._dataset_bytes.get(ds_id):
+                    self._dataset_bytes[ds_id] = dataset_nbytes(dataset)
+            partitions = sum(nbytes for _, nbytes in self._partitions.values())
+            return partitions + sum(self._dataset_bytes.values())
+
+    def _drop_dataset(self, ds_id):
+        self._datasets.pop(ds_id, None)
+        self._dataset_bytes.pop(ds_id, None)
+        self._refs.pop(ds_id, None)
+        self.evictions += 1
+
+    def _drop_orphan_partitions(self):
+        used = set()
+        for dataset in self._datasets.values():
+            used.update(dataset.partitions)
+        for key in [k for k in self._partitions if k not in used]:
+            del self._partitions[key]
+
+    def enforce_budget(self):
+        with self._lock:
+            if self.memory_usage() <= self.budget_bytes:
+                return
+            # Unreferenced datasets go first, then referenced ones (their
+            # sessions rebuild from the remaining partitions on next access).
+            for pinned in (False, True):
+                for ds_id in list(self._datasets):
+                    if len(self._datasets) <= 1:
+                        break
+                    if (self.refcount(ds_id) > 0) != pinned:
+                        continue
+                    self._drop_dataset(ds_id)
+                    self._drop_orphan_partitions()
+                    if self.memory_usage() <= self.budget_bytes:
+                        return
+            self._drop_orphan_partitions()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "datasets": len(self._datasets),
+                "partitions": len(self._partitions),
+                "bytes": self.memory_usage(),
+                "budget_bytes": self.budget_bytes,
+                "evictions": self.evictions,
+                "refs": {ds_id: self.refcount(ds_id) for ds_id in self._datasets},
+            }
@@ -0,0 +1,161 @@
+import hashlib
+import importlib.util
+import json
+import math
+import os
+import tempfile
+import threading
+import zipfile
+
+import pandas as pd
+from openpyxl import Workbook
+
+# Pre-break export: every ranking table of the current selection in one file,
+# either a multi-sheet xlsx (openpyxl write_only, rows streamed) or a zip of
+# Parquet files. Files are built on demand and kept in a small on-disk cache
+# keyed by dataset + filters, so sessions never hold the bytes.
+
+EXPORT_DIR = os.path.join(tempfile.gettempdir(), "nba_break_exports")
+MAX_EXPORTS = 20
+FORMATS = {
+    "xlsx": ("Excel (.xlsx)", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "parquet": ("Parquet (.zip)", "application/zip"),
+}
+
+_lock = threading.Lock()
+
+
+def available_formats():
+    # Parquet needs the optional pyarrow package
+    if importlib.util.find_spec("pyarrow") is None:
+        return ["xlsx"]
+    return list(FORMATS)
+
+
+def export_key(dataset_id, products, options, fmt):
+    payload = json.dumps(
+        [dataset_id, sorted(products) if products is not None else None, options, fmt],
+        sort_keys=True, ensure_ascii=False, default=str,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def ranking(frame, column, categories):
+    # Hits/Score per player or team plus one hit count column per category
+    totals = frame.groupby(column)[['Hits', 'Score']].sum()
+    per_category = frame.pivot_table(index=column, columns='Category', values='Hits', aggfunc='sum', fill_value=0)
+    per_category = per_category.reindex(columns=categories, fill_value=0)
+    table = totals.join(per_category).sort_values('Score', ascending=False)
+    table['Score'] = table['Score'].round(2)
+    return table.reset_index()
+
+
+def comparison(df_p, players, categories):
+    # Comparateur rows: one per player, in the given order
+    rows = []
+    for player in players:
+        p_data = df_p[df_p['Player'] == player]
+        cat_counts = p_data['Category'].value_counts()
+        row = {"Joueur": player, "Total Cartes": int(p_data['Hits'].sum()), "Score": round(float(p_data['Score'].sum()), 2)}
+        row.update({category: int(cat_counts.get(category, 0)) for category in categories})
+        rows.append(row)
+    return pd.DataFrame(rows, columns=["Joueur", "Total Cartes", "Score"] + list(categories))
+
+
+def team_cost(df, cost_map, default_cost):
+    # Cost par pick: score per euro of each team's spots, best value first
+    cost = df[['Team', 'Hits', 'Score']].copy()
+    cost['Cost'] = cost['Team'].map(cost_map).fillna(default_cost or 0)
+    table = cost.groupby('Team', as_index=False)[['Hits', 'Score', 'Cost']].sum()
+    table['Value/€'] = table['Score'] / table['Cost'].replace(0, 1)
+    return table.sort_values('Value/€', ascending=False)
+
+
+def ranking_tables(df, df_p, df_t, categories, hype_multipliers=None, cost_map=None, default_cost=None):
+    # Ordered {sheet name: table}; sheet names stay within Excel's 31 characters
+    tables = {
+        "Joueurs": ranking(df_p, 'Player', categories),
+        "Equipes": ranking(df_t, 'Team', categories),
+    }
+    for category in categories:
+        label = category.split(" ", 1)[-1].replace("/", "-")
+        rows = df_p[df_p['Category'] == category]
+        tables[f"Joueurs - {label}"[:31]] = (
+            rows.groupby('Player', as_index=False)[['Hits', 'Score']].sum()
+            .sort_values('Hits', ascending=False).round({'Score': 2})
+        )
+    tables["Equipes x fichiers"] = (
+        df_t.groupby(['Team', 'File'], as_index=False, observed=True)[['Hits', 'Score']].sum()
+        .sort_values(['Team', 'Hits'], ascending=[True, False]).round({'Score': 2})
+    )
+    files = df.groupby(['File', 'Year', 'Product'], as_index=False, observed=True)[['Hits', 'Score']].sum()
+    file_categories = df.pivot_table(index='File', columns='Category', values='Hits', aggfunc='sum', fill_value=0, observed=True)
+    tables["Fichiers"] = files.join(file_categories.reindex(columns=categories, fill_value=0), on='File').round({'Score': 2})
+
+    if hype_multipliers is not None:
+        value = df.groupby('Player', as_index=False)[['Hits', 'Score']].sum()
+        value['Hype'] = hype_multipliers(value['Player'])
+        value['Value Index'] = (value['Score'] / value['Hype'].replace(0, 1)).round(2)
+        tables["Value Picks"] = value.sort_values('Value Index', ascending=False).round({'Score': 2})
+    if cost_map is not None:
+        tables["Cost par pick"] = team_cost(df, cost_map, default_cost).round({'Score': 2, 'Value/€': 3})
+    return tables
+
+
+def cell(value):
+    if value is None or value is pd.NA:
+        return None
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def write_xlsx(tables, path):
+    wb = Workbook(write_only=True)
+    for name, table in tables.items():
+        ws = wb.create_sheet(name)
+        ws.append([str(c) for c in table.columns])
+        for row in table.itertuples(index=False, name=None):
+            ws.append([cell(v) for v in row])
+    wb.save(path)
+
+
+def write_parquet_bundle(tables, path):
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED) as zf:
+        for name, table in tables.items():
+            # Parquet is already compressed; entries are streamed into the zip
+            with zf.open(f"{name}.parquet", "w") as fh:
+                table.to_parquet(fh, index=False)
+
+
+WRITERS = {"xlsx": write_xlsx, "parquet": write_parquet_bundle}
+
+
+def prune(folder, keep):
+    paths = [os.path.join(folder, f) for f in os.listdir(folder) if not f.endswith(".tmp")]
+    paths.sort(key=os.path.getmtime, reverse=True)
+    for path in paths[keep:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def export_file(key, fmt, build_tables, folder=EXPORT_DIR):
+    # Path of the export for `key`, written on first request only
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, f"{key}.{'zip' if fmt == 'parquet' else fmt}")
+    with _lock:
+        if os.path.exists(path):
+            os.utime(path)
+            return path
+        tmp_path = path + ".tmp"
+        WRITERS[fmt](build_tables(), tmp_path)
+        os.replace(tmp_path, path)
+        prune(folder, MAX_EXPORTS)
+    return path
+
+
+def export_bytes(key, fmt, build_tables, folder=EXPORT_DIR):
+    with open(export_file(key, fmt, build_tables, folder), "rb") as fh:
+        return fh.read()
@@ -0,0 +1,103 @@
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+# Set this to a file path to get one JSON object per line for every span,
+# memory snapshot and cache counter flush.
+PERF_LOG_ENV = "NBA_BREAK_PERF_LOG"
+
+logger = logging.getLogger("nba_break.perf")
+
+_cache_lock = threading.Lock()
+_cache_stats = {}
+
+
+class JsonLinesFormatter(logging.Formatter):
+    def format(self, record):
+        payload = {"ts": round(record.created, 3)}
+        payload.update(getattr(record, "perf", {"message": record.getMessage()}))
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+def configure_logging(path=None):
+    path = path or os.environ.get(PERF_LOG_ENV)
+    if not path or any(getattr(h, "perf_path", None) == path for h in logger.handlers):
+        return
+    handler = logging.FileHandler(path, encoding="utf-8")
+    handler.perf_path = path
+    handler.setFormatter(JsonLinesFormatter())
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def record_cache_call(name):
+    # Call at the call site of a cached function...
+    with _cache_lock:
+        _cache_stats.setdefault(name, {"calls": 0, "misses": 0})["calls"] += 1
+
+
+def record_cache_miss(name):
+    # ...and inside its body, which only runs on a miss.
+    with _cache_lock:
+        _cache_stats.setdefault(name, {"calls": 0, "misses": 0})["misses"] += 1
+
+
+def cache_stats():
+    with _cache_lock:
+        return {
+            name: {"hits": max(s["calls"] - s["misses"], 0), "misses": s["misses"]}
+            for name, s in _cache_stats.items()
+        }
+
+
+def frame_memory(df):
+    if df is None:
+        return 0
+    return int(df.memory_usage(deep=True).sum())
+
+
+class Instrumentation:
+    # Collects timing spans and memory snapshots for one script run (rerun).
+    def __init__(self, track_memory=False):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.track_memory = track_memory
+        self.spans = []
+        self.memory = []
+
+    def _emit(self, event, **fields):
+        if logger.handlers:
+            logger.info(event, extra={"perf": {"event": event, "run": self.run_id, **fields}})
+
+    @contextmanager
+    def span(self, name, **fields):
+        # Yields the span's fields so callers can attach values measured inside it
+        start = time.perf_counter()
+        try:
+            yield fields
+        finally:
+            self._finish(name, start, fields)
+
+    def _finish(self, name, start, fields):
+        ms = round((time.perf_counter() - start) * 1000, 2)
+        self.spans.append({"name": name, "ms": ms, **fields})
+        self._emit("span", name=name, ms=ms, **fields)
+
+    def snapshot(self, name, df):
+        if not self.track_memory and not logger.handlers:
+            return
+        rows = 0 if df is None else len(df)
+        size = frame_memory(df)
+        self.memory.append({"name": name, "rows": rows, "bytes": size})
+        self._emit("memory", name=name, rows=rows, bytes=size)
+
+    def flush_cache_stats(self):
+        for name, stats in cache_stats().items():
+            self._emit("cache", name=name, **stats)
+
+    def total_ms(self, prefix=""):
+        return round(sum(s["ms"] for s in self.spans if s["name"].startswith(prefix)), 2)
@@ -0,0 +1,108 @@
+import hashlib
+import json
+import os
+import re
+
+import pandas as pd
+
+# Raw "Teams" sheet layouts remembered per product family. A sheet is
+# fingerprinted from its first rows (column count, header tokens, dominant
+# value type per column); when a later season of the same family has the same
+# fingerprint, its player/team/box column mapping is reused and column
+# inference is skipped. The whole sheet is still read: serial numbers can sit
+# in any column, often only below the first rows (base cards come first).
+
+LAYOUTS_FILENAME = "layout_cache.json"
+# 2: layouts no longer restrict the columns read (usecols)
+LAYOUTS_VERSION = 2
+SAMPLE_ROWS = 200
+
+def layouts_path(folder):
+    return os.path.join(folder, LAYOUTS_FILENAME)
+
+
+def product_family(filename):
+    # "2023-24-Panini-Prizm-Basketball-Checklist.xlsx" -> "panini prizm"
+    name = os.path.splitext(os.path.basename(filename))[0].lower()
+    name = re.sub(r"\d{4}-\d{2}", " ", name)
+    tokens = re.split(r"[\s\-_]+", name)
+    ignored = {"", "basketball", "checklist", "nba"}
+    return " ".join(t for t in tokens if t not in ignored and not t.isdigit())
+
+
+def value_type(values):
+    values = [v for v in values if not pd.isna(v)]
+    if not values:
+        return "e"
+    numeric = sum(1 for v in values if isinstance(v, (int, float)))
+    return "n" if numeric * 2 > len(values) else "s"
+
+
+def fingerprint(sample, has_header):
+    sample = sample.dropna(axis=1, how="all")
+    header = [str(v).strip().lower() if isinstance(v, str) else "" for v in sample.iloc[0]] if has_header else []
+    body = sample.iloc[1:] if has_header else sample
+    parts = [
+        str(len(sample.columns)),
+        ",".join(str(c) for c in sample.columns),
+        "|".join(header),
+        "".join(value_type(body[c].tolist()) for c in sample.columns),
+    ]
+    return hashlib.sha1("#".join(parts).encode("utf-8")).hexdigest()[:12]
+
+
+def build_layout(player_col, team_col, box_col, has_header):
+    return {
+        "has_header": bool(has_header),
+        "player_col": int(player_col),
+        "team_col": int(team_col),
+        "box_col": int(box_col),
+    }
+
+
+def layout_fits(layout, df_raw, has_header):
+    # A fingerprint match on the first rows doesn't guarantee the whole sheet
+    # has the same shape: the mapping is only used if its columns exist.
+    columns = set(df_raw.columns)
+    return layout["has_header"] == has_header and all(
+        layout[key] in columns for key in ("player_col", "team_col", "box_col")
+    )
+
+
+class LayoutCache:
+    def __init__(self, folder=None):
+        self.folder = folder
+        self.families = {}
+        self.hits = 0
+        self.misses = 0
+        if folder is not None:
+            try:
+                with open(layouts_path(folder), encoding="utf-8") as fh:
+                    data = json.load(fh)
+                if data.get("version") == LAYOUTS_VERSION:
+                    self.families = data.get("families", {})
+            except (OSError, ValueError):
+                pass
+
+    def lookup(self, family, fp):
+        layout = self.families.get(family, {}).get(fp)
+        if layout is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return layout
+
+    def remember(self, family, fp, layout):
+        self.families.setdefault(family, {})[fp] = layout
+
+    def save(self):
+        if self.folder is None:
+            return
+        path = layouts_path(self.folder)
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as fh:
+                json.dump({"version": LAYOUTS_VERSION, "families": self.families}, fh, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
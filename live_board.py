@@ -0,0 +1,110 @@
+import heapq
+import json
+import os
+import threading
+from datetime import datetime
+
+# Break-night board: the best remaining player/team spots while spots get sold.
+# Scores are put in a max-heap once per dataset and product filter; selling a
+# spot never touches the heap (lazy deletion: sold entries are dropped when
+# they reach the top), and a top-k query pops k entries and pushes them back,
+# O(k log n). Sold spots live in a small JSON file next to the checklists so
+# every session, and a restarted server, sees the same board.
+LIVE_FILENAME = "live_board.json"
+KINDS = ('Player', 'Team')
+
+
+def live_path(folder):
+    return os.path.join(folder, LIVE_FILENAME)
+
+
+class TopK:
+    def __init__(self, scores):
+        # scores: {name: score}
+        self.scores = dict(scores)
+        self.heap = [(-score, name) for name, score in self.scores.items()]
+        heapq.heapify(self.heap)
+        # Sold names already popped off the heap, pushed back if un-sold
+        self.dropped = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_rows(cls, df, kind, value='Score'):
+        # One entry per checklist row value, as the board always ranked: a dual
+        # card stays "A / B" and is not split across its players
+        return cls(df.groupby(kind)[value].sum().astype(float).to_dict())
+
+    def top(self, k, sold=()):
+        # [(name, score)] of the k best names not in `sold`
+        with self._lock:
+            for name in [n for n in self.dropped if n not in sold]:
+                self.dropped.discard(name)
+                heapq.heappush(self.heap, (-self.scores[name], name))
+            picked = []
+            while self.heap and len(picked) < k:
+                item = heapq.heappop(self.heap)
+                if item[1] in sold:
+                    self.dropped.add(item[1])
+                    continue
+                picked.append(item)
+            for item in picked:
+                heapq.heappush(self.heap, item)
+        return [(name, -neg) for neg, name in picked]
+
+
+class LiveState:
+    # Sold spots of the current break, shared by every session of the server
+    def __init__(self, folder=None):
+        self.folder = folder
+        self.sold = {kind: {} for kind in KINDS}
+        self.revision = 0
+        self._lock = threading.Lock()
+        if folder is not None:
+            try:
+                with open(live_path(folder), encoding="utf-8") as fh:
+                    data = json.load(fh)
+                self.sold = {kind: dict(data.get("sold", {}).get(kind, {})) for kind in KINDS}
+                self.revision = int(data.get("revision", 0))
+            except (OSError, ValueError, AttributeError):
+                pass
+
+    def sold_names(self, kind):
+        with self._lock:
+            return set(self.sold[kind])
+
+    def history(self):
+        # [(sold_at, kind, name)], most recent first
+        with self._lock:
+            items = [(at, kind, name) for kind in KINDS for name, at in self.sold[kind].items()]
+        return sorted(items, reverse=True)
+
+    def mark_sold(self, kind, name):
+        with self._lock:
+            if name in self.sold[kind]:
+                return
+            self.sold[kind][name] = datetime.now().isoformat(timespec="seconds")
+            self._changed()
+
+    def restore(self, kind, name):
+        with self._lock:
+            if self.sold[kind].pop(name, None) is not None:
+                self._changed()
+
+    def reset(self):
+        with self._lock:
+            self.sold = {kind: {} for kind in KINDS}
+            self._changed()
+
+    def _changed(self):
+        self.revision += 1
+        if self.folder is None:
+            return
+        path = live_path(self.folder)
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as fh:
+                json.dump({"revision": self.revision, "sold": self.sold}, fh, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, path)
+        except OSError:
+            # Read-only folder: the board is still shared in memory
+            pass
@@ -0,0 +1,96 @@
+import json
+
+import pandas as pd
+
+# Dual/triple card analytics built from the '/'-exploded player frame, whose
+# index is the row of the card it came from.
+
+PAIR_COLUMNS = ['Player A', 'Player B', 'Hits']
+COMBO_COLUMNS = ['Combinaison', 'Joueurs', 'Hits']
+
+
+def multi_player_rows(players):
+    players = players[players['Player'].astype(bool)]
+    per_row = players.groupby(level=0)['Player'].transform('size')
+    multi = players.loc[per_row > 1, ['Player', 'Hits']]
+    return multi.rename_axis('row').reset_index()
+
+
+def build_pairs(players):
+    # One self-join on the card row gives every unordered player pair.
+    multi = multi_player_rows(players)
+    if multi.empty:
+        return pd.DataFrame(columns=PAIR_COLUMNS)
+    joined = multi.merge(multi[['row', 'Player']], on='row', suffixes=(' A', ' B'))
+    joined = joined[joined['Player A'] < joined['Player B']]
+    return joined.groupby(['Player A', 'Player B'], as_index=False)['Hits'].sum()
+
+
+def build_combinations(players):
+    # Name order on the card doesn't matter: members are sorted before joining.
+    multi = multi_player_rows(players)
+    if multi.empty:
+        return pd.DataFrame(columns=COMBO_COLUMNS)
+    multi = multi.sort_values(['row', 'Player'])
+    per_card = multi.groupby('row').agg(
+        Combinaison=('Player', ' / '.join),
+        Joueurs=('Player', 'size'),
+        Hits=('Hits', 'first'),
+    )
+    return per_card.groupby(['Combinaison', 'Joueurs'], as_index=False)['Hits'].sum()
+
+
+def merge_tables(tables, keys):
+    tables = [t for t in tables if not t.empty]
+    if not tables:
+        return None
+    return pd.concat(tables).groupby(keys, as_index=False)['Hits'].sum()
+
+
+class CoOccurrence:
+    def __init__(self, pairs, combinations):
+        self.pairs = pairs if pairs is not None else pd.DataFrame(columns=PAIR_COLUMNS)
+        self.combinations = combinations if combinations is not None else pd.DataFrame(columns=COMBO_COLUMNS)
+        # Both directions, sorted by player, so partner lookups are index slices
+        forward = self.pairs.rename(columns={'Player A': 'Player', 'Player B': 'Partenaire'})
+        backward = self.pairs.rename(columns={'Player B': 'Player', 'Player A': 'Partenaire'})
+        self._partners = pd.concat([forward, backward]).set_index('Player').sort_index()
+        members = self.combinations[['Combinaison']].copy()
+        members['Player'] = members['Combinaison'].str.split(' / ')
+        self._members = members.explode('Player').set_index('Player').sort_index()
+
+    def players(self):
+        return self._partners.index.unique().tolist()
+
+    def partners(self, player):
+        if player not in self._partners.index:
+            return pd.DataFrame(columns=['Partenaire', 'Hits'])
+        found = self._partners.loc[[player], ['Partenaire', 'Hits']]
+        return found.sort_values('Hits', ascending=False).reset_index(drop=True)
+
+    def top_combinations(self, size=None, player=None, limit=50):
+        combos = self.combinations
+        if size is not None:
+            combos = combos[combos['Joueurs'] == size]
+        if player is not None:
+            names = self._members.loc[[player], 'Combinaison'] if player in self._members.index else []
+            combos = combos[combos['Combinaison'].isin(names)]
+        return combos.sort_values('Hits', ascending=False).head(limit).reset_index(drop=True)
+
+    def graph(self):
+        # Node-link structure (d3 / networkx.node_link_graph compatible)
+        degree = pd.concat([
+            self.pairs[['Player A', 'Hits']].rename(columns={'Player A': 'id'}),
+            self.pairs[['Player B', 'Hits']].rename(columns={'Player B': 'id'}),
+        ]).groupby('id')['Hits'].sum()
+        return {
+            "directed": False,
+            "nodes": [{"id": name, "cards": int(hits)} for name, hits in degree.items()],
+            "links": [
+                {"source": a, "target": b, "weight": int(h)}
+                for a, b, h in self.pairs[PAIR_COLUMNS].itertuples(index=False)
+            ],
+        }
+
+    def graph_json(self):
+        return json.dumps(self.graph(), ensure_ascii=False)
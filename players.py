@@ -0,0 +1,122 @@
+import re
+import unicodedata
+
+import numpy as np
+
+# Canonical player identity: checklists spell the same player with or without
+# accents, periods, apostrophes or extra spaces ("Luka Dončić" / "Luka Doncic",
+# "Jaren Jackson Jr." / "Jaren Jackson Jr").
+
+_NON_ALNUM = re.compile(r"[^a-z0-9 ]+")
+_SPACES = re.compile(r"\s+")
+
+
+def player_key(name):
+    if not isinstance(name, str):
+        return ""
+    ascii_name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    ascii_name = _NON_ALNUM.sub("", ascii_name.lower().replace("-", " "))
+    return _SPACES.sub(" ", ascii_name).strip()
+
+
+def player_keys(names):
+    # Vectorised over the distinct names of a Series
+    keys = {n: player_key(n) for n in names.unique()}
+    return names.map(keys)
+
+
+def trigrams(key):
+    # Padded so that short names and word starts still produce grams
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+NAME_SUFFIXES = {"jr", "sr", "ii", "iii", "iv"}
+
+
+def edit_distance(a, b, limit):
+    # Levenshtein distance, stopping early once every path exceeds limit
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def name_ends(key):
+    # (first, last) name tokens, generational suffixes ignored
+    tokens = key.split()
+    while len(tokens) > 1 and tokens[-1] in NAME_SUFFIXES:
+        tokens.pop()
+    return tokens[0], tokens[-1]
+
+
+def same_name(query_key, candidate_key):
+    # Typo-level difference only: first and last names each within one edit
+    # (two for long names). "jalen williams" is not "jaylin williams".
+    for a, b in zip(name_ends(query_key), name_ends(candidate_key)):
+        limit = max(1, len(b) // 6)
+        if edit_distance(a, b, limit) > limit:
+            return False
+    return True
+
+
+class PlayerSearch:
+    # Fuzzy lookup of pasted names: trigram postings over the canonical keys
+    # of every player, scored with the Dice coefficient. Built once per
+    # dataset; a 100-name paste list resolves in a few milliseconds.
+    AUTO_MATCH = 0.7
+    MARGIN = 0.05
+    MIN_SCORE = 0.3
+
+    def __init__(self, names):
+        self.names = {}
+        for name in sorted(set(names)):
+            key = player_key(name)
+            if key:
+                self.names.setdefault(key, name)
+        self.keys = list(self.names)
+        self.sizes = np.array([len(trigrams(k)) for k in self.keys], dtype=np.int32)
+        postings = {}
+        for i, key in enumerate(self.keys):
+            for gram in trigrams(key):
+                postings.setdefault(gram, []).append(i)
+        self.postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+
+    def candidates(self, query, limit=3):
+        # [(name, score)] best first; score 1.0 for an exact canonical match
+        key = player_key(query)
+        if not key:
+            return []
+        if key in self.names:
+            return [(self.names[key], 1.0)]
+        grams = trigrams(key)
+        hits = [self.postings[g] for g in grams if g in self.postings]
+        if not hits:
+            return []
+        shared = np.bincount(np.concatenate(hits), minlength=len(self.keys))
+        scores = 2 * shared / (self.sizes + len(grams))
+        best = np.argsort(-scores, kind="stable")[:limit]
+        return [(self.names[self.keys[i]], round(float(scores[i]), 3)) for i in best if scores[i] >= self.MIN_SCORE]
+
+    def resolve(self, queries, limit=3):
+        # One entry per query: match is set when the best candidate is close
+        # enough, clearly ahead of the next one and only a typo away name by
+        # name, otherwise only suggestions.
+        resolved = []
+        for query in queries:
+            found = self.candidates(query, limit)
+            match = None
+            if found and found[0][1] >= self.AUTO_MATCH:
+                clear_lead = len(found) == 1 or found[0][1] - found[1][1] >= self.MARGIN
+                # A close trigram score can still be another real player
+                if clear_lead and (found[0][1] == 1.0 or same_name(player_key(query), player_key(found[0][0]))):
+                    match = found[0][0]
+            resolved.append({"query": query, "match": match, "score": found[0][1] if found else 0.0, "suggestions": found})
+        return resolved
@@ -0,0 +1,104 @@
+import re
+
+import pandas as pd
+
+from players import player_key, player_keys
+
+# Rookie index: per player, the first season they appear in the loaded
+# checklists, their rookie season (first season with an RC / Rookie card) and
+# draft class, joined on the canonical player key with the top-rookie lists of
+# scoring_rules.json. Partitions precompute their per-player season rows at
+# load time; the index is only a concat + groupby of those small tables.
+
+ROOKIE_PATTERN = re.compile(r"\brc\b|rookie", re.IGNORECASE)
+SEASON_COLUMNS = ['Key', 'Player', 'Year', 'Product', 'Hits', 'Score', 'RC Hits', 'RC Score']
+
+
+def season_start(season):
+    # "2023-24" -> 2023
+    try:
+        return int(str(season)[:4])
+    except ValueError:
+        return None
+
+
+def is_rookie_card(box_types):
+    box_types = box_types.astype(str)
+    flags = {b: bool(ROOKIE_PATTERN.search(b)) for b in box_types.unique()}
+    return box_types.map(flags).astype(bool)
+
+
+def player_seasons(players):
+    # players: '/'-exploded rows of one checklist (one season, one product)
+    players = players[players['Player'].astype(bool)]
+    if players.empty:
+        return pd.DataFrame(columns=SEASON_COLUMNS)
+    rookie = is_rookie_card(players['Box Type'])
+    rows = pd.DataFrame({
+        'Key': player_keys(players['Player']).to_numpy(),
+        'Player': players['Player'].to_numpy(),
+        'Year': players['Year'].to_numpy(),
+        'Product': players['Product'].to_numpy(),
+        'Hits': players['Hits'].to_numpy(),
+        'Score': players['Score'].to_numpy(),
+        'RC Hits': players['Hits'].where(rookie, 0).to_numpy(),
+        'RC Score': players['Score'].where(rookie, 0.0).to_numpy(),
+    })
+    return rows.groupby(['Key', 'Year', 'Product'], as_index=False).agg(
+        Player=('Player', 'first'), Hits=('Hits', 'sum'), Score=('Score', 'sum'),
+        **{'RC Hits': ('RC Hits', 'sum'), 'RC Score': ('RC Score', 'sum')},
+    )[SEASON_COLUMNS]
+
+
+class RookieIndex:
+    def __init__(self, seasons, top_rookies_by_year):
+        # seasons: concatenated player_seasons tables
+        self.seasons = seasons
+        self.top_picks = pd.DataFrame(
+            [(year, rank, name, player_key(name)) for year, names in top_rookies_by_year.items()
+             for rank, name in enumerate(names, start=1)],
+            columns=['Draft', 'Top', 'Player', 'Key'],
+        )
+        per_season = seasons.groupby(['Key', 'Year'], as_index=False)[['Hits', 'Score', 'RC Hits', 'RC Score']].sum()
+        rc_seasons = per_season[per_season['RC Hits'] > 0]
+        names = seasons.groupby('Key')['Player'].agg(lambda s: s.value_counts().index[0])
+        players = pd.DataFrame({
+            'Player': names,
+            'Première saison': per_season.groupby('Key')['Year'].min(),
+            'Saison rookie': rc_seasons.groupby('Key')['Year'].min(),
+            'Hits': per_season.groupby('Key')['Hits'].sum(),
+            'Score': per_season.groupby('Key')['Score'].sum(),
+            'RC Hits': per_season.groupby('Key')['RC Hits'].sum(),
+            'RC Score': per_season.groupby('Key')['RC Score'].sum(),
+        })
+        # Draft class: the top-rookie lists when listed, else the start year of the rookie season
+        listed = self.top_picks.drop_duplicates('Key').set_index('Key')
+        players['Draft'] = listed['Draft'].reindex(players.index)
+        inferred = players['Saison rookie'].map(season_start)
+        players['Draft'] = players['Draft'].fillna(inferred).astype('Int64')
+        players['Top 6'] = listed['Top'].reindex(players.index).astype('Int64')
+        self.players = players.rename_axis('Key')
+
+    def seasons_list(self):
+        return sorted(self.players['Saison rookie'].dropna().unique().tolist())
+
+    def ranking(self, season=None, limit=None):
+        # Rookies (players with an RC card) ranked by the score of their rookie cards
+        rookies = self.players[self.players['Saison rookie'].notna()]
+        if season is not None:
+            rookies = rookies[rookies['Saison rookie'] == season]
+        rookies = rookies.sort_values(['RC Score', 'RC Hits'], ascending=False)
+        return rookies.head(limit) if limit else rookies
+
+    def lookup(self, name):
+        key = player_key(name)
+        return self.players.loc[key] if key in self.players.index else None
+
+    def top_picks_presence(self):
+        # Every top-6 pick of the lists, with what the selected products hold for them
+        found = self.players[['RC Hits', 'RC Score', 'Hits']]
+        picks = self.top_picks.join(found, on='Key')
+        picks['Présent'] = picks['Hits'].fillna(0) > 0
+        picks[['RC Hits', 'Hits']] = picks[['RC Hits', 'Hits']].fillna(0).astype(int)
+        picks['RC Score'] = picks['RC Score'].fillna(0.0).round(1)
+        return picks.drop(columns='Key').sort_values(['Draft', 'Top'], ascending=[False, True])
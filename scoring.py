@@ -0,0 +1,194 @@
+import datetime
+import hashlib
+import json
+import os
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+CATEGORIES = ["🔥 Logoman", "✨ Case Hit", "💎 Auto/Mem", "📄 Base/Autre"]
+
+# The scoring model (categories + keywords, weights, rarity curve) and the
+# hype/rookie lists live in scoring_rules.json. Each model is compiled once per
+# file version and identified by a hash of its resolved rules.
+RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scoring_rules.json")
+
+_rules_lock = threading.Lock()
+_rules_cache = {}
+
+
+def rules_hash(spec):
+    canonical = json.dumps(spec, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:12]
+
+
+class ScoringModel:
+    def __init__(self, name, spec):
+        self.name = name
+        self.label = spec.get("label", name)
+        self.categories = [c["name"] for c in spec["categories"]] + [spec["fallback"]["name"]]
+        self.fallback = spec["fallback"]["name"]
+        self._keywords = {c["name"]: [k.lower() for k in c["keywords"]] for c in spec["categories"]}
+        self._patterns = [
+            (c["name"], re.compile("|".join(re.escape(k.lower()) for k in c["keywords"])))
+            for c in spec["categories"] if c["keywords"]
+        ]
+        self.weights = {c["name"]: float(c["weight"]) for c in spec["categories"]}
+        self.weights[self.fallback] = float(spec["fallback"]["weight"])
+        self.weights.update({k: float(v) for k, v in spec.get("weights", {}).items()})
+        self.numerator = float(spec["rarity"]["numerator"])
+        self.cap = float(spec["rarity"]["cap"])
+        resolved = {
+            "categories": [[c, self._keywords.get(c, [])] for c in self.categories],
+            "weights": self.weights,
+            "rarity": [self.numerator, self.cap],
+        }
+        # Scores change with any of these; categories only with the keyword lists
+        self.version = rules_hash(resolved)
+        self.category_version = rules_hash(resolved["categories"])
+
+    def keywords(self, category):
+        return self._keywords.get(category, [])
+
+    def categorize_one(self, box_type):
+        # First category (in file order) with a keyword contained in the box type
+        box_type_str = str(box_type).lower()
+        for name, pattern in self._patterns:
+            if pattern.search(box_type_str):
+                return name
+        return self.fallback
+
+    def categorize(self, box_types):
+        box_types = box_types.astype(str)
+        categories = {b: self.categorize_one(b) for b in box_types.unique()}
+        return box_types.map(categories)
+
+    def rarity(self, serials):
+        # 1 + numerator/serial capped, 1.0 for unnumbered cards
+        serials = np.asarray(serials, dtype=float)
+        with np.errstate(divide="ignore"):
+            mult = np.minimum(1.0 + self.numerator / serials, self.cap)
+        return np.where(serials > 0, mult, 1.0)
+
+    def score(self, category, serials):
+        # Vectorised: only needs the cached Category and Serial columns
+        rarity_mult = pd.Series(self.rarity(serials), index=category.index)
+        weight = category.map(self.weights).astype(float).fillna(self.weights[self.fallback])
+        return rarity_mult, weight * rarity_mult
+
+
+class ScoringRules:
+    def __init__(self, spec):
+        self.version = rules_hash(spec)
+        self.models = {name: ScoringModel(name, resolve_model(spec["models"], name)) for name in spec["models"]}
+        self.active = self.models[spec.get("active", "default")]
+        hype = spec.get("hype", {})
+        self.hype_default = float(hype.get("default", 1.0))
+        self.hype_map = {}
+        # Earlier tiers win when a player is listed twice
+        for tier in reversed(hype.get("tiers", [])):
+            for player in tier["players"]:
+                self.hype_map[player] = float(tier["multiplier"])
+        self.top_rookies_by_year = {int(y): names for y, names in spec.get("top_rookies_by_year", {}).items()}
+
+    def hype_multipliers(self, players):
+        return players.map(self.hype_map).astype(float).fillna(self.hype_default)
+
+
+def resolve_model(models, name, seen=()):
+    # "extends" copies the parent; "weights" overrides individual category weights
+    spec = dict(models[name])
+    parent = spec.pop("extends", None)
+    if parent is None:
+        return spec
+    if parent in seen or parent not in models:
+        raise ValueError(f"modèle de score '{name}' : parent '{parent}' invalide")
+    base = resolve_model(models, parent, seen + (name,))
+    weights = {**base.get("weights", {}), **spec.pop("weights", {})}
+    merged = {**base, **spec}
+    if weights:
+        merged["weights"] = weights
+    return merged
+
+
+def load_rules(path=RULES_PATH):
+    # Compiled once per (path, mtime, size); a broken edit raises ValueError
+    stat = os.stat(path)
+    cache_key = (path, stat.st_mtime, stat.st_size)
+    with _rules_lock:
+        rules = _rules_cache.get(cache_key)
+        if rules is None:
+            try:
+                with open(path, encoding="utf-8") as fh:
+                    rules = ScoringRules(json.load(fh))
+            except (KeyError, TypeError) as e:
+                raise ValueError(f"{os.path.basename(path)} : règle manquante ou invalide ({e})") from e
+            _rules_cache.clear()
+            _rules_cache[cache_key] = rules
+        return rules
+
+
+def default_model():
+    return load_rules().active
+
+
+def parse_numbering(value):
+    try:
+        return int(float(value))
+    except (ValueError, TypeError):
+        return None
+
+
+SERIAL_PATTERN = re.compile(r"^\s*(?:\d+\s*)?/\s*(\d+)\s*$")
+
+
+def parse_serial(value):
+    # Print run as an int, 0 when the card isn't numbered. Accepts 25, 25.0,
+    # "25", "/25" and "3/25" (parse_numbering alone, used by the filters
+    # before the Serial column, read the last two as unnumbered). "1/1" typed
+    # in a cell is stored by Excel as a date shown d/m: its month is the run.
+    if isinstance(value, datetime.date):
+        return value.month
+    number = parse_numbering(value)
+    if number is None and isinstance(value, str):
+        match = SERIAL_PATTERN.match(value)
+        number = int(match.group(1)) if match else None
+    return number if number and number > 0 else 0
+
+
+def serial_numbers(numbering):
+    # Parsed once per distinct value
+    serials = {n: parse_serial(n) for n in numbering.unique()}
+    return numbering.map(serials).astype("int32")
+
+
+def score_frame(df, model=None):
+    # (category, rarity_mult, score), categorising each distinct Box Type only once
+    model = model or default_model()
+    category = model.categorize(df['Box Type'])
+    serials = df['Serial'] if 'Serial' in df.columns else serial_numbers(df['Numbering'])
+    rarity_mult, score = model.score(category, serials)
+    return category, rarity_mult, score
+
+
+def evaluate_models(frame, models, base_model=None):
+    # One Score column per model for the same rows. frame needs Box Type and
+    # Serial (and Category, produced by base_model). Rows are categorised once
+    # per distinct keyword set and the rarity curve once per distinct curve.
+    categories = {}
+    if base_model is not None and 'Category' in frame.columns:
+        categories[base_model.category_version] = frame['Category']
+    rarities = {}
+    scores = {}
+    for model in models:
+        category = categories.get(model.category_version)
+        if category is None:
+            category = categories[model.category_version] = model.categorize(frame['Box Type'])
+        curve = (model.numerator, model.cap)
+        if curve not in rarities:
+            rarities[curve] = model.rarity(frame['Serial'])
+        weight = category.map(model.weights).astype(float).fillna(model.weights[model.fallback])
+        scores[model.label] = weight.to_numpy() * rarities[curve]
+    return pd.DataFrame(scores, index=frame.index)
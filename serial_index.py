@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+# Rows sorted by (group, serial) once, so "cards numbered /N or lower" for a
+# player, team or file is a binary search instead of a pass over the frame.
+# Serial 0 means unnumbered; like the old filter, unnumbered cards count as
+# 0 and therefore pass every "<= /N" filter.
+
+
+class SerialIndex:
+    def __init__(self, frame, group=None):
+        serials = frame['Serial'].to_numpy()
+        if group is None:
+            codes = np.zeros(len(frame), dtype=np.int64)
+            self._codes = {None: 0}
+        else:
+            codes, uniques = pd.factorize(frame[group])
+            self._codes = {value: code for code, value in enumerate(uniques)}
+        # Positions into `frame` (its index may repeat, e.g. exploded players)
+        self.order = np.lexsort((serials, codes))
+        self.serials = serials[self.order]
+        self._sorted_codes = codes[self.order]
+
+    def _bounds(self, group):
+        code = self._codes.get(group)
+        if code is None:
+            return 0, 0
+        start = np.searchsorted(self._sorted_codes, code, side='left')
+        end = np.searchsorted(self._sorted_codes, code, side='right')
+        return start, end
+
+    def _range(self, group, low, high):
+        start, end = self._bounds(group)
+        serials = self.serials[start:end]
+        lo = start + np.searchsorted(serials, low, side='left') if low is not None else start
+        hi = start + np.searchsorted(serials, high, side='right') if high is not None else end
+        return lo, hi
+
+    def positions(self, group=None, max_serial=None, min_serial=None):
+        # Frame positions in original row order
+        lo, hi = self._range(group, min_serial, max_serial)
+        return np.sort(self.order[lo:hi])
+
+    def count(self, group=None, max_serial=None, min_serial=None):
+        lo, hi = self._range(group, min_serial, max_serial)
+        return int(hi - lo)
+
+    def numbered(self, max_serial, group=None):
+        # Only actually numbered cards (1 <= serial <= max_serial)
+        return self.positions(group, max_serial=max_serial, min_serial=1)
+
+    def histogram(self, group=None):
+        start, end = self._bounds(group)
+        serials = self.serials[start:end]
+        values, counts = np.unique(serials[serials > 0], return_counts=True)
+        return pd.Series(counts, index=values, name='Cartes').rename_axis('Serial')
@@ -0,0 +1,97 @@
+import os
+import random
+
+from openpyxl import Workbook
+
+# Raw "Teams" sheets shaped like the real checklists the cleaner ingests:
+# Col A=Box Type, B=Card #, C=Player, D=Team, E='/' or serial text, F=count.
+
+FIRST_NAMES = [
+    "LeBron", "Stephen", "Kevin", "Giannis", "Luka", "Jayson", "Joel", "Nikola", "Ja", "Trae",
+    "Victor", "Anthony", "Devin", "Jimmy", "Damian", "Zion", "LaMelo", "Tyrese", "Shai", "Donovan",
+    "Cade", "Jalen", "Scottie", "Evan", "Paolo", "Chet", "Scoot", "Brandon", "Amen", "Ausar",
+]
+LAST_NAMES = [
+    "James", "Curry", "Durant", "Antetokounmpo", "Doncic", "Tatum", "Embiid", "Jokic", "Morant", "Young",
+    "Wembanyama", "Edwards", "Booker", "Butler", "Lillard", "Williamson", "Ball", "Haliburton",
+    "Gilgeous-Alexander", "Mitchell", "Cunningham", "Green", "Barnes", "Mobley", "Banchero",
+    "Holmgren", "Henderson", "Miller", "Thompson", "Coulibaly",
+]
+TEAMS = [
+    "Atlanta Hawks", "Boston", "Brooklyn Nets", "Charlotte", "Chicago Bulls", "Cleveland",
+    "Dallas Mavericks", "Denver", "Detroit Pistons", "Golden State", "Houston Rockets", "Indiana",
+    "LA Clippers", "Lakers", "Memphis Grizzlies", "Miami", "Milwaukee Bucks", "Minnesota",
+    "New Orleans Pelicans", "New York", "Oklahoma City Thunder", "Orlando", "Philadelphia 76ers",
+    "Phoenix", "Portland Trail Blazers", "Sacramento", "San Antonio Spurs", "Toronto",
+    "Utah Jazz", "Washington",
+]
+
+# (box type, weight) pairs; parallels dominate like in real Prizm/Select lists.
+BOX_TYPES = [
+    ("Base", 30), ("Base Set", 10), ("Base Prizms Silver", 12), ("Base Prizms Red Wave", 6),
+    ("Base Prizms Gold", 4), ("Rated Rookies", 5), ("Rookie Autographs", 4),
+    ("Signatures Prizms Blue", 3), ("Auto Patch", 2), ("Jersey Relics", 3), ("Memorabilia", 2),
+    ("Insert Fireworks", 4), ("Variation", 2), ("Kaboom!", 1), ("Downtown", 1),
+    ("Color Blast", 1), ("Manga", 1), ("Stained Glass", 1), ("Micro Mosaic", 1),
+    ("Logoman Autographs", 0.3), ("NBA Logoman Patch", 0.2),
+]
+SERIALS = [10, 25, 49, 75, 99, 149, 199, 249, 1, 5]
+PRODUCTS = ["Prizm", "Select", "Mosaic", "Donruss Optic", "Court Kings", "Immaculate", "Noir"]
+
+
+def random_player(rng):
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def generate_rows(rng, count):
+    box_names = [b for b, _ in BOX_TYPES]
+    box_weights = [w for _, w in BOX_TYPES]
+    rows = []
+    for i in range(count):
+        box_type = rng.choices(box_names, box_weights)[0]
+        roll = rng.random()
+        if roll < 0.04:
+            # Dual / triple cards, with and without spaces around '/'
+            names = [random_player(rng) for _ in range(rng.choice([2, 2, 3]))]
+            player = rng.choice([" / ", "/"]).join(names)
+            team = " / ".join(rng.choice(TEAMS) for _ in names)
+        else:
+            player = random_player(rng) + ("," if roll > 0.97 else "")
+            team = rng.choice(TEAMS)
+
+        serial_roll = rng.random()
+        if serial_roll < 0.45:
+            sep, count_cell = None, None
+        elif serial_roll < 0.65:
+            sep, count_cell = "/", rng.choice(SERIALS)  # lone '/' cell + numeric neighbour
+        elif serial_roll < 0.85:
+            sep, count_cell = f"/{rng.choice(SERIALS)}", None
+        else:
+            sep, count_cell = f"/ {rng.choice(SERIALS)}", None
+        rows.append([box_type, i + 1, player, team, sep, count_cell])
+    return rows
+
+
+def write_raw_checklist(path, rows, with_header=True):
+    # write_only keeps memory flat for 100k+ row sheets
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Teams")
+    if with_header:
+        ws.append(["Box Type", "Card #", "Player", "Team", "", "Print Run"])
+    for row in rows:
+        ws.append(row)
+    wb.save(path)
+
+
+def generate_catalogue(folder, products=3, rows_per_product=1000, seed=42):
+    os.makedirs(folder, exist_ok=True)
+    rng = random.Random(seed)
+    paths = []
+    for i in range(products):
+        year = 2020 + (i % 6)
+        name = PRODUCTS[i % len(PRODUCTS)].replace(" ", "-")
+        filename = f"{year}-{str(year + 1)[2:]}-Panini-{name}-{i}-Basketball-Checklist.xlsx"
+        path = os.path.join(folder, filename)
+        write_raw_checklist(path, generate_rows(rng, rows_per_product), with_header=i % 2 == 0)
+        paths.append(path)
+    return paths
@@ -0,0 +1,93 @@
+import math
+
+import streamlit as st
+
+# Paginated tables: filtering, sorting and slicing happen on the server and
+# only the visible page is sent to the browser. Row clicks are resolved to the
+# row label of the full frame, not to a position in the displayed slice.
+
+PAGE_SIZES = [25, 50, 100, 200]
+ORIGINAL_ORDER = "—"
+
+
+def page_slice(frame, sort_by=None, ascending=False, search=None, search_column=None, page=1, page_size=50):
+    if search and search_column:
+        frame = frame[frame[search_column].astype(str).str.contains(search, case=False, regex=False, na=False)]
+    if sort_by in frame.columns:
+        frame = frame.sort_values(by=sort_by, ascending=ascending, kind="stable")
+    total = len(frame)
+    pages = max(1, math.ceil(total / page_size))
+    page = min(max(int(page), 1), pages)
+    start = (page - 1) * page_size
+    return frame.iloc[start:start + page_size], total, page, pages
+
+
+def selected_label(event_obj, page_df):
+    # Position in the displayed page -> label in the full frame
+    selection = getattr(event_obj, "selection", None)
+    rows = getattr(selection, "rows", None) if selection is not None else None
+    if not rows or rows[0] >= len(page_df):
+        return None
+    return page_df.index[rows[0]]
+
+
+def paginated_table(frame, key, default_sort=None, sort_columns=None, search_column=None,
+                    selectable=True, enrich=None, page_size=50, hide_index=False, ascending=False):
+    # enrich(page_df) may add expensive display-only columns to the visible page.
+    # ascending: initial state of the "Croissant" toggle (largest first by default).
+    # Returns the selected row of `frame` (a Series) or None.
+    if sort_columns is None:
+        sort_columns = [c for c in frame.columns if frame[c].dtype.kind in "if"]
+    sort_columns = [ORIGINAL_ORDER] + [c for c in sort_columns if c != ORIGINAL_ORDER]
+    if default_sort and default_sort not in sort_columns:
+        sort_columns.append(default_sort)
+
+    cols = st.columns([3, 2, 1, 1]) if search_column else st.columns([2, 1, 1])
+    if search_column:
+        search = cols[0].text_input("Recherche", key=f"{key}_search", placeholder=search_column)
+        cols = cols[1:]
+    else:
+        search = None
+    sort_by = cols[0].selectbox(
+        "Trier par", sort_columns,
+        index=sort_columns.index(default_sort) if default_sort in sort_columns else 0,
+        key=f"{key}_sort",
+    )
+    ascending = cols[1].toggle("Croissant", value=ascending, key=f"{key}_asc")
+    size = cols[2].selectbox(
+        "Lignes", PAGE_SIZES,
+        index=PAGE_SIZES.index(page_size) if page_size in PAGE_SIZES else 1,
+        key=f"{key}_size",
+    )
+
+    page_key = f"{key}_page"
+    page_df, total, page, pages = page_slice(
+        frame, sort_by, ascending, search, search_column, st.session_state.get(page_key, 1), size
+    )
+    # Clamped before the widget is created, e.g. when a search shrinks the result
+    st.session_state[page_key] = page
+
+    display_df = enrich(page_df) if enrich is not None and not page_df.empty else page_df
+    if selectable:
+        event = st.dataframe(
+            display_df,
+            use_container_width=True,
+            hide_index=hide_index,
+            selection_mode="single-row",
+            on_select="rerun",
+            key=f"{key}_p{page}",
+        )
+    else:
+        st.dataframe(display_df, use_container_width=True, hide_index=hide_index)
+        event = None
+
+    nav = st.columns([1, 2])
+    nav[0].number_input("Page", min_value=1, max_value=pages, step=1, key=page_key)
+    if total:
+        first = (page - 1) * size + 1
+        nav[1].caption(f"Lignes {first}–{first + len(page_df) - 1} sur {total} • page {page}/{pages}")
+    else:
+        nav[1].caption("Aucune ligne.")
+
+    label = selected_label(event, page_df) if event is not None else None
+    return frame.loc[label] if label is not None else None
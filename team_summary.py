@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+# Per-team dashboard data for "Analyse Équipe", computed in one pass over the
+# exploded team rows: category counts, top players, files, serial histogram
+# and the row positions of each team. Built once per dataset and product
+# filter, so switching teams is a dict lookup.
+
+
+class TeamSummaries:
+    def __init__(self, df_t, categories, top_players=15):
+        self.categories = list(categories)
+        codes, uniques = pd.factorize(df_t['Team'])
+        # Row positions of each team, in frame order
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        positions = {team: order[bounds[i]:bounds[i + 1]] for i, team in enumerate(uniques)}
+
+        totals = df_t.groupby('Team')[['Hits', 'Score']].sum()
+        by_category = (
+            df_t.groupby(['Team', 'Category'])['Hits'].sum().unstack(fill_value=0)
+            .reindex(columns=self.categories, fill_value=0)
+        )
+        players = df_t.groupby(['Team', 'Player'])[['Hits', 'Score']].sum()
+        players = players.sort_values('Score', ascending=False).groupby(level=0).head(top_players)
+        files = df_t.groupby(['Team', 'File'], observed=True)['Hits'].sum()
+        numbered = df_t[df_t['Serial'] > 0]
+        serials = numbered.groupby(['Team', 'Serial']).size()
+
+        players_by_team = dict(iter(players.groupby(level=0)))
+        files_by_team = dict(iter(files.groupby(level=0)))
+        serials_by_team = dict(iter(serials.groupby(level=0)))
+        empty_players = pd.DataFrame(columns=['Player', 'Hits', 'Score'])
+
+        self.summaries = {}
+        for team, hits in totals['Hits'].sort_values(ascending=False).items():
+            team_players = players_by_team.get(team)
+            team_files = files_by_team.get(team)
+            team_serials = serials_by_team.get(team)
+            self.summaries[team] = {
+                'hits': int(hits),
+                'score': float(totals.at[team, 'Score']),
+                'categories': by_category.loc[team].astype(int).to_dict(),
+                'players': team_players.droplevel(0).reset_index().round({'Score': 2}) if team_players is not None else empty_players,
+                'files': (
+                    team_files.droplevel(0).rename('Count').reset_index().sort_values('Count', ascending=False)
+                    if team_files is not None else pd.DataFrame(columns=['File', 'Count'])
+                ),
+                'serials': (
+                    team_serials.droplevel(0).rename('Cartes') if team_serials is not None
+                    else pd.Series(dtype='int64', name='Cartes').rename_axis('Serial')
+                ),
+                'positions': positions[team],
+            }
+
+    @property
+    def teams(self):
+        # Most cards first, as the old value_counts ordering
+        return list(self.summaries)
+
+    def get(self, team):
+        return self.summaries.get(team)
@@ -0,0 +1,87 @@
+import re
+
+# Team resolution shared by the cleaner (clean_checklists.py) and the app
+# (normalize_checklist): city-only names, nicknames, abbreviations and former
+# names of a franchise all resolve to its current full name.
+
+# Current name -> (abbreviations, other spellings: city, nickname, former names)
+FRANCHISES = {
+    "Atlanta Hawks": (["ATL"], ["Atlanta", "Hawks", "St. Louis Hawks", "Milwaukee Hawks", "Tri-Cities Blackhawks"]),
+    "Boston Celtics": (["BOS"], ["Boston", "Celtics"]),
+    "Brooklyn Nets": (["BKN", "BRK", "NJN"], ["Brooklyn", "Nets", "New Jersey Nets", "New York Nets"]),
+    "Charlotte Hornets": (["CHA", "CHO", "CHH"], ["Charlotte", "Charlotte Bobcats", "Bobcats"]),
+    "Chicago Bulls": (["CHI"], ["Chicago", "Bulls"]),
+    "Cleveland Cavaliers": (["CLE"], ["Cleveland", "Cavaliers", "Cavs"]),
+    "Dallas Mavericks": (["DAL"], ["Dallas", "Mavericks", "Mavs"]),
+    "Denver Nuggets": (["DEN"], ["Denver", "Nuggets"]),
+    "Detroit Pistons": (["DET"], ["Detroit", "Pistons", "Fort Wayne Pistons", "Ft. Wayne Pistons"]),
+    "Golden State Warriors": (["GSW", "GS"], ["Golden State", "Warriors", "Philadelphia Warriors", "San Francisco Warriors"]),
+    "Houston Rockets": (["HOU"], ["Houston", "Rockets", "San Diego Rockets"]),
+    "Indiana Pacers": (["IND"], ["Indiana", "Pacers"]),
+    "Los Angeles Clippers": (["LAC"], ["LA Clippers", "Clippers", "San Diego Clippers", "Buffalo Braves"]),
+    "Los Angeles Lakers": (["LAL"], ["LA Lakers", "Lakers", "Minneapolis Lakers"]),
+    "Memphis Grizzlies": (["MEM"], ["Memphis", "Grizzlies", "Vancouver Grizzlies"]),
+    "Miami Heat": (["MIA"], ["Miami", "Heat"]),
+    "Milwaukee Bucks": (["MIL"], ["Milwaukee", "Bucks"]),
+    "Minnesota Timberwolves": (["MIN"], ["Minnesota", "Timberwolves", "Wolves"]),
+    "New Orleans Pelicans": (["NOP", "NOH", "NOK"], ["New Orleans", "Pelicans", "New Orleans Hornets"]),
+    "New York Knicks": (["NYK"], ["New York", "Knicks"]),
+    "Oklahoma City Thunder": (["OKC", "SEA"], ["Oklahoma City", "Thunder", "Seattle Supersonics", "Seattle SuperSonics", "Seattle Sonics", "Sonics"]),
+    "Orlando Magic": (["ORL"], ["Orlando", "Magic"]),
+    "Philadelphia 76ers": (["PHI"], ["Philadelphia", "76ers", "Sixers", "Syracuse Nationals"]),
+    "Phoenix Suns": (["PHX", "PHO"], ["Phoenix", "Suns"]),
+    "Portland Trail Blazers": (["POR"], ["Portland", "Trail Blazers", "Trailblazers", "Blazers", "Portland Trailblazers"]),
+    "Sacramento Kings": (["SAC"], ["Sacramento", "Kings", "Kansas City Kings", "Cincinnati Royals", "Rochester Royals"]),
+    "San Antonio Spurs": (["SAS"], ["San Antonio", "Spurs"]),
+    "Toronto Raptors": (["TOR"], ["Toronto", "Raptors"]),
+    "Utah Jazz": (["UTA", "UTAH"], ["Utah", "Jazz", "New Orleans Jazz"]),
+    "Washington Wizards": (["WAS", "WSH", "WSB"], ["Washington", "Wizards", "Washington Bullets", "Capital Bullets", "Baltimore Bullets"]),
+}
+
+_PUNCTUATION = re.compile(r"[.']")
+_SPACES = re.compile(r"\s+")
+_NUMBER = re.compile(r"^\d+$")
+
+
+def team_lookup_key(value):
+    # "L.A. Lakers " -> "la lakers"
+    return _SPACES.sub(" ", _PUNCTUATION.sub("", str(value).lower())).strip()
+
+
+def build_team_map():
+    mapping = {}
+    for name, (abbreviations, aliases) in FRANCHISES.items():
+        for alias in [name] + abbreviations + aliases:
+            mapping[team_lookup_key(alias)] = name
+    return mapping
+
+
+# lookup key -> current franchise name
+TEAM_MAP = build_team_map()
+
+
+def resolve_team_part(part):
+    part = _SPACES.sub(" ", part).strip()
+    resolved = TEAM_MAP.get(team_lookup_key(part))
+    if resolved is not None:
+        return resolved
+    # Unknown teams (national teams, ABA...) only get their casing unified
+    return part.title() if part.islower() or part.isupper() else part
+
+
+def resolve_team(value):
+    # Multi-team cells ("Lakers / BOS") are resolved part by part; stray
+    # print runs left in the team cell ("Seattle Supersonics /125") are dropped.
+    if value is None or (isinstance(value, float) and value != value):
+        return value
+    parts = [p for p in str(value).split("/") if p.strip() and not _NUMBER.match(p.strip())]
+    if not parts:
+        return str(value).strip()
+    return " / ".join(resolve_team_part(p) for p in parts)
+
+
+def resolve_teams(teams):
+    # Resolved once per distinct value: mapping a categorical only maps its categories
+    categories = teams.astype("category")
+    resolved = {value: resolve_team(value) for value in categories.cat.categories}
+    return categories.map(resolved).astype(object).where(teams.notna(), None)
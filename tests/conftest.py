@@ -0,0 +1,138 @@
+import json
+import os
+import shutil
+import time
+
+import pytest
+
+from clean_checklists import process_file
+from dataset import ChecklistDataset, Partition, normalize_checklist, read_teams_clean
+from xlsx_reader import list_sheets
+
+# Golden snapshots of the pipeline on the real checklists in checklists_clean.
+# Snapshots live in tests/golden/<name>.json; after an intended output change
+# (new team mapping, scoring rule...) rewrite them and review the diff:
+#   python -m pytest --update-golden
+# Timing baselines are machine specific: the timing tests are deselected by
+# default (pytest.ini) and run, or rewritten, with -m timing:
+#   python -m pytest -m timing [--update-golden]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CHECKLISTS_DIR = os.path.join(ROOT, "checklists_clean")
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden")
+
+
+def pytest_addoption(parser):
+    parser.addoption("--update-golden", action="store_true", help="réécrit les snapshots de tests/golden")
+
+
+def pytest_generate_tests(metafunc):
+    # One test per checklist for tests taking a "filename" argument
+    if "filename" in metafunc.fixturenames:
+        metafunc.parametrize("filename", checklist_files())
+
+
+def checklist_files():
+    return sorted(
+        f for f in os.listdir(CHECKLISTS_DIR)
+        if f.endswith(".xlsx") and not f.startswith("~$")
+    )
+
+
+def load_partition(filename):
+    # Same steps as the app's load_partition: (partition, notes), partition None when skipped
+    path = os.path.join(CHECKLISTS_DIR, filename)
+    try:
+        df = read_teams_clean(path)
+    except ValueError as e:
+        return None, [f"Lecture impossible: {e}"]
+    df, notes = normalize_checklist(df, filename)
+    if df is None:
+        return None, notes
+    return Partition(path, filename, df, notes), notes
+
+
+class Golden:
+    def __init__(self, update):
+        self.update = update
+        self.written = {}
+
+    def path(self, name):
+        return os.path.join(GOLDEN_DIR, f"{name}.json")
+
+    def load(self, name):
+        try:
+            with open(self.path(name), encoding="utf-8") as fh:
+                return json.load(fh)
+        except FileNotFoundError:
+            pytest.fail(f"snapshot {name} absent, lancer pytest --update-golden")
+
+    def check(self, name, key, value):
+        # value must already be JSON types (round floats before)
+        if self.update:
+            self.written.setdefault(name, {})[key] = value
+            return
+        expected = self.load(name)
+        assert key in expected, f"{key} absent du snapshot {name}"
+        assert value == expected[key]
+
+    def save(self):
+        os.makedirs(GOLDEN_DIR, exist_ok=True)
+        for name, values in self.written.items():
+            # Merged so a partial run (-k ...) doesn't drop other entries
+            merged = {}
+            if os.path.exists(self.path(name)):
+                with open(self.path(name), encoding="utf-8") as fh:
+                    merged = json.load(fh)
+            merged.update(values)
+            with open(self.path(name), "w", encoding="utf-8") as fh:
+                json.dump(dict(sorted(merged.items())), fh, ensure_ascii=False, indent=1)
+                fh.write("\n")
+
+
+@pytest.fixture(scope="session")
+def golden(request):
+    snapshots = Golden(request.config.getoption("--update-golden"))
+    yield snapshots
+    if snapshots.update:
+        snapshots.save()
+
+
+@pytest.fixture(scope="session")
+def partitions():
+    # {filename: (partition, notes)}, loaded once for the whole session
+    return {filename: load_partition(filename) for filename in checklist_files()}
+
+
+@pytest.fixture(scope="session")
+def dataset(partitions):
+    data = ChecklistDataset()
+    for partition, _ in partitions.values():
+        if partition is not None:
+            data.add(partition)
+    return data
+
+
+@pytest.fixture(scope="session")
+def raw_checklists():
+    # Files that still carry the raw "Teams" sheet the cleaner reads
+    paths = [os.path.join(CHECKLISTS_DIR, f) for f in checklist_files()]
+    return [p for p in paths if "Teams" in list_sheets(p)]
+
+
+@pytest.fixture(scope="session")
+def cleaned(raw_checklists, tmp_path_factory):
+    # One cleaner pass shared by the snapshot and the timing tests (openpyxl
+    # load/save dominates): ([(filename, rows, dst_path)], seconds)
+    clean_dir = tmp_path_factory.mktemp("clean")
+    results = []
+    seconds = 0.0
+    for path in raw_checklists:
+        filename = os.path.basename(path)
+        dst_path = clean_dir / filename
+        shutil.copy2(path, dst_path)
+        start = time.perf_counter()
+        rows = process_file(path, dst_path)
+        seconds += time.perf_counter() - start
+        results.append((filename, rows, dst_path))
+    return results, seconds
@@ -0,0 +1,106 @@
+import json
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+from urllib.parse import quote
+from urllib.request import urlopen
+
+import pytest
+
+import api_server
+from api_server import make_server
+from conftest import CHECKLISTS_DIR
+from exports import ranking
+from scoring import default_model
+
+SAMPLE_FILES = ["2017-18-Hoops.xlsx", "2023-24-Panini-Prizm-Basketball-Checklist.xlsx"]
+
+
+@pytest.fixture
+def api(tmp_path):
+    for filename in SAMPLE_FILES:
+        shutil.copy2(os.path.join(CHECKLISTS_DIR, filename), tmp_path / filename)
+    server = make_server(str(tmp_path), port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def get(server, path):
+    url = f"http://127.0.0.1:{server.server_address[1]}{path}"
+    try:
+        with urlopen(url) as response:
+            return response.status, json.loads(response.read())
+    except HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_rankings_match_export_tables(api):
+    status, body = get(api, "/rankings?kind=team&limit=5")
+    assert status == 200
+    _, _, df_t = api.RequestHandlerClass.engine.dataset.frames()
+    expected = ranking(df_t, 'Team', default_model().categories).head(5)
+    assert [row["Team"] for row in body["ranking"]] == expected['Team'].tolist()
+    assert [row["Score"] for row in body["ranking"]] == expected['Score'].tolist()
+
+
+def test_burst_is_computed_once(api):
+    engine = api.RequestHandlerClass.engine
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: get(api, "/rankings?kind=player&category=Logoman"), range(24)))
+    assert {status for status, _ in results} == {200}
+    assert engine.computed == 1
+
+
+def test_distinct_queries_compute_in_parallel(api, monkeypatch):
+    # Both requests must be inside the handler at once to pass the barrier
+    barrier = threading.Barrier(2, timeout=10)
+
+    def wait(engine, dataset, products, params):
+        barrier.wait()
+        return {"query": params["q"][0]}
+
+    monkeypatch.setitem(api_server.ENDPOINTS, "/wait", wait)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = list(pool.map(lambda q: get(api, f"/wait?q={q}"), "ab"))
+    assert [body["query"] for _, body in results] == ["a", "b"]
+
+
+def test_changed_workbook_gets_a_new_version(api, tmp_path):
+    _, before = get(api, "/status")
+    os.utime(tmp_path / SAMPLE_FILES[0], (0, 0))
+    _, after = get(api, "/status")
+    assert before["version"] != after["version"]
+    assert after["files"] == SAMPLE_FILES
+
+
+def test_player_lookup_is_fuzzy(api):
+    _, ranking_body = get(api, "/rankings?kind=player&limit=1")
+    name = ranking_body["ranking"][0]["Player"]
+    status, body = get(api, f"/player?name={quote(name.lower())}")
+    assert status == 200
+    assert body["player"] == name
+    assert body["hits"] == sum(body["categories"].values())
+
+
+def test_errors(api):
+    assert get(api, "/nope")[0] == 404
+    assert get(api, "/rankings?kind=foo")[0] == 400
+    status, body = get(api, "/player?name=zzzzzz")
+    assert status == 404 and "suggestions" in body
+    assert get(api, "/cost?default=nan")[0] == 400
+    assert get(api, "/cost?cost=Boston%20Celtics:inf")[0] == 400
+
+
+def test_unexpected_error_is_a_json_500(api, monkeypatch, capsys):
+    def broken(engine, dataset, products, params):
+        raise KeyError("Team")
+
+    monkeypatch.setitem(api_server.ENDPOINTS, "/broken", broken)
+    status, body = get(api, "/broken")
+    assert status == 500 and "error" in body
+    assert get(api, "/status")[0] == 200
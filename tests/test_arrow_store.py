@@ -0,0 +1,78 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from arrow_store import ArrowStore
+from conftest import CHECKLISTS_DIR
+from dataset import normalize_checklist, read_teams_clean
+
+pytest.importorskip("pyarrow")
+
+SAMPLE_FILES = ["2017-18-Hoops.xlsx", "2023-24-Panini-Prizm-Basketball-Checklist.xlsx"]
+
+
+@pytest.fixture
+def folder(tmp_path):
+    for filename in SAMPLE_FILES:
+        shutil.copy2(os.path.join(CHECKLISTS_DIR, filename), tmp_path / filename)
+    return tmp_path
+
+
+def test_published_frame_matches_workbook(folder):
+    store = ArrowStore(folder)
+    for filename in SAMPLE_FILES:
+        path = str(folder / filename)
+        assert store.publish_workbook(path)
+        expected, expected_notes = normalize_checklist(read_teams_clean(path), filename)
+        frame, notes = store.read(path)
+        pd.testing.assert_frame_equal(frame, expected.reset_index(drop=True))
+        assert notes == expected_notes
+
+
+def test_columns_are_views_of_the_mapped_file(folder):
+    import pyarrow as pa
+
+    store = ArrowStore(folder)
+    path = str(folder / SAMPLE_FILES[1])
+    store.publish_workbook(path)
+    before = pa.total_allocated_bytes()
+    frame, _ = store.read(path)
+    # The string columns point into the map; only Numbering, whose nulls
+    # become NaN, is copied (8 bytes a row)
+    assert pa.total_allocated_bytes() - before < len(frame) * 8 + 4096
+    assert [str(frame[c].dtype) for c in ('Player', 'Team', 'Box Type')] == ["str"] * 3
+
+
+def test_reader_sees_manifest_swap(folder):
+    reader = ArrowStore(folder)
+    path = str(folder / SAMPLE_FILES[0])
+    assert reader.read(path) is None
+
+    ArrowStore(folder).publish_workbook(path)
+    assert reader.read(path) is not None
+    assert reader.generation == 1
+
+
+def test_edited_workbook_falls_back(folder):
+    store = ArrowStore(folder)
+    path = str(folder / SAMPLE_FILES[0])
+    store.publish_workbook(path)
+    os.utime(path, (0, 0))
+    assert store.read(path) is None
+
+
+def test_old_generations_are_removed(folder):
+    store = ArrowStore(folder)
+    path = str(folder / SAMPLE_FILES[0])
+    for _ in range(3):
+        store.publish_workbook(path)
+    # The current file and the previous manifest's one
+    assert len(list((folder / "arrow").rglob("*.arrow"))) == 2
+
+
+def test_mixed_column_is_not_published(folder):
+    path = str(folder / SAMPLE_FILES[0])
+    frame = pd.DataFrame({"Player": ["A", "B"], "Team": ["Boston Celtics"] * 2, "Numbering": [5, "1/1"]}, dtype=object)
+    assert not ArrowStore(folder).publish(SAMPLE_FILES[0], frame, path)
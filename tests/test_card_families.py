@@ -0,0 +1,48 @@
+import pytest
+
+from card_families import base_set, card_families
+from scoring import default_model
+
+# Real Box Type -> Base Set pairs from checklists_clean
+BASE_SETS = [
+    ("Rookie Roll Call Gold", "Rookie Roll Call"),
+    ("Rookie Roll Call Silver", "Rookie Roll Call"),
+    ("Rookie Jersey Autographs Black Snake Skin Pulsar Prizms FOTL", "Rookie Jersey Autographs"),
+    ("Black Snake Eyes", "Black Snake Eyes"),
+    ("2023-24 National Treasures Basketball - Treasured Signatures International Red", "Treasured Signatures"),
+    ("2024-25 Noir Basketball - Auto Noir Black and White International", "Auto Noir"),
+    ("Update - 2023-24 Impeccable Basketball - Indelible Ink Holo Gold", "Indelible Ink"),
+    ("Update - 2023 Panini Crown Royale Basketball-Crown Jewel Signatures FOTL", "Crown Jewel Signatures"),
+    ("Update: 2024 Panini Hoops Basketball - Calligraphy Signatures", "Calligraphy Signatures"),
+    ("2023-24 Panini Contenders Rookie Season Ticket", "Rookie Season Ticket"),
+    ("2023-24 Panini Contenders Optic Rookie Season Ticket Variations", "Rookie Season Ticket"),
+    ("2022 Playoff Contenders Optic Rookie Season Ticket", "Rookie Season Ticket"),
+    ("-2022-23 Donruss Elite Passing the Torch Signatures", "Passing the Torch Signatures"),
+    ("2023 Hoops Calligraphy Signatures", "Calligraphy Signatures"),
+    ("2023-24 Private Signings", "Private Signings"),
+    ("1986 Tribute Autographs", "1986 Tribute Autographs"),
+    ("Class of 2017", "Class of 2017"),
+    ("Retro 2014 Patch Autographs", "Retro 2014 Patch Autographs"),
+]
+
+
+@pytest.mark.parametrize("box_type, expected", BASE_SETS)
+def test_base_set(box_type, expected):
+    assert base_set(box_type) == expected
+
+
+def test_pairs_come_from_the_checklists(dataset):
+    df, _, _ = dataset.frames()
+    box_types = set(df['Box Type'].astype(str).unique())
+    assert [b for b, _ in BASE_SETS if b not in box_types] == []
+
+
+def test_families_stay_per_checklist(dataset):
+    # Two seasons of one product: no family may merge cards of both files
+    df, _, _ = dataset.frames()
+    rows = df[df['Product'] == "Panini-Court-Kings-Basketball"]
+    assert rows['File'].nunique() == 2
+    families = card_families(rows, default_model().categories)
+    per_file = sum(len(card_families(part, default_model().categories)) for _, part in rows.groupby('File', observed=True))
+    assert len(families) == per_file
+    assert families['Hits'].sum() == len(rows)
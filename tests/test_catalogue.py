@@ -0,0 +1,13 @@
+import os
+
+from catalogue import describe_workbook
+from conftest import CHECKLISTS_DIR
+
+
+def test_counts_match_the_loaded_partition(partitions):
+    for filename in ("2017-18-Hoops.xlsx", "2024-25-Panini-Immaculate-Basketball.xlsx"):
+        partition, _ = partitions[filename]
+        entry = describe_workbook(os.path.join(CHECKLISTS_DIR, filename))
+        counts = partition.frame['Category'].value_counts()
+        assert entry["rows"] == len(partition.frame)
+        assert entry["categories"] == {c: int(counts.get(c, 0)) for c in entry["categories"]}
@@ -0,0 +1,38 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from dataset_store import DatasetStore
+
+
+def test_shared_memo_is_built_once(dataset):
+    shared = dataset.copy()
+    calls = []
+
+    def build():
+        calls.append(threading.get_ident())
+        time.sleep(0.05)
+        return len(calls)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: shared.memo('slow', None, build), range(16)))
+    assert len(calls) == 1
+    assert set(results) == {1}
+
+
+def test_distinct_memo_entries_build_in_parallel(dataset):
+    shared = dataset.copy()
+    barrier = threading.Barrier(2, timeout=10)
+
+    def build():
+        barrier.wait()
+        return True
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        assert all(pool.map(lambda name: shared.memo(name, None, build), ("a", "b")))
+
+
+def test_store_builds_frames_before_sharing(dataset):
+    shared = dataset.copy()
+    DatasetStore().put("id", shared)
+    assert shared._frames is not None
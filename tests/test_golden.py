@@ -0,0 +1,63 @@
+import hashlib
+
+from xlsx_reader import read_sheet
+
+TOP_N = 10
+
+
+def ranking(totals, kind, n=TOP_N):
+    # Top n by score, ties broken by name so the snapshot is deterministic
+    top = totals.sort_values(['Score', kind], ascending=[False, True], kind="stable").head(n)
+    return [[name, int(hits), round(float(score), 4)] for name, hits, score in zip(top[kind], top['Hits'], top['Score'])]
+
+
+def frame_digest(df):
+    # Order-sensitive hash of every cell, as text
+    digest = hashlib.sha256()
+    for row in df.astype(object).where(df.notna(), "").astype(str).itertuples(index=False, name=None):
+        digest.update("\x1f".join(row).encode("utf-8"))
+        digest.update(b"\x1e")
+    return digest.hexdigest()
+
+
+def partition_snapshot(partition, notes):
+    if partition is None:
+        return {"skipped": notes}
+    df = partition.frame
+    return {
+        "rows": len(df),
+        "notes": notes,
+        "categories": {k: int(v) for k, v in sorted(df['Category'].value_counts().items())},
+        "numbered": int((df['Serial'] > 0).sum()),
+        "families": len(partition.families),
+        "score": round(float(df['Score'].sum()), 4),
+        "top_players": ranking(partition.player_totals.rename_axis('Player').reset_index(), 'Player'),
+        "top_teams": ranking(partition.team_totals.rename_axis('Team').reset_index(), 'Team'),
+    }
+
+
+def test_partition_matches_snapshot(golden, partitions, filename):
+    partition, notes = partitions[filename]
+    golden.check("checklists", filename, partition_snapshot(partition, notes))
+
+
+def test_dataset_totals_match_snapshot(golden, dataset):
+    df, df_p, df_t = dataset.frames()
+    golden.check("dataset", "rows", [len(df), len(df_p), len(df_t)])
+    golden.check("dataset", "files", len(dataset))
+    golden.check("dataset", "top_players", ranking(dataset.totals('Player'), 'Player'))
+    golden.check("dataset", "top_teams", ranking(dataset.totals('Team'), 'Team'))
+
+
+def test_exploded_views_point_at_their_rows(dataset):
+    # df_p/df_t are indexed by the df row they were exploded from
+    df, df_p, df_t = dataset.frames()
+    for view, column in ((df_p, 'Player'), (df_t, 'Team')):
+        source = df[column].astype(str).to_numpy()[view.index.to_numpy()]
+        assert all(name in cell for name, cell in zip(view[column], source))
+
+
+def test_cleaner_matches_snapshot(golden, cleaned):
+    for filename, rows, dst_path in cleaned[0]:
+        cleaned_sheet = read_sheet(dst_path, "Teams_clean")
+        golden.check("cleaner", filename, {"rows": rows, "sha256": frame_digest(cleaned_sheet)})
@@ -0,0 +1,46 @@
+from openpyxl import Workbook
+
+from clean_checklists import process_file
+from layouts import LayoutCache
+from xlsx_reader import read_sheet
+
+
+def write_season(path):
+    # Unnumbered base cards first: the "/" and print run columns are empty
+    # in the first 200 rows the layout fingerprint is taken from.
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Teams"
+    ws.append(["Card Set", "Player", "Team", None, None])
+    for i in range(300):
+        ws.append(["Base", f"Player {i}", "Atlanta Hawks", None, None])
+    for i in range(50):
+        ws.append(["Prizm Gold", f"Player {i}", "Boston Celtics", "/", 10])
+    wb.save(path)
+
+
+def numbered_rows(path):
+    cleaned = read_sheet(path, "Teams_clean")
+    return int(cleaned['Numbering'].notna().sum())
+
+
+def test_cached_layout_keeps_serial_numbers(tmp_path):
+    layouts = LayoutCache()
+    for season in ("2023-24", "2024-25"):
+        path = tmp_path / f"{season}-Panini-Prizm-Basketball-Checklist.xlsx"
+        write_season(path)
+        assert process_file(path, path, layouts) == 350
+        assert numbered_rows(path) == 50
+    assert layouts.misses == 1 and layouts.hits == 1
+
+
+def test_cached_layout_matches_inference(tmp_path):
+    learned, plain = tmp_path / "2024-25-Panini-Prizm-Basketball-Checklist.xlsx", tmp_path / "plain.xlsx"
+    write_season(learned)
+    write_season(plain)
+    layouts = LayoutCache()
+    process_file(learned, learned, layouts)
+    process_file(learned, learned, layouts)
+    process_file(plain, plain)
+    assert layouts.hits == 1
+    assert read_sheet(learned, "Teams_clean").equals(read_sheet(plain, "Teams_clean"))
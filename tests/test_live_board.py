@@ -0,0 +1,22 @@
+import pandas as pd
+
+from live_board import TopK
+
+
+def test_board_ranks_unexploded_rows():
+    df = pd.DataFrame({
+        'Player': ['LeBron James / Anthony Davis', 'LeBron James', 'Anthony Davis'],
+        'Team': ['Los Angeles Lakers', 'Los Angeles Lakers', 'Los Angeles Lakers'],
+        'Score': [10.0, 3.0, 2.0],
+    })
+    board = TopK.from_rows(df, 'Player')
+    # The dual card counts once, under its own name, not once per player
+    assert board.top(3) == [('LeBron James / Anthony Davis', 10.0), ('LeBron James', 3.0), ('Anthony Davis', 2.0)]
+    assert TopK.from_rows(df, 'Team').top(1) == [('Los Angeles Lakers', 15.0)]
+
+
+def test_board_matches_row_totals(dataset):
+    df, _, _ = dataset.frames()
+    board = TopK.from_rows(df, 'Player')
+    expected = df.groupby('Player')['Score'].sum().sort_values(ascending=False).head(5)
+    assert [score for _, score in board.top(5)] == expected.astype(float).tolist()
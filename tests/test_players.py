@@ -0,0 +1,25 @@
+from players import PlayerSearch, edit_distance
+
+NAMES = ["Jaylin Williams", "Jalen Green", "LeBron James", "Jaren Jackson Jr.", "Giannis Antetokounmpo", "Luka Doncic", "Victor Wembanyama"]
+
+
+def resolve(query):
+    return PlayerSearch(NAMES).resolve([query])[0]
+
+
+def test_other_real_player_is_only_suggested():
+    entry = resolve("Jalen Williams")
+    assert entry["match"] is None
+    assert entry["suggestions"][0][0] == "Jaylin Williams"
+
+
+def test_typos_are_corrected():
+    assert resolve("Lebron Jame")["match"] == "LeBron James"
+    assert resolve("Giannis Antetokumpo")["match"] == "Giannis Antetokounmpo"
+    assert resolve("Jaren Jackson")["match"] == "Jaren Jackson Jr."
+    assert resolve("Luka Dončić")["match"] == "Luka Doncic"
+
+
+def test_edit_distance_stops_at_limit():
+    assert edit_distance("jalen", "jaylin", 1) == 2
+    assert edit_distance("jame", "james", 1) == 1
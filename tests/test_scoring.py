@@ -0,0 +1,38 @@
+import datetime
+
+import pandas as pd
+import pytest
+
+from scoring import parse_numbering, parse_serial, serial_numbers
+
+# (Numbering cell, parse_numbering(...) or 0 as the numbering filters used to
+# read it, parse_serial); dates are "1/1"-style cells Excel stored as d/m dates
+SERIALS = [
+    (25, 25, 25),
+    (25.0, 25, 25),
+    ("25", 25, 25),
+    (" 10 ", 10, 10),
+    ("/25", 0, 25),
+    ("3/25", 0, 25),
+    (" 1 / 1 ", 0, 1),
+    (None, 0, 0),
+    (float("nan"), 0, 0),
+    ("", 0, 0),
+    ("abc", 0, 0),
+    ("1/", 0, 0),
+    (0, 0, 0),
+    (-5, -5, 0),
+    (datetime.datetime(2025, 1, 1), 0, 1),
+    (pd.Timestamp(2025, 10, 1), 0, 10),
+]
+
+
+@pytest.mark.parametrize("value, old, new", SERIALS)
+def test_parse_serial(value, old, new):
+    assert (parse_numbering(value) or 0) == old
+    assert parse_serial(value) == new
+
+
+def test_serial_numbers():
+    numbering = pd.Series([25, "/10", None, "25", "abc"], dtype=object)
+    assert serial_numbers(numbering).tolist() == [25, 10, 0, 25, 0]
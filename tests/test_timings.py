@@ -0,0 +1,87 @@
+import os
+import time
+
+import pytest
+
+from dataset import ChecklistDataset, Partition, normalize_checklist, read_teams_clean
+from scoring import default_model
+from team_summary import TeamSummaries
+
+pytestmark = pytest.mark.timing
+
+# Each stage runs REPEATS times over every checklist (the cleaner once) and
+# its best time is compared to tests/golden/timings.json: a stage fails when
+# it is slower than baseline * NBA_BREAK_TIMING_FACTOR (default 2) + SLACK s.
+# Deselected by default (see pytest.ini): python -m pytest -m timing
+REPEATS = 3
+SLACK = 0.05
+TIMING_FACTOR_ENV = "NBA_BREAK_TIMING_FACTOR"
+
+
+def best_time(run):
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def check_timing(golden, stage, seconds):
+    if golden.update:
+        golden.written.setdefault("timings", {})[stage] = round(seconds, 4)
+        return
+    baseline = golden.load("timings").get(stage)
+    if baseline is None:
+        pytest.fail(f"pas de référence pour {stage}, lancer pytest --update-golden")
+    limit = baseline * float(os.environ.get(TIMING_FACTOR_ENV, 2)) + SLACK
+    assert seconds <= limit, f"{stage}: {seconds:.3f}s > {limit:.3f}s (référence {baseline:.3f}s)"
+
+
+@pytest.fixture(scope="module")
+def readable(partitions):
+    # (path, filename) of the checklists the app can load
+    return [(p.key, p.filename) for p, _ in partitions.values() if p is not None]
+
+
+def test_read_timing(golden, readable):
+    check_timing(golden, "read", best_time(lambda: [read_teams_clean(path) for path, _ in readable]))
+
+
+def test_normalise_and_partition_timing(golden, readable):
+    raw = [(path, filename, read_teams_clean(path)) for path, filename in readable]
+    normalised = [(path, filename, normalize_checklist(df.copy(), filename)[0]) for path, filename, df in raw]
+    check_timing(golden, "normalise", best_time(
+        lambda: [normalize_checklist(df.copy(), filename) for _, filename, df in raw]
+    ))
+    check_timing(golden, "partition", best_time(
+        lambda: [Partition(path, filename, df.copy()) for path, filename, df in normalised]
+    ))
+
+
+def test_dataset_timing(golden, partitions):
+    loaded = [p for p, _ in partitions.values() if p is not None]
+
+    def build():
+        data = ChecklistDataset()
+        for partition in loaded:
+            data.add(partition)
+        return data
+
+    check_timing(golden, "dataset_frames", best_time(lambda: build().frames()))
+
+    def aggregate():
+        data = build()
+        _, _, df_t = data.frames()
+        data.totals('Player')
+        data.totals('Team')
+        data.families()
+        TeamSummaries(df_t, default_model().categories)
+
+    check_timing(golden, "aggregate", best_time(aggregate))
+
+
+def test_cleaner_timing(golden, cleaned):
+    # Single pass (see the cleaned fixture): tens of seconds, noise is small
+    check_timing(golden, "clean", cleaned[1])
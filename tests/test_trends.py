@@ -0,0 +1,22 @@
+import pandas as pd
+
+from trends import KEY_COLUMNS, Trends
+
+
+def frame(kind, rows):
+    return pd.DataFrame(rows, columns=KEY_COLUMNS[kind] + ['Hits', 'Score'])
+
+
+def test_rising_shares_use_the_whole_season():
+    players = frame('Player', [
+        ('LeBron James', '2022-23', 'Prizm', 'Hit', 10, 10.0),
+        ('LeBron James', '2023-24', 'Prizm', 'Hit', 20, 20.0),
+        # One season only: dropped from the ranking but still in the 2022-23 total
+        ('Victor Wembanyama', '2022-23', 'Prizm', 'Hit', 10, 10.0),
+    ])
+    trends = Trends(players, frame('Team', []))
+    rising = trends.rising('Player', min_seasons=2)
+    assert rising['Player'].tolist() == ['LeBron James']
+    # 50% of 2022-23, 100% of 2023-24
+    assert rising['Pente (pts/saison)'].iloc[0] == 50.0
+    assert rising['Saisons'].iloc[0] == 2
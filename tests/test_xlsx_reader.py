@@ -0,0 +1,26 @@
+import datetime
+import os
+
+import pandas as pd
+
+from conftest import CHECKLISTS_DIR
+from xlsx_reader import read_sheet
+
+# Logoman cards numbered "1/1" that Excel stored as 2025-01-01 (format d/m)
+DATED_NUMBERING = "2024-25-Panini-Origins-Basketball-Checklist.xlsx"
+
+
+def test_date_cells_read_like_pandas():
+    path = os.path.join(CHECKLISTS_DIR, DATED_NUMBERING)
+    frame = read_sheet(path, "Teams_clean")
+    pd.testing.assert_frame_equal(frame, pd.read_excel(path, sheet_name="Teams_clean", engine="openpyxl"))
+    dates = frame['Numbering'].map(lambda v: isinstance(v, datetime.datetime))
+    assert dates.sum() == 20
+    assert set(frame.loc[dates, 'Numbering']) == {datetime.datetime(2025, 1, 1)}
+
+
+def test_dated_numbering_is_a_one_of_one(partitions):
+    partition, _ = partitions[DATED_NUMBERING]
+    logoman = partition.frame[partition.frame['Box Type'] == "Logoman"]
+    assert len(logoman) == 20
+    assert set(logoman['Serial']) == {1}
@@ -0,0 +1,206 @@
+import glob
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from catalogue import file_signature
+from dataset import explode_column, extract_product, extract_year, normalize_checklist, read_teams_clean
+from rookies import season_start
+from scoring import default_model, score_frame
+
+# Season-over-season aggregates. Each workbook is reduced once to per
+# (player|team, category) hits/score sums, tagged with its year and product,
+# and persisted next to the checklists. Trend queries then only touch these
+# small tables, never the raw rows of every season.
+TRENDS_FILENAME = "trends_cache.json"
+# Bump when the aggregates change shape, to force a rebuild.
+TRENDS_VERSION = 4
+
+KEY_COLUMNS = {'Player': ['Player', 'Year', 'Product', 'Category'], 'Team': ['Team', 'Year', 'Product', 'Category']}
+
+
+def trends_path(folder):
+    return os.path.join(folder, TRENDS_FILENAME)
+
+
+def yearly_aggregates(df, model=None):
+    # df: normalised checklist rows (one workbook)
+    df = df.copy()
+    df['Category'], _, df['Score'] = score_frame(df, model)
+    tables = {}
+    for kind in ('Player', 'Team'):
+        exploded = explode_column(df[[kind, 'Year', 'Product', 'Category', 'Hits', 'Score']], kind)
+        exploded = exploded[exploded[kind].astype(bool)]
+        tables[kind] = exploded.groupby(KEY_COLUMNS[kind], as_index=False, observed=True)[['Hits', 'Score']].sum()
+    return tables
+
+
+def summarise_workbook(path, model=None):
+    filename = os.path.basename(path)
+    mtime, size = file_signature(path)
+    entry = {"mtime": mtime, "size": size, "year": extract_year(filename), "product": extract_product(filename), "tables": None}
+    try:
+        df, _ = normalize_checklist(read_teams_clean(path), filename)
+    except Exception:
+        # Unreadable workbooks are reported by the catalogue; they just add no trend data.
+        return entry
+    if df is not None and not df.empty:
+        entry["tables"] = yearly_aggregates(df, model)
+    return entry
+
+
+def table_json(table):
+    # Plain lists, like catalogue_index.json: nothing executable is stored
+    return {"columns": list(table.columns), "data": table.astype(object).values.tolist()}
+
+
+def table_from_json(data):
+    return pd.DataFrame(data["data"], columns=data["columns"])
+
+
+def load_store(folder, model):
+    try:
+        with open(trends_path(folder), encoding="utf-8") as fh:
+            store = json.load(fh)
+    except (OSError, ValueError):
+        return {}
+    # Scores depend on the scoring model; another model rebuilds the store
+    if not isinstance(store, dict) or store.get("version") != TRENDS_VERSION or store.get("model") != model.version:
+        return {}
+    entries = store.get("files", {})
+    try:
+        for entry in entries.values():
+            if entry.get("tables"):
+                entry["tables"] = {kind: table_from_json(t) for kind, t in entry["tables"].items()}
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return {}
+    return entries
+
+
+def save_store(folder, entries, model):
+    path = trends_path(folder)
+    tmp_path = path + ".tmp"
+    files = {
+        name: {**entry, "tables": {kind: table_json(t) for kind, t in entry["tables"].items()} if entry.get("tables") else None}
+        for name, entry in entries.items()
+    }
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump({"version": TRENDS_VERSION, "model": model.version, "files": files}, fh, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def update_trends(folder, model=None):
+    # Only workbooks whose mtime/size changed since the last run are re-read.
+    # model: the scoring model the app uses (default: active one of scoring_rules.json)
+    model = model or default_model()
+    entries = load_store(folder, model)
+    current = {}
+    changed = False
+    for path in sorted(glob.glob(os.path.join(folder, "*.xlsx"))):
+        filename = os.path.basename(path)
+        if filename.startswith("~$"):
+            continue
+        mtime, size = file_signature(path)
+        entry = entries.get(filename)
+        if entry is None or entry.get("mtime") != mtime or entry.get("size") != size:
+            entry = summarise_workbook(path, model)
+            changed = True
+        current[filename] = entry
+
+    if changed or set(current) != set(entries):
+        save_store(folder, current, model)
+    return Trends.from_entries(current)
+
+
+def slopes(pivot):
+    # Least-squares slope of each row of a (entity x season) pivot, vectorised.
+    # Seasons ("2023-24") are placed on the axis by their starting year;
+    # columns must all be dated (see dated_columns).
+    years = np.array([season_start(c) for c in pivot.columns], dtype=float)
+    x = years - years.mean()
+    denom = (x ** 2).sum()
+    if denom == 0:
+        return pd.Series(0.0, index=pivot.index)
+    return pd.Series(pivot.to_numpy(dtype=float) @ x / denom, index=pivot.index)
+
+
+def dated_columns(pivot):
+    # "Inconnue" (no year in the filename) has no place on the season axis
+    return pivot.loc[:, [season_start(c) is not None for c in pivot.columns]]
+
+
+class Trends:
+    def __init__(self, players, teams):
+        self.tables = {'Player': players, 'Team': teams}
+
+    @classmethod
+    def from_entries(cls, entries):
+        tables = {}
+        for kind in ('Player', 'Team'):
+            parts = [e["tables"][kind] for e in entries.values() if e.get("tables")]
+            if parts:
+                # The same player/year can appear in several products: summed here
+                tables[kind] = pd.concat(parts).groupby(KEY_COLUMNS[kind], as_index=False)[['Hits', 'Score']].sum()
+            else:
+                tables[kind] = pd.DataFrame(columns=KEY_COLUMNS[kind] + ['Hits', 'Score'])
+        return cls(tables['Player'], tables['Team'])
+
+    def years(self):
+        # Dated seasons only, the ones trends are fitted on
+        years = self.tables['Player']['Year'].dropna().unique().tolist()
+        return sorted(y for y in years if season_start(y) is not None)
+
+    def _rows(self, kind, products=None, category=None):
+        rows = self.tables[kind]
+        if products is not None:
+            rows = rows[rows['Product'].isin(products)]
+        if category is not None:
+            rows = rows[rows['Category'] == category]
+        return rows
+
+    def by_year(self, kind, products=None, category=None, value='Hits', dated=False):
+        # (entity x year) pivot, missing seasons as 0; dated: without "Inconnue"
+        rows = self._rows(kind, products, category)
+        pivot = rows.pivot_table(index=kind, columns='Year', values=value, aggfunc='sum', fill_value=0).sort_index(axis=1)
+        return dated_columns(pivot) if dated else pivot
+
+    def series(self, kind, name, products=None):
+        rows = self._rows(kind, products)
+        rows = rows[rows[kind] == name]
+        return rows.groupby(['Year', 'Category'], as_index=False)[['Hits', 'Score']].sum()
+
+    def rising(self, kind='Player', category=None, products=None, window=3, min_seasons=2, limit=25):
+        # Entities whose share of the category grows fastest over the last
+        # `window` seasons. Shares (not raw counts) so that seasons with fewer
+        # loaded checklists don't look like a collapse.
+        columns = [kind, 'Pente (pts/saison)', 'Saisons', 'Dernière saison', 'Précédente']
+        pivot = self.by_year(kind, products, category, dated=True)
+        if pivot.shape[1] < 2:
+            return pd.DataFrame(columns=columns)
+        pivot = pivot.iloc[:, -window:]
+        # Shares of the whole season, before dropping the one-season entities
+        share = pivot / pivot.sum(axis=0).replace(0, np.nan) * 100
+        seasons = (pivot > 0).sum(axis=1)
+        pivot = pivot[seasons >= min_seasons]
+        share = share.loc[pivot.index]
+        result = pd.DataFrame({
+            columns[1]: slopes(share.fillna(0)).round(3),
+            'Saisons': seasons.loc[pivot.index],
+            'Dernière saison': pivot.iloc[:, -1],
+            'Précédente': pivot.iloc[:, -2],
+        })
+        result = result[result[columns[1]] > 0].sort_values([columns[1], 'Dernière saison'], ascending=False)
+        return result.head(limit).rename_axis(kind).reset_index()
+
+    def share_by_season(self, kind='Team', category=None, products=None):
+        # Share (%) of each entity in the season's total for the category
+        rows = self._rows(kind, products, category)
+        per_entity = rows.groupby([kind, 'Year'], as_index=False)['Hits'].sum()
+        totals = per_entity.groupby('Year')['Hits'].transform('sum')
+        per_entity['Part (%)'] = np.where(totals > 0, per_entity['Hits'] / totals * 100, 0.0).round(2)
+        return per_entity
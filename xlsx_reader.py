@@ -0,0 +1,273 @@
+import posixpath
+import re
+import zipfile
+from xml.etree import ElementTree as ET
+
+import numpy as np
+import pandas as pd
+from openpyxl.styles.numbers import builtin_format_code, is_date_format, is_timedelta_format
+from openpyxl.utils.datetime import MAC_EPOCH, WINDOWS_EPOCH, from_excel, from_ISO8601
+from pandas.io.parsers import TextParser
+
+# Minimal xlsx reader for our checklists: opens the zip, finds one sheet by
+# name through workbook.xml and its rels, streams the sheet XML with iterparse
+# and resolves shared strings lazily (only as far as the highest index seen).
+# Of styles.xml only the cell formats are read, to know which number cells are
+# dates ("1/1" typed in a Numbering cell becomes 2025-01-01, shown d/m); other
+# sheets and workbook metadata are never parsed. Rows come out the way pandas'
+# openpyxl engine builds them (dates as datetime, with openpyxl's own
+# conversion), and the DataFrame goes through the same TextParser, so values
+# and dtypes match pd.read_excel(engine="openpyxl").
+
+MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+ROW = f"{{{MAIN_NS}}}row"
+CELL = f"{{{MAIN_NS}}}c"
+VALUE = f"{{{MAIN_NS}}}v"
+INLINE = f"{{{MAIN_NS}}}is"
+TEXT = f"{{{MAIN_NS}}}t"
+RUN = f"{{{MAIN_NS}}}r"
+SHARED_ITEM = f"{{{MAIN_NS}}}si"
+SHEET_DATA = f"{{{MAIN_NS}}}sheetData"
+NUM_FMT = f"{{{MAIN_NS}}}numFmt"
+CELL_XFS = f"{{{MAIN_NS}}}cellXfs"
+XF = f"{{{MAIN_NS}}}xf"
+WORKBOOK_PR = f"{{{MAIN_NS}}}workbookPr"
+
+_COLUMN = re.compile(r"[A-Z]+")
+
+
+def column_index(ref):
+    # "AB12" -> 27 (0-based)
+    index = 0
+    for ch in _COLUMN.match(ref).group():
+        index = index * 26 + ord(ch) - 64
+    return index - 1
+
+
+def item_text(item):
+    # <si>/<is>: plain <t> or rich-text runs; phonetic hints (<rPh>) are skipped
+    parts = []
+    for child in item:
+        if child.tag == TEXT:
+            parts.append(child.text or "")
+        elif child.tag == RUN:
+            t = child.find(TEXT)
+            if t is not None:
+                parts.append(t.text or "")
+    return "".join(parts)
+
+
+class SharedStrings:
+    # Parsed incrementally: a 200-row sample only reads the strings it uses
+    def __init__(self, zf, path):
+        self.values = []
+        self._items = self._iter_items(zf, path) if path in zf.namelist() else iter(())
+
+    def _iter_items(self, zf, path):
+        with zf.open(path) as fh:
+            for _, elem in ET.iterparse(fh):
+                if elem.tag == SHARED_ITEM:
+                    yield item_text(elem)
+                    elem.clear()
+
+    def __getitem__(self, index):
+        values = self.values
+        while index >= len(values):
+            value = next(self._items, None)
+            if value is None:
+                raise IndexError(f"shared string {index} introuvable")
+            values.append(value)
+        return values[index]
+
+
+class CellStyles:
+    # Cell format indexes (the "s" attribute) whose number format is a date or
+    # a duration, and the workbook's date epoch
+    def __init__(self, zf, path, date1904=False):
+        self.dates = set()
+        self.durations = set()
+        self.epoch = MAC_EPOCH if date1904 else WINDOWS_EPOCH
+        if path not in zf.namelist():
+            return
+        root = ET.fromstring(zf.read(path))
+        custom = {int(f.get("numFmtId")): f.get("formatCode") for f in root.iter(NUM_FMT)}
+        cell_xfs = root.find(CELL_XFS)
+        for index, xf in enumerate(cell_xfs.iter(XF) if cell_xfs is not None else ()):
+            fmt_id = int(xf.get("numFmtId", 0))
+            fmt = custom[fmt_id] if fmt_id in custom else builtin_format_code(fmt_id)
+            if is_date_format(fmt):
+                self.dates.add(index)
+            if is_timedelta_format(fmt):
+                self.durations.add(index)
+
+    def number(self, value, style):
+        # Like openpyxl: date-styled numbers become datetimes, and the ones out
+        # of date range are errors (nan once through pandas)
+        if style not in self.dates:
+            return value
+        try:
+            return from_excel(value, self.epoch, timedelta=style in self.durations)
+        except (OverflowError, ValueError):
+            return np.nan
+
+
+def workbook(zf):
+    # (sheets as (name, relationship id), 1904 date system)
+    root = ET.fromstring(zf.read("xl/workbook.xml"))
+    sheets = [(s.get("name"), s.get(f"{{{REL_NS}}}id")) for s in root.iter(f"{{{MAIN_NS}}}sheet")]
+    properties = root.find(WORKBOOK_PR)
+    date1904 = properties is not None and properties.get("date1904", "0").lower() in ("1", "true")
+    return sheets, date1904
+
+
+def sheet_names(zf):
+    return workbook(zf)[0]
+
+
+def relationships(zf):
+    rels = {}
+    root = ET.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    for rel in root.iter(f"{{{PKG_REL_NS}}}Relationship"):
+        target = rel.get("Target")
+        # Targets are relative to xl/ unless absolute within the package
+        target = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("xl", target))
+        rels[rel.get("Id")] = (rel.get("Type", "").rsplit("/", 1)[-1], target)
+    return rels
+
+
+def list_sheets(source):
+    with zipfile.ZipFile(source) as zf:
+        return [name for name, _ in sheet_names(zf)]
+
+
+def sheet_parts(zf, sheet_name):
+    # (sheet path, shared strings path, CellStyles)
+    rels = relationships(zf)
+    sheets, date1904 = workbook(zf)
+    for name, rel_id in sheets:
+        if name == sheet_name:
+            sheet_path = rels[rel_id][1]
+            break
+    else:
+        # Same error as pandas, callers already handle it
+        raise ValueError(f"Worksheet named '{sheet_name}' not found")
+    strings_path = next((target for kind, target in rels.values() if kind == "sharedStrings"), "xl/sharedStrings.xml")
+    styles_path = next((target for kind, target in rels.values() if kind == "styles"), "xl/styles.xml")
+    return sheet_path, strings_path, CellStyles(zf, styles_path, date1904)
+
+
+def convert(cell, kind, strings, styles):
+    # Same conversions as pandas' OpenpyxlReader._convert_cell
+    if kind == "inlineStr":
+        node = cell.find(INLINE)
+        return item_text(node) if node is not None else ""
+    value = cell.findtext(VALUE)
+    if value is None:
+        return ""
+    if kind == "s":
+        return strings[int(value)]
+    if kind == "str":
+        return value
+    if kind == "b":
+        return value == "1"
+    if kind == "e":
+        return np.nan
+    if kind == "d":
+        return from_ISO8601(value)
+    number = float(value)
+    number = int(number) if number.is_integer() else number
+    style = cell.get("s")
+    return styles.number(number, int(style)) if style else number
+
+
+def iter_rows(source, sheet_name, usecols=None, nrows=None):
+    # Lists of cell values, trailing empty cells trimmed. Missing rows come out
+    # empty so positions match the sheet. With usecols (0-based positions),
+    # only those cells are converted and rows hold just them, in that order.
+    wanted = {c: i for i, c in enumerate(usecols)} if usecols is not None else None
+    with zipfile.ZipFile(source) as zf:
+        sheet_path, strings_path, styles = sheet_parts(zf, sheet_name)
+        strings = SharedStrings(zf, strings_path)
+        with zf.open(sheet_path) as fh:
+            sheet_data = None
+            row_number = 0
+            for event, elem in ET.iterparse(fh, events=("start", "end")):
+                if event == "start":
+                    if elem.tag == SHEET_DATA:
+                        sheet_data = elem
+                    continue
+                if elem.tag != ROW:
+                    continue
+                number = int(elem.get("r", row_number + 1))
+                while row_number < number - 1:
+                    row_number += 1
+                    yield []
+                row_number = number
+
+                row = [""] * len(usecols) if wanted is not None else []
+                position = -1
+                for cell in elem.iter(CELL):
+                    ref = cell.get("r")
+                    position = column_index(ref) if ref else position + 1
+                    if wanted is not None:
+                        slot = wanted.get(position)
+                        if slot is not None:
+                            row[slot] = convert(cell, cell.get("t"), strings, styles)
+                        continue
+                    if position > len(row):
+                        row.extend([""] * (position - len(row)))
+                    row.append(convert(cell, cell.get("t"), strings, styles))
+                while row and row[-1] == "":
+                    row.pop()
+                yield row
+
+                # Finished rows are dropped so memory stays flat on long sheets
+                if sheet_data is not None:
+                    sheet_data.clear()
+                else:
+                    elem.clear()
+                if nrows is not None and row_number >= nrows:
+                    return
+
+
+def sheet_rows(source, sheet_name, usecols=None, nrows=None):
+    # Rows trimmed and padded like pandas' get_sheet_data
+    data = []
+    last_row_with_data = -1
+    for i, row in enumerate(iter_rows(source, sheet_name, usecols, nrows)):
+        if row:
+            last_row_with_data = i
+        data.append(row)
+    data = data[: last_row_with_data + 1]
+    if data:
+        width = len(usecols) if usecols is not None else max(len(row) for row in data)
+        data = [row + [""] * (width - len(row)) for row in data]
+    return data
+
+
+def sheet_header(source, sheet_name):
+    # First row only: streaming stops there and only its shared strings are read
+    for row in iter_rows(source, sheet_name, nrows=1):
+        return row
+    return []
+
+
+def rows_frame(data, header=0, nrows=None):
+    # DataFrame of rows as sheet_rows returns them, typed like pd.read_excel
+    if not data:
+        return pd.DataFrame()
+    return TextParser(data, header=header, skip_blank_lines=False).read(nrows=nrows)
+
+
+def read_sheet(source, sheet_name, header=0, usecols=None, nrows=None):
+    # Drop-in for pd.read_excel(source, sheet_name=..., header=..., usecols=
+    # [positions], nrows=..., engine="openpyxl") on our checklists
+    rows_needed = None if nrows is None else nrows + (header + 1 if header is not None else 0)
+    frame = rows_frame(sheet_rows(source, sheet_name, usecols, rows_needed), header, nrows)
+    if usecols is not None and header is None:
+        # Keep the sheet positions as labels, as pandas does with usecols
+        frame.columns = list(usecols)[: len(frame.columns)]
+    return frame